@@ -0,0 +1,72 @@
+# blemidi.py - preallocated BLE-MIDI packets for the drum set
+#
+# A BLE-MIDI packet is a header byte (timestamp bits 7-12), then a timestamp byte
+# (bits 0-6) before each MIDI message. Notes that go out together share one packet
+# using running status: header, timestamp, status, note1, vel1, note2, vel2
+try:
+    from time import ticks_ms
+except ImportError:  # CPython
+    import time
+    def ticks_ms():
+        return int(time.monotonic() * 1000)
+
+NOTE_ON = 0x90
+NOTE_OFF = 0x80
+
+class MidiPackets:
+    '''
+    fills the same bytearrays in place on every hit, only the timestamp and velocity change
+
+    example usage:
+        packets = MidiPackets(yell.send, channel=9)
+        packets.note(50, 100)            # one note
+        packets.chord(36, 49, 100)       # two notes in one BLE write
+        packets.note(50, 0, NOTE_OFF)
+    '''
+    def __init__(self, send, channel=0):
+        self.send = send
+        self.channel = channel & 0x0F
+        self.singles = {}  # (status << 8) | note -> 5 byte packet
+        self.pairs = {}  # (note1 << 8) | note2 -> 7 byte packet
+        self.sent = 0
+
+    def stamp(self, buf):
+        ts = ticks_ms() & 0x1FFF  # BLE-MIDI timestamps are 13 bits of milliseconds
+        buf[0] = 0x80 | (ts >> 7)
+        buf[1] = 0x80 | (ts & 0x7F)
+
+    def single(self, note, status=NOTE_ON):
+        key = (status << 8) | note
+        buf = self.singles.get(key)
+        if buf is None:
+            buf = bytearray(5)
+            buf[2] = status | self.channel
+            buf[3] = note & 0x7F
+            self.singles[key] = buf
+        return buf
+
+    def pair(self, note1, note2):
+        key = (note1 << 8) | note2
+        buf = self.pairs.get(key)
+        if buf is None:
+            buf = bytearray(7)
+            buf[2] = NOTE_ON | self.channel
+            buf[3] = note1 & 0x7F
+            buf[5] = note2 & 0x7F  # running status, no second status byte
+            self.pairs[key] = buf
+        return buf
+
+    def note(self, note, velocity, status=NOTE_ON):
+        buf = self.single(note, status)
+        buf[4] = velocity & 0x7F
+        self.stamp(buf)
+        self.send(buf)
+        self.sent += 1
+
+    def chord(self, note1, note2, velocity):
+        buf = self.pair(note1, note2)
+        buf[4] = velocity & 0x7F
+        buf[6] = velocity & 0x7F
+        self.stamp(buf)
+        self.send(buf)
+        self.sent += 1
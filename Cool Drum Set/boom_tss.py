@@ -1,24 +1,30 @@
-import time, mqtt, machine, network, secrets, asyncio, neopixel
+import time, machine, secrets, asyncio, neopixel
 from machine import Pin, PWM, I2C, ADC
-from mqtt import MQTTClient
+from mqtt_service import MQTTService
+from wifi import WiFi
 from BLE_CEEO import Yell
 from secrets import mysecrets, chsecrets
 from songlists import pirate_song_me, pirate_song_key
+from player import SongPlayer
+from blemidi import MidiPackets
+from accel import TapAccel, TapQueue, SINGLE_TAP, DOUBLE_TAP
 
 class Drums:
     
     #INITIALIZE
-    def __init__(self, scl, sda, scl2, sda2, addr=0x62):
+    def __init__(self, scl, sda, scl2, sda2, int_short=None, int_tall=None, addr=0x62):
         
         # Songs
         self.pirate_song_me = pirate_song_me
         self.pirate_song_key = pirate_song_key
         
-        # I2C stuff for accelerometer
+        # I2C stuff for accelerometers, taps from both drums land in one queue
         self.addr = addr
         self.i2c_short = I2C(0, scl=scl, sda=sda, freq=50000)
         self.i2c_tall = I2C(1, scl=scl2, sda=sda2, freq=50000)
-        self.init_tap_detection()
+        self.taps = TapQueue()
+        self.accel_short = TapAccel(self.i2c_short, int_short, self.taps, source=0, addr=addr)
+        self.accel_tall = TapAccel(self.i2c_tall, int_tall, self.taps, source=1, addr=addr)
         
         # Photoresistor setup
         self.photo_pin = ADC(Pin(28))
@@ -35,88 +41,25 @@ class Drums:
         self.Mb.freq(100)
         self.Mb.duty_u16(0)
         
+        # Song playback, pauses while the photoresistor is covered
+        self.player = SongPlayer(is_paused=self.light_covered, on_pause=self.motor_off)
+        
         # MQTT setup
         self.mqtt_broker = 'broker.hivemq.com' 
         self.port = 1883
         self.topic_sub = chsecrets['Sub_Topic'] # this reads anything sent to our subscribed topic
         self.topic_pub = chsecrets['Pub_Topic']
         
-        # Connect to wifi and MQTT
-        self.connect()
+        # Wi-Fi and MQTT connect in the background once main() runs
+        self.wifi = WiFi(mysecrets['SSID'], mysecrets['key'])
         self.mqtt_connect()
         
         # Connect w/ MIDI
         self.midi_connect()
         
         # Run tasks
-        drum_msg = 'drums'
-        self.client.publish(self.topic_pub, drum_msg)
         asyncio.run(self.main())
         
-    #ACCELEROMETER SETUP
-    def write_byte_short(self, reg, value):
-        self.i2c_short.writeto_mem(self.addr, reg, value.to_bytes(1, 'little'))
-        
-    def write_byte_tall(self, reg, value):
-        self.i2c_tall.writeto_mem(self.addr, reg, value.to_bytes(1, 'little'))
-
-    def read_byte_short(self, reg):
-        try:
-            return int.from_bytes(self.i2c_short.readfrom_mem(self.addr, reg, 1), 'little')
-        except OSError as e:
-            print("I2C read error short:", e)
-            return None  # Return a default or error value
-
-    
-    def read_byte_tall(self, reg):
-        try:
-            return int.from_bytes(self.i2c_tall.readfrom_mem(self.addr, reg, 1), 'little')
-        except OSError as e:
-            print("I2C read error:", e)
-            return None  # Return a default or error value
-
-    def init_tap_detection(self):
-        # Enable single (bit 5) and double (bit 4) tap interrupts
-        tap_interrupt = (1 << 5) | (1 << 4)  # Puts a 1 at bit 5 and a 1 at bit 4
-        self.write_byte_short(0x16, tap_interrupt)
-        self.write_byte_tall(0x16, tap_interrupt)
-        # Re-check if bits 5 and 4 are set in register 0x16
-        int_config_short = self.read_byte_short(0x16)
-        int_config_tall = self.read_byte_tall(0x16)
-        print(f"Interrupt config (0x16): {int_config_short:08b}")  # Should print 00110000
-        print(f"Interrupt config (0x16): {int_config_tall:08b}")  # Should print 00110000
-
-        self.write_byte_short(0x10, 0x03)  # Set ODR to 250Hz
-        self.write_byte_short(0x11, 0x02)  # Set to normal mode
-        self.write_byte_tall(0x10, 0x03)  # Set ODR to 250Hz
-        self.write_byte_tall(0x11, 0x02)  # Set to normal mode
-        
-        # Set tap threshold (e.g., 250 mg in 8g range, value = 4 in 8g mode, adjust as necessary)
-        self.write_byte_short(0x0F, 0x00)  # Set to 2g mode
-        self.write_byte_short(0x2B, 0x03)  # Lower threshold for 2g mode
-        self.write_byte_tall(0x0F, 0x00)  # Set to 2g mode
-        self.write_byte_tall(0x2B, 0x03)  # Lower threshold for 2g mode
-
-        # Set tap parameters: TAP_DUR (bits 0-2), TAP_SHOCK (bit 6), TAP_QUIET (bit 7) in register 0x2A
-        tap_dur = 0x07  # Big value for tap duration
-        tap_shock = 0x01  # Low value for shock
-        tap_quiet = 0x01  # Low value for quiet
-        tap_settings = (tap_quiet << 7) | (tap_shock << 6) | tap_dur
-        self.write_byte_short(0x2A, tap_settings)
-        self.write_byte_tall(0x2A, tap_settings)
-    
-    #WIFI
-    def connect(self):
-        wlan = network.WLAN(network.STA_IF)
-        wlan.active(True)
-        wlan.connect(mysecrets['SSID'], mysecrets['key'])
-        while wlan.ifconfig()[0] == '0.0.0.0':
-            print('.', end=' ')
-            time.sleep(1)
-        # We should have a valid IP now via DHCP
-        print(wlan.ifconfig())
-        return wlan.ifconfig()
-    
     #MQTT CALLBACK
     def mqtt_connect(self):
         def callback(topic, msg):
@@ -125,11 +68,9 @@ class Drums:
                 numeric_value = int(decoded_msg)
                 self.potent = numeric_value
             print((topic.decode(), msg.decode()))
-        self.client = MQTTClient('Drumsah', self.mqtt_broker , self.port, keepalive=60)
-        self.client.connect()
-        print('Connected to %s MQTT broker' % (self.mqtt_broker))
-        self.client.set_callback(callback)
-        self.client.subscribe(self.topic_sub)
+        # connects in main(), then reconnects on its own if the broker drops us
+        self.mq = MQTTService('Drums', self.mqtt_broker, self.port, wifi=self.wifi)
+        self.mq.on(self.topic_sub, callback)
         
     # GARAGEBAND STUFF
     def midi_connect(self):
@@ -153,90 +94,84 @@ class Drums:
         self.cmd = self.NoteOn
 
         self.channel = 0x0F & self.channel
-        self.timestamp_ms = time.ticks_ms()
-        self.tsM = (self.timestamp_ms >> 7 & 0b111111) | 0x80
-        self.tsL =  0x80 | (self.timestamp_ms & 0b1111111)
-        self.c =  self.cmd | self.channel     
-#         self.payload_short = bytes([self.tsM,self.tsL,self.c,self.note_short,self.velocity['f']])
-#         self.payload_tall = bytes([self.tsM,self.tsL,self.c,self.note_tall,self.velocity['f']])
-#         self.payload_bass = bytes([self.tsM,self.tsL,self.c,self.note_bass,self.velocity['f']])
-#         self.payload_cymbal = bytes([self.tsM,self.tsL,self.c,self.note_cymbal,self.velocity['f']])
+        # packets are built once and reused, each send gets a fresh timestamp
+        self.packets = MidiPackets(self.p.send, self.channel)
+        self.packets.pair(self.note_short, self.note_tall)
+        self.packets.pair(self.note_bass, self.note_cymbal)
+        for note in (self.note_short, self.note_tall):
+            self.packets.single(note)
     
     def play_note(self, on, note, velocity):
-        cmd_line = on | self.channel 
-        self.payload = bytes([self.tsM,self.tsL,cmd_line,note,velocity])
-        self.p.send(self.payload)
+        self.packets.note(note, velocity, on)
+        
+    #SONG PLAYBACK
+    def light_covered(self):
+        return self.photo_pin.read_u16() <= 5000  # read analog value (0-65535)
+    
+    def motor_off(self):
+        self.Ma.duty_u16(0)
         
+    def song_event(self, status, note, velocity):
+        if status == self.NoteOn:
+            prev_vol = self.vol
+            self.vol = self.potent
+            self.diff = self.vol - prev_vol
+            adjusted_vel = int(max(0, min(127, velocity + self.diff * 127 / 4095)))
+            self.play_note(self.NoteOn, note, adjusted_vel)
+            self.Ma.duty_u16(50000)
+        elif status == self.NoteOff:
+            self.play_note(self.NoteOff, note, 0)  # velocity is 0
+            self.Ma.duty_u16(0)
         
     #ASYNC STUFF 
-    async def check_mqtt(self):
-        while True:
-            self.client.check_msg()
-            await asyncio.sleep(0.1)
+    async def announce(self):
+        await self.mq.ready.wait() # the drums keep working while the network comes up
+        self.mq.publish(self.topic_pub, 'drums')
             
     async def check_tap_status(self): 
+        status = [0, 0]  # short, tall
+        hit = [0, 0]  # tap velocity from the accelerometer
         while True:
-            # Check the interrupt status register for single and double tap (register 0x09)
-            status_short = self.read_byte_short(0x09)
-            single_tap_short = status_short & 0x20  # Bit 5 for single tap
-            double_tap_short = status_short & 0x10  # Bit 4 for double tap
-            status_tall = self.read_byte_tall(0x09)
-            single_tap_tall = status_tall & 0x20  # Bit 5 for single tap
-            double_tap_tall = status_tall & 0x10  # Bit 4 for double tap
+            # Wait for a tap, then take any tap the other drum reported at the same time
+            status[0] = status[1] = hit[0] = hit[1] = 0
+            source, tap, velocity = await self.taps.get()
+            while source is not None:
+                status[source] |= tap
+                hit[source] = max(hit[source], velocity)
+                source, tap, velocity = self.taps.get_nowait() or (None, 0, 0)
+            single_tap_short = status[0] & SINGLE_TAP
+            double_tap_short = status[0] & DOUBLE_TAP
+            single_tap_tall = status[1] & SINGLE_TAP
+            double_tap_tall = status[1] & DOUBLE_TAP
             
             # add code below for changing speed with TM and changing volume with potentiometer
             
-            if single_tap_short:
-                print("Single tap (short) detected!")
-                self.volume = int((self.potent / 4095) * 127)
-                self.payload_short = bytes([self.tsM,self.tsL,self.c,self.note_short,self.volume])
-                self.p.send(self.payload_short)
-            if single_tap_tall:
-                print("Single tap (tall) detected!")
-                self.volume = int((self.potent / 4095) * 127)
-                self.payload_tall = bytes([self.tsM,self.tsL,self.c,self.note_tall,self.volume])
-                self.p.send(self.payload_tall)
+            # volume knob scales how hard the drum was hit
             if single_tap_short and single_tap_tall:
                 print('Both detected!')
-                self.volume = int((self.potent / 4095) * 127)
-                self.payload_short = bytes([self.tsM,self.tsL,self.c,self.note_short,self.volume])
-                self.payload_tall = bytes([self.tsM,self.tsL,self.c,self.note_tall,self.volume])
-                self.p.send(self.payload_short)
-                self.p.send(self.payload_tall)
+                self.volume = int((self.potent / 4095) * max(hit))
+                self.packets.chord(self.note_short, self.note_tall, self.volume) # both drums in one BLE packet
+            elif single_tap_short:
+                print("Single tap (short) detected!")
+                self.volume = int((self.potent / 4095) * hit[0])
+                self.packets.note(self.note_short, self.volume)
+            elif single_tap_tall:
+                print("Single tap (tall) detected!")
+                self.volume = int((self.potent / 4095) * hit[1])
+                self.packets.note(self.note_tall, self.volume)
             if double_tap_tall:
                 print("Double tap detected!")
-                elapsed_time = 0.0
                 drum_msg = 'pirate'
                 
-                self.client.publish(self.topic_pub, drum_msg)
+                self.mq.publish(self.topic_pub, drum_msg)
                 self.vol = self.potent
-                for event in self.pirate_song_me: # loop through the MIDI notes and pauses when photoresistor is covered
-                    light_value = self.photo_pin.read_u16()  # read analog value (0-65535)
-                    time_to_wait = event['time'] - elapsed_time # calculate the time to wait based on the event's timestamp
-                    if time_to_wait > 0:
-                        await asyncio.sleep(time_to_wait)
-                    while light_value <= 5000:
-                        self.Ma.duty_u16(0)
-                        light_value = self.photo_pin.read_u16()
-                        await asyncio.sleep(0.01)
-                    if event['type'] == 'note_on':
-                        prev_vol = self.vol
-                        self.vol = self.potent
-                        self.diff = self.vol - prev_vol
-                        adjusted_vel = int(max(0, min(127, event['velocity'] + pot_change * 127 / 4095)))
-                        self.play_note(self.NoteOn, event['note'], adjusted_vel)
-                        self.Ma.duty_u16(50000)
-                    elif event['type'] == 'note_off':
-                        self.play_note(self.NoteOff, event['note'], 0)  # velocity is 0
-                        self.Ma.duty_u16(0)
-                    elapsed_time = event['time'] # update the elapsed time
+                await self.player.play(self.pirate_song_me, self.song_event) # plays the packed MIDI events and pauses when photoresistor is covered
+                print(self.player.report())
                     
                 self.Ma.duty_u16(0)            
                 await asyncio.sleep(0.01)
                 drum_msg = 'drums'
-                self.client.publish(self.topic_pub, drum_msg)
-                
-            await asyncio.sleep(0.01)
+                self.mq.publish(self.topic_pub, drum_msg)
             
     async def check_bass(self):
         previous_btn_state = self.bass_btn.value()  # initialize with the current state
@@ -245,10 +180,7 @@ class Drums:
             if previous_btn_state == 0 and current_btn_state == 1:  # button was pressed (0) and is now released (1)
                 #print('button released!')
                 self.volume = int((self.potent / 4095) * 127)
-                self.payload_bass = bytes([self.tsM,self.tsL,self.c,self.note_bass,self.volume])
-                self.payload_cymbal = bytes([self.tsM,self.tsL,self.c,self.note_cymbal,self.volume])
-                self.p.send(self.payload_bass)
-                self.p.send(self.payload_cymbal)
+                self.packets.chord(self.note_bass, self.note_cymbal, self.volume) # bass and cymbal in one BLE packet
             previous_btn_state = current_btn_state # update for next loop
             await asyncio.sleep(0.01)  # delay for button debouncing
         
@@ -261,31 +193,13 @@ class Drums:
                 self.p.disconnect()
                 await asyncio.sleep(0.5)
                 self.p.connect_up()
-                elapsed_time = 0.0
                 
                 # add code for sending mqtt message when song is being played, and another one when song stops
                    
-                for event in self.pirate_song_key: # loop through the MIDI notes and pauses when photoresistor is covered
-                    light_value = self.photo_pin.read_u16()  # read analog value (0-65535)
-                    time_to_wait = event['time'] - elapsed_time # calculate the time to wait based on the event's timestamp
-                    if time_to_wait > 0:
-                        await asyncio.sleep(time_to_wait)
-                    while light_value <= 5000:
-                        self.Ma.duty_u16(0)
-                        light_value = self.photo_pin.read_u16()
-                        await asyncio.sleep(0.01)
-                    if event['type'] == 'note_on':
-                        prev_vol = self.vol
-                        self.vol = self.potent
-                        self.diff = self.vol - prev_vol
-                        adjusted_vel = int(max(0, min(127, event['velocity'] + pot_change * 127 / 4095)))
-                        self.play_note(self.NoteOn, event['note'], adjusted_vel)
-                        self.Ma.duty_u16(50000)
-                    elif event['type'] == 'note_off':
-                        self.play_note(self.NoteOff, event['note'], 0)  # velocity is 0
-                        self.Ma.duty_u16(0)
-                    elapsed_time = event['time'] # update the elapsed time
-                            
+                self.vol = self.potent
+                await self.player.play(self.pirate_song_key, self.song_event) # plays the packed MIDI events and pauses when photoresistor is covered
+                self.Ma.duty_u16(0)
+                print(self.player.report())
                 await asyncio.sleep(0.01)
                 
             previous_btn_state = current_btn_state # update for next loop
@@ -294,7 +208,7 @@ class Drums:
             
     async def main(self):
         self.go = False
-        tasks = asyncio.gather(self.check_mqtt(),self.check_tap_status(),self.check_bass(),self.check_keyb())
+        tasks = asyncio.gather(self.wifi.run(),self.mq.run(),self.announce(),self.accel_short.run(),self.accel_tall.run(),self.check_tap_status(),self.check_bass(),self.check_keyb())
         await tasks # wait for duration
 
         
@@ -303,5 +217,7 @@ scl = Pin('GPIO5', Pin.OUT)
 sda = Pin('GPIO4', Pin.OUT)
 scl2 = Pin('GPIO27', Pin.OUT)
 sda2 = Pin('GPIO26', Pin.OUT)
+int_short = Pin('GPIO6', Pin.IN) # accelerometer INT1 lines
+int_tall = Pin('GPIO7', Pin.IN)
 
-boom = Drums(scl, sda, scl2, sda2)
+boom = Drums(scl, sda, scl2, sda2, int_short, int_tall)
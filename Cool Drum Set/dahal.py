@@ -1,6 +1,7 @@
-import time, mqtt, machine, network, secrets, asyncio, neopixel, framebuf, ssd1306
+import time, machine, secrets, asyncio, neopixel, framebuf, ssd1306
 from machine import Pin, PWM, SoftI2C, ADC
-from mqtt import MQTTClient
+from mqtt_service import MQTTService
+from wifi import WiFi
 from secrets import mysecrets, chsecrets
 from storage import bitmap
 
@@ -27,8 +28,8 @@ class DrumDisplay:
         self.topic_sub = chsecrets['Sub_Topic'] # this reads anything sent to our subscribed topic
         self.topic_pub = chsecrets['Pub_Topic']
         
-        # Connect to wifi and MQTT
-        self.connect()
+        # Wi-Fi and MQTT connect in the background once main() runs
+        self.wifi = WiFi(mysecrets['SSID'], mysecrets['key'])
         self.mqtt_connect()
         
         # Run tasks
@@ -40,18 +41,6 @@ class DrumDisplay:
         
         asyncio.run(self.main())
         
-    #WIFI
-    def connect(self):
-        wlan = network.WLAN(network.STA_IF)
-        wlan.active(True)
-        wlan.connect(mysecrets['SSID'], mysecrets['key'])
-        while wlan.ifconfig()[0] == '0.0.0.0':
-            print('.', end=' ')
-            time.sleep(1)
-        # We should have a valid IP now via DHCP
-        print(wlan.ifconfig())
-        return wlan.ifconfig()
-    
     #MQTT CALLBACK
     def mqtt_connect(self):
         def callback(topic, msg):
@@ -69,17 +58,11 @@ class DrumDisplay:
                 self.key = True
             self.display_changed = True
             print((topic.decode(), msg.decode()))
-        self.client = MQTTClient('Drumsyay', self.mqtt_broker , self.port, keepalive=60)
-        self.client.connect()
-        print('Connected to %s MQTT broker' % (self.mqtt_broker))
-        self.client.set_callback(callback)
-        self.client.subscribe(self.topic_sub)
+        # connects when main() runs it, then reconnects on its own if the broker drops us
+        self.mq = MQTTService('DrumDisplay', self.mqtt_broker, self.port, wifi=self.wifi)
+        self.mq.on(self.topic_sub, callback)
         
-    #ASYNC STUFF (or callback unsure)
-    async def check_mqtt(self):
-        while True:
-            self.client.check_msg()
-            await asyncio.sleep(0.1)
+    #ASYNC STUFF
             
     async def check_potentiometer(self):
         while True:
@@ -87,7 +70,7 @@ class DrumDisplay:
             if abs(current_value - self.previous_pot_value) >= 20:
                 self.previous_pot_value = current_value
                 print(f"Potentiometer changed: {current_value}")
-                self.client.publish(self.topic_pub, str(current_value)) # publish the new potentiometer value to MQTT
+                self.mq.publish(self.topic_pub, str(current_value)) # publish the new potentiometer value to MQTT
             await asyncio.sleep(0.1)
         
     async def display_screen(self):
@@ -115,7 +98,7 @@ class DrumDisplay:
             await asyncio.sleep(0.01)
             
     async def main(self):
-        tasks = asyncio.gather(self.check_mqtt(),self.check_potentiometer(),self.display_screen())
+        tasks = asyncio.gather(self.wifi.run(),self.mq.run(),self.check_potentiometer(),self.display_screen())
         await tasks # wait for duration
         
 woo = DrumDisplay()
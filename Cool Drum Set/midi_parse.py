@@ -1,45 +1,173 @@
-import mido
-
-def parse_midi_file(file_name):
-    midi_data = mido.MidiFile(file_name)
-    notes_info = []
-    
-    # Set default tempo (120 BPM) in case there are no tempo changes
-    tempo = 500000  # Default tempo in microseconds per beat
-    ticks_per_beat = midi_data.ticks_per_beat
-    microseconds_per_tick = tempo / ticks_per_beat
-    
-    for track in midi_data.tracks:
-        current_time = 0  # Track the current time in the song
-        for msg in track:
-            current_time += msg.time * microseconds_per_tick / 1e6  # Convert ticks to real time (seconds)
-
-            if msg.type == 'set_tempo':
-                # Adjust tempo if there's a tempo change event
-                tempo = msg.tempo
-                microseconds_per_tick = tempo / ticks_per_beat
-
-            elif msg.type == 'note_on' and msg.velocity > 0:
-                # Add note information to the list
-                notes_info.append({
-                    'type': 'note_on',
-                    'note': msg.note,
-                    'velocity': msg.velocity,
-                    'time': current_time  # Time in seconds when the note is played
-                })
-
-            elif msg.type == 'note_off' or (msg.type == 'note_on' and msg.velocity == 0):
-                # Add note off information
-                notes_info.append({
-                    'type': 'note_off',
-                    'note': msg.note,
-                    'time': current_time  # Time in seconds when the note is stopped
-                })
-    
-    return notes_info
-
-midi_file = r'C:\Users\isabe\OneDrive\Documents\TUFTS\ME35\pirates.mid'
-midi_notes = parse_midi_file(midi_file)
-
-# Now you have all the note data in the midi_notes variable
-print(midi_notes)
+# midi_parse.py - compiles a MIDI file into a packed .song for the drum set (runs on the computer)
+#
+# usage:
+#   python midi_parse.py pirates.mid -o pirate_song_me.song   # write a .song for the Pico
+#   python midi_parse.py pirates.mid                          # print the events to stdout
+#   python midi_parse.py pirates.mid --channel 9 -o drums.song  # only keep one channel
+#
+# The file is read track by track straight from disk and the tracks are merged in time
+# order with a heap, so memory use stays the same no matter how big the MIDI file is.
+import argparse
+import heapq
+import sys
+
+import songfile
+
+DEFAULT_TEMPO = 500000  # microseconds per beat (120 BPM) until the file sets one
+
+# merge order for events on the same tick: tempo first, then note offs, then note ons
+TEMPO, NOTE_OFF, NOTE_ON = 0, 1, 2
+
+def read_varlen(f):
+    value = 0
+    while True:
+        byte = f.read(1)
+        if not byte:
+            raise ValueError('unexpected end of track')
+        value = (value << 7) | (byte[0] & 0x7F)
+        if not byte[0] & 0x80:
+            return value
+
+def read_header(file_name):
+    '''
+    returns (ticks per beat or None for SMPTE, seconds per tick for SMPTE or None, [(offset, length), ...])
+    only the chunk headers are read, track data stays on disk
+    '''
+    tracks = []
+    with open(file_name, 'rb') as f:
+        chunk = f.read(8)
+        if chunk[:4] != b'MThd':
+            raise ValueError('%s is not a MIDI file' % file_name)
+        length = int.from_bytes(chunk[4:8], 'big')
+        header = f.read(length)
+        division = int.from_bytes(header[4:6], 'big')
+        while True:
+            chunk = f.read(8)
+            if len(chunk) < 8:
+                break
+            length = int.from_bytes(chunk[4:8], 'big')
+            if chunk[:4] == b'MTrk':
+                tracks.append((f.tell(), length))
+            f.seek(length, 1)
+    if division & 0x8000:  # SMPTE timing: frames per second and ticks per frame
+        fps = 256 - (division >> 8)
+        return None, 1 / (fps * (division & 0xFF)), tracks
+    return division, None, tracks
+
+def track_events(file_name, offset, length, track, channel=None):
+    '''
+    yields (absolute tick, merge order, track, value, note, velocity) for one track
+    value is the tempo for TEMPO events and the status byte (with channel) for notes
+    '''
+    with open(file_name, 'rb') as f:
+        f.seek(offset)
+        end = offset + length
+        tick = 0
+        status = 0
+        while f.tell() < end:
+            tick += read_varlen(f)
+            byte = f.read(1)[0]
+            if byte == 0xFF:  # meta event
+                kind = f.read(1)[0]
+                data = f.read(read_varlen(f))
+                if kind == 0x51:
+                    yield tick, TEMPO, track, int.from_bytes(data, 'big'), 0, 0
+                elif kind == 0x2F:
+                    return
+                continue
+            if byte in (0xF0, 0xF7):  # sysex, skip it
+                f.seek(read_varlen(f), 1)
+                continue
+            if byte & 0x80:
+                status = byte
+                data1 = f.read(1)[0]
+            else:  # running status, this byte is already the first data byte
+                data1 = byte
+            kind = status & 0xF0
+            if kind in (0xC0, 0xD0):  # program change and channel pressure only have one data byte
+                continue
+            data2 = f.read(1)[0]
+            if channel is not None and status & 0x0F != channel:
+                continue
+            if kind == 0x90 and data2 > 0:
+                yield tick, NOTE_ON, track, status, data1, data2
+            elif kind == 0x80 or kind == 0x90:
+                yield tick, NOTE_OFF, track, status, data1, 0
+
+class TempoMap:
+    '''
+    converts absolute ticks to seconds, tempo changes have to be fed in tick order
+    (the merged stream already is)
+    '''
+    def __init__(self, ticks_per_beat, smpte_seconds_per_tick=None):
+        self.ticks_per_beat = ticks_per_beat
+        self.smpte = smpte_seconds_per_tick
+        self.tick = 0
+        self.seconds_at_tick = 0.0
+        self.tempo = DEFAULT_TEMPO
+
+    def set_tempo(self, tick, tempo):
+        self.seconds_at_tick = self.seconds(tick)
+        self.tick = tick
+        self.tempo = tempo
+
+    def seconds(self, tick):
+        if self.smpte is not None:
+            return tick * self.smpte
+        return self.seconds_at_tick + (tick - self.tick) * self.tempo / (self.ticks_per_beat * 1e6)
+
+def compile_midi(file_name, channel=None):
+    '''
+    yields (time_seconds, status, note, velocity) for every note in the file, all tracks merged
+    status has the channel stripped, ready for songfile.records
+    '''
+    ticks_per_beat, smpte, tracks = read_header(file_name)
+    streams = [track_events(file_name, offset, length, i, channel)
+               for i, (offset, length) in enumerate(tracks)]
+    tempo_map = TempoMap(ticks_per_beat, smpte)
+    for tick, order, _, value, note, velocity in heapq.merge(*streams):
+        if order == TEMPO:
+            tempo_map.set_tempo(tick, value)
+        elif order == NOTE_ON:
+            yield tempo_map.seconds(tick), songfile.NOTE_ON, note, velocity
+        else:
+            yield tempo_map.seconds(tick), songfile.NOTE_OFF, note, 0
+
+def write_song(events, out_file, tick_ms=1):
+    # streams the records to disk, then goes back and fills in the event count
+    count = 0
+    with open(out_file, 'wb') as f:
+        f.write(songfile.header(0, tick_ms))
+        for record in songfile.records(events, tick_ms):
+            f.write(record)
+            count += 1
+        if count > 0xFFFF:
+            raise ValueError('too many events for one song, try --channel')
+        f.seek(0)
+        f.write(songfile.header(count, tick_ms))
+    return count
+
+def write_text(events, out):
+    count = 0
+    for t, status, note, velocity in events:
+        out.write('%.6f %s %d %d\n' % (t, 'on' if status == songfile.NOTE_ON else 'off', note, velocity))
+        count += 1
+    return count
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Compile a MIDI file into a packed drum set song')
+    parser.add_argument('midi_file')
+    parser.add_argument('-o', '--output', help='.song file to write (default: print events to stdout)')
+    parser.add_argument('--channel', type=int, help='only keep notes on this MIDI channel (0-15)')
+    parser.add_argument('--tick-ms', type=int, default=1, help='milliseconds per tick in the .song file')
+    args = parser.parse_args(argv)
+
+    events = compile_midi(args.midi_file, args.channel)
+    if args.output and args.output != '-':
+        count = write_song(events, args.output, args.tick_ms)
+        print('wrote %d events to %s' % (count, args.output), file=sys.stderr)
+    else:
+        write_text(events, sys.stdout)
+
+if __name__ == '__main__':
+    main()
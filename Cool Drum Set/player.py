@@ -0,0 +1,84 @@
+# player.py - drift-free playback of packed songs (see songfile.py)
+import asyncio
+try:
+    from time import ticks_ms, ticks_diff, ticks_add
+except ImportError:  # CPython, so songs can be played in a simulation on the computer
+    import time
+    def ticks_ms():
+        return int(time.monotonic() * 1000)
+    def ticks_diff(a, b):
+        return a - b
+    def ticks_add(a, b):
+        return a + b
+
+class SongPlayer:
+    '''
+    Schedules every event against one start time, so the time spent sending notes and
+    reading sensors never adds up over the song. While is_paused() is true playback
+    waits and the start time is moved forward by the time spent paused.
+
+    example usage:
+        player = SongPlayer(is_paused=lambda: photo.read_u16() <= 5000)
+        await player.play(song, on_event)   # on_event(status, note, velocity)
+        print(player.report())
+    '''
+    def __init__(self, is_paused=None, on_pause=None, poll_ms=10, record=False):
+        self.is_paused = is_paused
+        self.on_pause = on_pause  # called once each time playback pauses
+        self.poll_ms = poll_ms
+        self.record = record  # keep every event's lateness in self.lateness (for simulations)
+        self.playing = False
+        self.reset_stats()
+
+    def reset_stats(self):
+        self.events = 0
+        self.late_total = 0
+        self.late_max = 0
+        self.paused_ms = 0
+        self.lateness = []
+
+    async def wait_while_paused(self):
+        if self.is_paused is None or not self.is_paused():
+            return 0
+        if self.on_pause:
+            self.on_pause()
+        paused_at = ticks_ms()
+        while self.is_paused():
+            await asyncio.sleep(self.poll_ms / 1000)
+        paused = ticks_diff(ticks_ms(), paused_at)
+        self.paused_ms += paused
+        return paused
+
+    async def play(self, song, on_event):
+        self.reset_stats()
+        self.playing = True
+        tick_ms = song.tick_ms
+        start = ticks_ms()
+        offset = 0  # ms from start to the current event
+        try:
+            for delta, status, note, velocity in song:
+                offset += delta * tick_ms
+                while True:
+                    start = ticks_add(start, await self.wait_while_paused())
+                    wait = ticks_diff(ticks_add(start, offset), ticks_ms())
+                    if wait <= 0:
+                        break
+                    await asyncio.sleep(min(wait, self.poll_ms) / 1000)
+                if status:  # status 0 is a spacer that only carries time
+                    self.log_lateness(-wait)
+                    on_event(status, note, velocity)
+        finally:
+            self.playing = False
+
+    def log_lateness(self, late):
+        self.events += 1
+        self.late_total += late
+        if late > self.late_max:
+            self.late_max = late
+        if self.record:
+            self.lateness.append(late)
+
+    def report(self):
+        mean = self.late_total / self.events if self.events else 0
+        return 'events %d, late avg %.1f ms, max %d ms, paused %d ms' % (
+            self.events, mean, self.late_max, self.paused_ms)
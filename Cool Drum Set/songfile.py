@@ -0,0 +1,90 @@
+# songfile.py - packed song format for the drum set
+#
+# A song is a 6 byte header followed by fixed 5 byte event records:
+#   header: b'DS', version, ms per tick, event count (uint16, little endian)
+#   record: delta ticks (uint16, little endian), status, note, velocity
+# status is the MIDI status byte without the channel (0x90 note on, 0x80 note off).
+# A record with status 0 is a spacer that only carries time, used when a gap is
+# longer than 65535 ticks.
+
+MAGIC = b'DS'
+VERSION = 1
+HEADER_SIZE = 6
+RECORD_SIZE = 5
+NOTE_ON = 0x90
+NOTE_OFF = 0x80
+SPACER = 0x00
+MAX_DELTA = 0xFFFF
+
+class Song:
+    '''
+    zero-copy reader, iterating gives (delta_ticks, status, note, velocity)
+    example usage:
+        song = Song.load('pirate_song_me.song')
+        for delta, status, note, velocity in song:
+            ...
+    '''
+    def __init__(self, data):
+        self.buf = memoryview(data)
+        if bytes(self.buf[0:2]) != MAGIC or self.buf[2] != VERSION:
+            raise ValueError('not a packed song')
+        self.tick_ms = self.buf[3]
+        self.count = self.buf[4] | (self.buf[5] << 8)
+        if len(self.buf) < HEADER_SIZE + self.count * RECORD_SIZE:
+            raise ValueError('truncated song')
+
+    @classmethod
+    def load(cls, path):
+        with open(path, 'rb') as f:
+            return cls(bytearray(f.read()))
+
+    def __len__(self):
+        return self.count
+
+    def __iter__(self):
+        b = self.buf
+        end = HEADER_SIZE + self.count * RECORD_SIZE
+        for off in range(HEADER_SIZE, end, RECORD_SIZE):
+            yield b[off] | (b[off + 1] << 8), b[off + 2], b[off + 3], b[off + 4]
+
+    def duration_ms(self):
+        ticks = 0
+        for delta, _, _, _ in self:
+            ticks += delta
+        return ticks * self.tick_ms
+
+# ENCODER (runs on the computer in midi_parse.py, but works on the board too)
+def header(count, tick_ms=1):
+    return MAGIC + bytes([VERSION, tick_ms, count & 0xFF, count >> 8])
+
+def records(events, tick_ms=1):
+    '''
+    events are (time_seconds, status, note, velocity) in time order,
+    yields 5 byte records with absolute times rounded to ticks so rounding never drifts
+    '''
+    last_tick = 0
+    for t, status, note, velocity in events:
+        tick = int(t * 1000 / tick_ms + 0.5)
+        delta = tick - last_tick
+        if delta < 0:
+            raise ValueError('events must be in time order')
+        while delta > MAX_DELTA:
+            yield bytes([0xFF, 0xFF, SPACER, 0, 0])
+            delta -= MAX_DELTA
+        yield bytes([delta & 0xFF, delta >> 8, status, note & 0x7F, velocity & 0x7F])
+        last_tick = tick
+
+def pack(events, tick_ms=1):
+    body = b''.join(records(events, tick_ms))
+    count = len(body) // RECORD_SIZE
+    if count > 0xFFFF:
+        raise ValueError('too many events for one song')
+    return header(count, tick_ms) + body
+
+def from_dicts(notes):
+    # converts the old songlists.py dict-per-event lists into encoder events
+    for event in notes:
+        if event['type'] == 'note_on':
+            yield event['time'], NOTE_ON, event['note'], event['velocity']
+        elif event['type'] == 'note_off':
+            yield event['time'], NOTE_OFF, event['note'], 0
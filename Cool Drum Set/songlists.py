@@ -1,23 +1,11 @@
+# Songs are stored packed in .song files (see songfile.py), regenerate them with midi_parse.py
+from songfile import Song
+
 # keyboard (original)
-pirate_song_key = [{'type': 'note_on', 'note': 52, 'velocity': 50, 'time': 0.888888}, {'type': 'note_off', 'note': 52, 'time': 1.11111}, {'type': 'note_on', 'note': 55, 'velocity': 50, 'time': 1.11111}, {'type': 'note_off', 'note': 55, 'time': 1.333332}, {'type': 'note_on', 'note': 57, 'velocity': 50, 'time': 1.333332}, {'type': 'note_off', 'note': 57, 'time': 1.777776}, {'type': 'note_on', 'note': 57, 'velocity': 50, 'time': 1.777776}, {'type': 'note_off', 'note': 57, 'time': 2.22222}, {'type': 'note_on', 'note': 57, 'velocity': 50, 'time': 2.22222}, {'type': 'note_off', 'note': 57, 'time': 2.444442}, {'type': 'note_on', 'note': 59, 'velocity': 50, 'time': 2.444442}, {'type': 'note_off', 'note': 59, 'time': 2.666664}, {'type': 'note_on', 'note': 60, 'velocity': 50, 'time': 2.666664}, {'type': 'note_off', 'note': 60, 'time': 3.1111079999999998}, {'type': 'note_on', 'note': 60, 'velocity': 50, 'time': 3.1111079999999998}, {'type': 'note_off', 'note': 60, 'time': 3.5555519999999996}, {'type': 'note_on', 'note': 60, 'velocity': 50, 'time': 3.5555519999999996}, {'type': 'note_off', 'note': 60, 'time': 3.7777739999999995}, {'type': 'note_on', 'note': 62, 'velocity': 50, 'time': 3.7777739999999995}, {'type': 'note_off', 'note': 62, 'time': 3.9999959999999994}, {'type': 'note_on', 'note': 59, 'velocity': 50, 'time': 3.9999959999999994}, {'type': 'note_off', 'note': 59, 'time': 4.444439999999999}, {'type': 'note_on', 'note': 59, 'velocity': 50, 'time': 4.444439999999999}, {'type': 'note_off', 'note': 59, 'time': 4.888883999999999}, {'type': 'note_on', 'note': 57, 'velocity': 50, 'time': 4.888883999999999}, {'type': 'note_off', 'note': 57, 'time': 5.1111059999999995}, {'type': 'note_on', 'note': 55, 'velocity': 50, 'time': 5.1111059999999995}, {'type': 'note_off', 'note': 55, 'time': 5.333328}, {'type': 'note_on', 'note': 57, 'velocity': 50, 'time': 5.333328}, {'type': 'note_off', 'note': 57, 'time': 6.2222159999999995}, {'type': 'note_on', 'note': 52, 'velocity': 50, 'time': 6.2222159999999995}, {'type': 'note_off', 'note': 52, 'time': 6.444438}, {'type': 'note_on', 'note': 55, 'velocity': 50, 'time': 6.444438}, {'type': 'note_off', 'note': 55, 'time': 6.66666}, {'type': 'note_on', 'note': 57, 'velocity': 50, 'time': 6.66666}, {'type': 'note_off', 'note': 57, 'time': 7.111104}, {'type': 'note_on', 'note': 57, 'velocity': 50, 'time': 7.111104}, {'type': 'note_off', 'note': 57, 'time': 7.555548}, {'type': 'note_on', 'note': 57, 'velocity': 50, 'time': 7.555548}, {'type': 'note_off', 'note': 57, 'time': 7.77777}, {'type': 'note_on', 'note': 59, 'velocity': 50, 'time': 7.77777}, {'type': 'note_off', 'note': 59, 'time': 7.999992000000001}, {'type': 'note_on', 'note': 60, 'velocity': 50, 'time': 7.999992000000001}, {'type': 'note_off', 'note': 60, 'time': 8.444436000000001}, {'type': 'note_on', 'note': 60, 'velocity': 50, 'time': 8.444436000000001}, {'type': 'note_off', 'note': 60, 'time': 8.888880000000002}, {'type': 'note_on', 'note': 60, 'velocity': 50, 'time': 8.888880000000002}, {'type': 'note_off', 'note': 60, 'time': 9.111102000000002}, {'type': 'note_on', 'note': 62, 'velocity': 50, 'time': 9.111102000000002}, {'type': 'note_off', 'note': 62, 'time': 9.333324000000003}, {'type': 'note_on', 'note': 59, 'velocity': 50, 'time': 9.333324000000003}, {'type': 'note_off', 'note': 59, 'time': 9.777768000000004}, {'type': 'note_on', 'note': 59, 'velocity': 50, 'time': 9.777768000000004}, {'type': 'note_off', 'note': 59, 'time': 10.222212000000004}, {'type': 'note_on', 'note': 57, 'velocity': 50, 'time': 10.222212000000004}, {'type': 'note_off', 'note': 57, 'time': 10.444434000000005}, {'type': 'note_on', 'note': 55, 'velocity': 50, 'time': 10.444434000000005}, 
-{'type': 'note_off', 'note': 55, 'time': 10.666656000000005}, {'type': 'note_on', 'note': 57, 'velocity': 50, 'time': 10.666656000000005}, {'type': 'note_off', 'note': 57, 'time': 11.555544000000005}, {'type': 'note_on', 'note': 52, 'velocity': 50, 'time': 11.555544000000005}, {'type': 'note_off', 'note': 52, 'time': 11.777766000000005}, {'type': 'note_on', 'note': 55, 'velocity': 50, 'time': 11.777766000000005}, {'type': 'note_off', 'note': 55, 'time': 11.999988000000005}, {'type': 'note_on', 'note': 57, 'velocity': 50, 'time': 11.999988000000005}, {'type': 'note_off', 'note': 57, 'time': 12.444432000000006}, {'type': 'note_on', 'note': 57, 'velocity': 50, 'time': 12.444432000000006}, {'type': 'note_off', 'note': 57, 'time': 12.888876000000007}, {'type': 'note_on', 'note': 57, 'velocity': 50, 'time': 12.888876000000007}, {'type': 'note_off', 'note': 57, 'time': 13.111098000000007}, {'type': 'note_on', 'note': 
-60, 'velocity': 50, 'time': 13.111098000000007}, {'type': 'note_off', 'note': 60, 'time': 13.333320000000008}, {'type': 'note_on', 'note': 62, 'velocity': 50, 'time': 13.333320000000008}, {'type': 'note_off', 'note': 62, 'time': 13.777764000000008}, {'type': 'note_on', 'note': 62, 'velocity': 50, 'time': 13.777764000000008}, {'type': 'note_off', 'note': 62, 'time': 14.222208000000009}, {'type': 'note_on', 'note': 62, 'velocity': 50, 'time': 14.222208000000009}, {'type': 'note_off', 'note': 62, 'time': 14.44443000000001}, {'type': 'note_on', 'note': 64, 'velocity': 50, 'time': 14.44443000000001}, {'type': 'note_off', 'note': 64, 'time': 14.66665200000001}, {'type': 'note_on', 'note': 65, 'velocity': 50, 'time': 14.66665200000001}, {'type': 'note_off', 'note': 65, 'time': 15.11109600000001}, {'type': 'note_on', 'note': 65, 'velocity': 50, 'time': 15.11109600000001}, {'type': 'note_off', 'note': 65, 'time': 15.555540000000011}, {'type': 'note_on', 'note': 64, 'velocity': 50, 'time': 15.555540000000011}, {'type': 'note_off', 'note': 64, 'time': 15.777762000000012}, 
-{'type': 'note_on', 'note': 62, 'velocity': 50, 'time': 15.777762000000012}, {'type': 'note_off', 'note': 62, 'time': 15.999984000000012}, {'type': 'note_on', 'note': 64, 'velocity': 50, 'time': 15.999984000000012}, {'type': 'note_off', 'note': 64, 'time': 16.444428000000013}, {'type': 'note_on', 'note': 57, 'velocity': 50, 'time': 16.444428000000013}, {'type': 'note_off', 'note': 57, 'time': 16.888872000000013}, {'type': 'note_on', 'note': 57, 'velocity': 50, 'time': 16.888872000000013}, {'type': 'note_off', 'note': 57, 'time': 17.111094000000012}, {'type': 'note_on', 'note': 59, 'velocity': 50, 'time': 17.111094000000012}, {'type': 'note_off', 'note': 59, 'time': 17.33331600000001}, {'type': 'note_on', 'note': 60, 'velocity': 50, 'time': 17.33331600000001}, 
-{'type': 'note_off', 'note': 60, 'time': 17.77776000000001}, {'type': 'note_on', 'note': 60, 'velocity': 50, 'time': 17.77776000000001}, {'type': 'note_off', 'note': 60, 'time': 18.222204000000012}, {'type': 'note_on', 'note': 62, 'velocity': 50, 'time': 18.222204000000012}, {'type': 'note_off', 'note': 62, 'time': 18.666648000000013}, {'type': 'note_on', 'note': 64, 'velocity': 50, 'time': 18.666648000000013}, {'type': 'note_off', 'note': 64, 'time': 19.111092000000014}, {'type': 'note_on', 'note': 57, 'velocity': 50, 'time': 19.111092000000014}, {'type': 'note_off', 'note': 57, 'time': 19.555536000000014}, 
-{'type': 'note_on', 'note': 57, 'velocity': 50, 'time': 19.555536000000014}, {'type': 'note_off', 'note': 57, 'time': 19.777758000000013}, {'type': 'note_on', 'note': 60, 'velocity': 50, 'time': 19.777758000000013}, {'type': 'note_off', 'note': 60, 'time': 19.99998000000001}, {'type': 'note_on', 'note': 59, 'velocity': 50, 'time': 19.99998000000001}, {'type': 'note_off', 'note': 59, 'time': 20.444424000000012}, {'type': 'note_on', 'note': 59, 'velocity': 50, 'time': 20.444424000000012}, {'type': 'note_off', 'note': 59, 'time': 20.888868000000013}, {'type': 'note_on', 'note': 60, 'velocity': 50, 'time': 20.888868000000013}, {'type': 'note_off', 'note': 60, 'time': 21.11109000000001}, {'type': 'note_on', 'note': 57, 'velocity': 50, 'time': 21.11109000000001}, {'type': 'note_off', 'note': 57, 'time': 21.33331200000001}, {'type': 'note_on', 'note': 59, 'velocity': 50, 'time': 21.33331200000001}, {'type': 'note_off', 'note': 59, 'time': 21.77775600000001}]
+pirate_song_key = Song.load('pirate_song_key.song')
 
 # drums
-pirate_song = [{'type': 'note_on', 'note': 50, 'velocity': 50, 'time': 0.888888}, {'type': 'note_off', 'note': 50, 'time': 1.11111}, {'type': 'note_on', 'note': 45, 'velocity': 50, 'time': 1.11111}, {'type': 'note_off', 'note': 45, 'time': 1.333332}, {'type': 'note_on', 'note': 37, 'velocity': 50, 'time': 1.333332}, {'type': 'note_off', 'note': 37, 'time': 1.777776}, {'type': 'note_on', 'note': 37, 'velocity': 50, 'time': 1.777776}, {'type': 'note_off', 'note': 37, 'time': 2.22222}, {'type': 'note_on', 'note': 37, 'velocity': 50, 'time': 2.22222}, {'type': 'note_off', 'note': 37, 'time': 2.444442}, {'type': 'note_on', 'note': 51, 'velocity': 50, 'time': 2.444442}, {'type': 'note_off', 'note': 51, 'time': 2.666664}, {'type': 'note_on', 'note': 36, 'velocity': 50, 'time': 2.666664}, {'type': 'note_off', 'note': 36, 'time': 3.1111079999999998}, {'type': 'note_on', 'note': 36, 'velocity': 50, 'time': 3.1111079999999998}, {'type': 'note_off', 'note': 36, 'time': 3.5555519999999996}, {'type': 'note_on', 'note': 36, 'velocity': 50, 'time': 3.5555519999999996}, {'type': 'note_off', 'note': 36, 'time': 3.7777739999999995}, {'type': 'note_on', 'note': 38, 'velocity': 50, 'time': 3.7777739999999995}, {'type': 'note_off', 'note': 38, 'time': 3.9999959999999994}, {'type': 'note_on', 'note': 51, 'velocity': 50, 'time': 3.9999959999999994}, {'type': 'note_off', 'note': 51, 'time': 4.444439999999999}, {'type': 'note_on', 'note': 51, 'velocity': 50, 'time': 4.444439999999999}, {'type': 'note_off', 'note': 51, 'time': 4.888883999999999}, {'type': 'note_on', 'note': 37, 'velocity': 50, 'time': 4.888883999999999}, {'type': 'note_off', 'note': 37, 'time': 5.1111059999999995}, {'type': 'note_on', 'note': 45, 'velocity': 50, 'time': 5.1111059999999995}, {'type': 'note_off', 'note': 45, 'time': 5.333328}, {'type': 'note_on', 'note': 37, 'velocity': 50, 'time': 5.333328}, {'type': 'note_off', 'note': 37, 'time': 6.2222159999999995}, {'type': 'note_on', 'note': 50, 'velocity': 50, 'time': 6.2222159999999995}, {'type': 'note_off', 'note': 50, 'time': 6.444438}, {'type': 'note_on', 'note': 45, 'velocity': 50, 'time': 6.444438}, {'type': 'note_off', 'note': 45, 'time': 6.66666}, {'type': 'note_on', 'note': 37, 'velocity': 50, 'time': 6.66666}, {'type': 'note_off', 'note': 37, 'time': 7.111104}, {'type': 'note_on', 'note': 37, 'velocity': 50, 'time': 7.111104}, {'type': 'note_off', 'note': 37, 'time': 7.555548}, {'type': 'note_on', 'note': 37, 'velocity': 50, 'time': 7.555548}, {'type': 'note_off', 'note': 37, 'time': 7.77777}, {'type': 'note_on', 'note': 51, 'velocity': 50, 'time': 7.77777}, {'type': 'note_off', 'note': 51, 'time': 7.999992000000001}, {'type': 'note_on', 'note': 36, 'velocity': 50, 'time': 7.999992000000001}, {'type': 'note_off', 'note': 36, 'time': 8.444436000000001}, {'type': 'note_on', 'note': 36, 'velocity': 50, 'time': 8.444436000000001}, {'type': 'note_off', 'note': 36, 'time': 8.888880000000002}, {'type': 'note_on', 'note': 36, 'velocity': 50, 'time': 8.888880000000002}, {'type': 'note_off', 'note': 36, 'time': 9.111102000000002}, {'type': 'note_on', 'note': 38, 'velocity': 50, 'time': 9.111102000000002}, {'type': 'note_off', 'note': 38, 'time': 9.333324000000003}, {'type': 'note_on', 'note': 51, 'velocity': 50, 'time': 9.333324000000003}, {'type': 'note_off', 'note': 51, 'time': 9.777768000000004}, {'type': 'note_on', 'note': 51, 'velocity': 50, 'time': 9.777768000000004}, {'type': 'note_off', 'note': 51, 'time': 10.222212000000004}, {'type': 'note_on', 'note': 37, 'velocity': 50, 'time': 10.222212000000004}, {'type': 'note_off', 'note': 37, 'time': 10.444434000000005}, {'type': 'note_on', 'note': 45, 'velocity': 50, 'time': 10.444434000000005}, 
-{'type': 'note_off', 'note': 45, 'time': 10.666656000000005}, {'type': 'note_on', 'note': 37, 'velocity': 50, 'time': 10.666656000000005}, {'type': 'note_off', 'note': 37, 'time': 11.555544000000005}, {'type': 'note_on', 'note': 50, 'velocity': 50, 'time': 11.555544000000005}, {'type': 'note_off', 'note': 50, 'time': 11.777766000000005}, {'type': 'note_on', 'note': 45, 'velocity': 50, 'time': 11.777766000000005}, {'type': 'note_off', 'note': 45, 'time': 11.999988000000005}, {'type': 'note_on', 'note': 37, 'velocity': 50, 'time': 11.999988000000005}, {'type': 'note_off', 'note': 37, 'time': 12.444432000000006}, {'type': 'note_on', 'note': 37, 'velocity': 50, 'time': 12.444432000000006}, {'type': 'note_off', 'note': 37, 'time': 12.888876000000007}, {'type': 'note_on', 'note': 37, 'velocity': 50, 'time': 12.888876000000007}, {'type': 'note_off', 'note': 37, 'time': 13.111098000000007}, {'type': 'note_on', 'note': 
-36, 'velocity': 50, 'time': 13.111098000000007}, {'type': 'note_off', 'note': 36, 'time': 13.333320000000008}, {'type': 'note_on', 'note': 38, 'velocity': 50, 'time': 13.333320000000008}, {'type': 'note_off', 'note': 38, 'time': 13.777764000000008}, {'type': 'note_on', 'note': 38, 'velocity': 50, 'time': 13.777764000000008}, {'type': 'note_off', 'note': 38, 'time': 14.222208000000009}, {'type': 'note_on', 'note': 38, 'velocity': 50, 'time': 14.222208000000009}, {'type': 'note_off', 'note': 38, 'time': 14.44443000000001}, {'type': 'note_on', 'note': 47, 'velocity': 50, 'time': 14.44443000000001}, {'type': 'note_off', 'note': 47, 'time': 14.66665200000001}, {'type': 'note_on', 'note': 48, 'velocity': 50, 'time': 14.66665200000001}, {'type': 'note_off', 'note': 48, 'time': 15.11109600000001}, {'type': 'note_on', 'note': 48, 'velocity': 50, 'time': 15.11109600000001}, {'type': 'note_off', 'note': 48, 'time': 15.555540000000011}, {'type': 'note_on', 'note': 47, 'velocity': 50, 'time': 15.555540000000011}, {'type': 'note_off', 'note': 47, 'time': 15.777762000000012}, 
-{'type': 'note_on', 'note': 38, 'velocity': 50, 'time': 15.777762000000012}, {'type': 'note_off', 'note': 38, 'time': 15.999984000000012}, {'type': 'note_on', 'note': 47, 'velocity': 50, 'time': 15.999984000000012}, {'type': 'note_off', 'note': 47, 'time': 16.444428000000013}, {'type': 'note_on', 'note': 37, 'velocity': 50, 'time': 16.444428000000013}, {'type': 'note_off', 'note': 37, 'time': 16.888872000000013}, {'type': 'note_on', 'note': 37, 'velocity': 50, 'time': 16.888872000000013}, {'type': 'note_off', 'note': 37, 'time': 17.111094000000012}, {'type': 'note_on', 'note': 51, 'velocity': 50, 'time': 17.111094000000012}, {'type': 'note_off', 'note': 51, 'time': 17.33331600000001}, {'type': 'note_on', 'note': 36, 'velocity': 50, 'time': 17.33331600000001}, 
-{'type': 'note_off', 'note': 36, 'time': 17.77776000000001}, {'type': 'note_on', 'note': 36, 'velocity': 50, 'time': 17.77776000000001}, {'type': 'note_off', 'note': 36, 'time': 18.222204000000012}, {'type': 'note_on', 'note': 38, 'velocity': 50, 'time': 18.222204000000012}, {'type': 'note_off', 'note': 38, 'time': 18.666648000000013}, {'type': 'note_on', 'note': 47, 'velocity': 50, 'time': 18.666648000000013}, {'type': 'note_off', 'note': 47, 'time': 19.111092000000014}, {'type': 'note_on', 'note': 37, 'velocity': 50, 'time': 19.111092000000014}, {'type': 'note_off', 'note': 37, 'time': 19.555536000000014}, 
-{'type': 'note_on', 'note': 37, 'velocity': 50, 'time': 19.555536000000014}, {'type': 'note_off', 'note': 37, 'time': 19.777758000000013}, {'type': 'note_on', 'note': 36, 'velocity': 50, 'time': 19.777758000000013}, {'type': 'note_off', 'note': 36, 'time': 19.99998000000001}, {'type': 'note_on', 'note': 51, 'velocity': 50, 'time': 19.99998000000001}, {'type': 'note_off', 'note': 51, 'time': 20.444424000000012}, {'type': 'note_on', 'note': 51, 'velocity': 50, 'time': 20.444424000000012}, {'type': 'note_off', 'note': 51, 'time': 20.888868000000013}, {'type': 'note_on', 'note': 36, 'velocity': 50, 'time': 20.888868000000013}, {'type': 'note_off', 'note': 36, 'time': 21.11109000000001}, {'type': 'note_on', 'note': 37, 'velocity': 50, 'time': 21.11109000000001}, {'type': 'note_off', 'note': 37, 'time': 21.33331200000001}, {'type': 'note_on', 'note': 51, 'velocity': 50, 'time': 21.33331200000001}, {'type': 'note_off', 'note': 51, 'time': 21.77775600000001}]
+pirate_song = Song.load('pirate_song.song')
 
 # drums lower (my version)
-pirate_song_me = [{'type': 'note_on', 'note': 35, 'velocity': 50, 'time': 0.888888}, {'type': 'note_off', 'note': 35, 'time': 1.11111}, {'type': 'note_on', 'note': 35, 'velocity': 50, 'time': 1.11111}, {'type': 'note_off', 'note': 35, 'time': 1.333332}, {'type': 'note_on', 'note': 36, 'velocity': 50, 'time': 1.333332}, {'type': 'note_off', 'note': 36, 'time': 1.777776}, {'type': 'note_on', 'note': 36, 'velocity': 50, 'time': 1.777776}, {'type': 'note_off', 'note': 36, 'time': 2.22222}, {'type': 'note_on', 'note': 36, 'velocity': 50, 'time': 2.22222}, {'type': 'note_off', 'note': 36, 'time': 2.444442}, {'type': 'note_on', 'note': 36, 'velocity': 50, 'time': 2.444442}, {'type': 'note_off', 'note': 36, 'time': 2.666664}, {'type': 'note_on', 'note': 35, 'velocity': 50, 'time': 2.666664}, {'type': 'note_off', 'note': 35, 'time': 3.1111079999999998}, {'type': 'note_on', 'note': 35, 'velocity': 50, 'time': 3.1111079999999998}, {'type': 'note_off', 'note': 35, 'time': 3.5555519999999996}, {'type': 'note_on', 'note': 35, 'velocity': 50, 'time': 3.5555519999999996}, {'type': 'note_off', 'note': 35, 'time': 3.7777739999999995}, {'type': 'note_on', 'note': 36, 'velocity': 50, 'time': 3.7777739999999995}, {'type': 'note_off', 'note': 36, 'time': 3.9999959999999994}, {'type': 'note_on', 'note': 36, 'velocity': 50, 'time': 3.9999959999999994}, {'type': 'note_off', 'note': 36, 'time': 4.444439999999999}, {'type': 'note_on', 'note': 36, 'velocity': 50, 'time': 4.444439999999999}, {'type': 'note_off', 'note': 36, 'time': 4.888883999999999}, {'type': 'note_on', 'note': 36, 'velocity': 50, 'time': 4.888883999999999}, {'type': 'note_off', 'note': 36, 'time': 5.1111059999999995}, {'type': 'note_on', 'note': 35, 'velocity': 50, 'time': 5.1111059999999995}, {'type': 'note_off', 'note': 35, 'time': 5.333328}, {'type': 'note_on', 'note': 36, 'velocity': 50, 'time': 5.333328}, {'type': 'note_off', 'note': 36, 'time': 6.2222159999999995}, {'type': 'note_on', 'note': 35, 'velocity': 50, 'time': 6.2222159999999995}, {'type': 'note_off', 'note': 35, 'time': 6.444438}, {'type': 'note_on', 'note': 35, 'velocity': 50, 'time': 6.444438}, {'type': 'note_off', 'note': 35, 'time': 6.66666}, {'type': 'note_on', 'note': 36, 'velocity': 50, 'time': 6.66666}, {'type': 'note_off', 'note': 36, 'time': 7.111104}, {'type': 'note_on', 'note': 36, 'velocity': 50, 'time': 7.111104}, {'type': 'note_off', 'note': 36, 'time': 7.555548}, {'type': 'note_on', 'note': 36, 'velocity': 50, 'time': 7.555548}, {'type': 'note_off', 'note': 36, 'time': 7.77777}, {'type': 'note_on', 'note': 36, 'velocity': 50, 'time': 7.77777}, {'type': 'note_off', 'note': 36, 'time': 7.999992000000001}, {'type': 'note_on', 'note': 35, 'velocity': 50, 'time': 7.999992000000001}, {'type': 'note_off', 'note': 35, 'time': 8.444436000000001}, {'type': 'note_on', 'note': 35, 'velocity': 50, 'time': 8.444436000000001}, {'type': 'note_off', 'note': 35, 'time': 8.888880000000002}, {'type': 'note_on', 'note': 35, 'velocity': 50, 'time': 8.888880000000002}, {'type': 'note_off', 'note': 35, 'time': 9.111102000000002}, {'type': 'note_on', 'note': 36, 'velocity': 50, 'time': 9.111102000000002}, {'type': 'note_off', 'note': 36, 'time': 9.333324000000003}, {'type': 'note_on', 'note': 36, 'velocity': 50, 'time': 9.333324000000003}, {'type': 'note_off', 'note': 36, 'time': 9.777768000000004}, {'type': 'note_on', 'note': 36, 'velocity': 50, 'time': 9.777768000000004}, {'type': 'note_off', 'note': 36, 'time': 10.222212000000004}, {'type': 'note_on', 'note': 36, 'velocity': 50, 'time': 10.222212000000004}, {'type': 'note_off', 'note': 36, 'time': 10.444434000000005}, {'type': 'note_on', 'note': 35, 'velocity': 50, 'time': 10.444434000000005}, 
-{'type': 'note_off', 'note': 35, 'time': 10.666656000000005}, {'type': 'note_on', 'note': 36, 'velocity': 50, 'time': 10.666656000000005}, {'type': 'note_off', 'note': 36, 'time': 11.555544000000005}, {'type': 'note_on', 'note': 35, 'velocity': 50, 'time': 11.555544000000005}, {'type': 'note_off', 'note': 35, 'time': 11.777766000000005}, {'type': 'note_on', 'note': 35, 'velocity': 50, 'time': 11.777766000000005}, {'type': 'note_off', 'note': 35, 'time': 11.999988000000005}, {'type': 'note_on', 'note': 36, 'velocity': 50, 'time': 11.999988000000005}, {'type': 'note_off', 'note': 36, 'time': 12.444432000000006}, {'type': 'note_on', 'note': 36, 'velocity': 50, 'time': 12.444432000000006}, {'type': 'note_off', 'note': 36, 'time': 12.888876000000007}, {'type': 'note_on', 'note': 36, 'velocity': 50, 'time': 12.888876000000007}, {'type': 'note_off', 'note': 36, 'time': 13.111098000000007}, {'type': 'note_on', 'note': 
-35, 'velocity': 50, 'time': 13.111098000000007}, {'type': 'note_off', 'note': 35, 'time': 13.333320000000008}, {'type': 'note_on', 'note': 36, 'velocity': 50, 'time': 13.333320000000008}, {'type': 'note_off', 'note': 36, 'time': 13.777764000000008}, {'type': 'note_on', 'note': 36, 'velocity': 50, 'time': 13.777764000000008}, {'type': 'note_off', 'note': 36, 'time': 14.222208000000009}, {'type': 'note_on', 'note': 36, 'velocity': 50, 'time': 14.222208000000009}, {'type': 'note_off', 'note': 36, 'time': 14.44443000000001}, {'type': 'note_on', 'note': 36, 'velocity': 50, 'time': 14.44443000000001}, {'type': 'note_off', 'note': 36, 'time': 14.66663500000001}, {'type': 'note_on', 'note': 42, 'velocity': 50, 'time': 14.66663500000001}, {'type': 'note_off', 'note': 42, 'time': 15.11109600000001}, {'type': 'note_on', 'note': 42, 'velocity': 50, 'time': 15.11109600000001}, {'type': 'note_off', 'note': 42, 'time': 15.555540000000011}, {'type': 'note_on', 'note': 36, 'velocity': 50, 'time': 15.555540000000011}, {'type': 'note_off', 'note': 36, 'time': 15.777762000000012}, 
-{'type': 'note_on', 'note': 36, 'velocity': 50, 'time': 15.777762000000012}, {'type': 'note_off', 'note': 36, 'time': 15.999984000000012}, {'type': 'note_on', 'note': 36, 'velocity': 50, 'time': 15.999984000000012}, {'type': 'note_off', 'note': 36, 'time': 16.444428000000013}, {'type': 'note_on', 'note': 36, 'velocity': 50, 'time': 16.444428000000013}, {'type': 'note_off', 'note': 36, 'time': 16.888872000000013}, {'type': 'note_on', 'note': 36, 'velocity': 50, 'time': 16.888872000000013}, {'type': 'note_off', 'note': 36, 'time': 17.111094000000012}, {'type': 'note_on', 'note': 36, 'velocity': 50, 'time': 17.111094000000012}, {'type': 'note_off', 'note': 36, 'time': 17.33331600000001}, {'type': 'note_on', 'note': 35, 'velocity': 50, 'time': 17.33331600000001}, 
-{'type': 'note_off', 'note': 35, 'time': 17.77776000000001}, {'type': 'note_on', 'note': 35, 'velocity': 50, 'time': 17.77776000000001}, {'type': 'note_off', 'note': 35, 'time': 18.222204000000012}, {'type': 'note_on', 'note': 36, 'velocity': 50, 'time': 18.222204000000012}, {'type': 'note_off', 'note': 36, 'time': 18.666648000000013}, {'type': 'note_on', 'note': 36, 'velocity': 50, 'time': 18.666648000000013}, {'type': 'note_off', 'note': 36, 'time': 19.111092000000014}, {'type': 'note_on', 'note': 36, 'velocity': 50, 'time': 19.111092000000014}, {'type': 'note_off', 'note': 36, 'time': 19.555536000000014}, 
-{'type': 'note_on', 'note': 36, 'velocity': 50, 'time': 19.555536000000014}, {'type': 'note_off', 'note': 36, 'time': 19.777758000000013}, {'type': 'note_on', 'note': 35, 'velocity': 50, 'time': 19.777758000000013}, {'type': 'note_off', 'note': 35, 'time': 19.99998000000001}, {'type': 'note_on', 'note': 36, 'velocity': 50, 'time': 19.99998000000001}, {'type': 'note_off', 'note': 36, 'time': 20.444424000000012}, {'type': 'note_on', 'note': 36, 'velocity': 50, 'time': 20.444424000000012}, {'type': 'note_off', 'note': 36, 'time': 20.888868000000013}, {'type': 'note_on', 'note': 35, 'velocity': 50, 'time': 20.888868000000013}, {'type': 'note_off', 'note': 35, 'time': 21.11109000000001}, {'type': 'note_on', 'note': 36, 'velocity': 50, 'time': 21.11109000000001}, {'type': 'note_off', 'note': 36, 'time': 21.33331200000001}, {'type': 'note_on', 'note': 36, 'velocity': 50, 'time': 21.33331200000001}, {'type': 'note_off', 'note': 36, 'time': 21.77775600000001}]
+pirate_song_me = Song.load('pirate_song_me.song')
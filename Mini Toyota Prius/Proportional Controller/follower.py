@@ -0,0 +1,112 @@
+# follower.py - follows an AprilTag with two PID loops, used by p_control.py
+#
+# Perception and actuation are separate: see() feeds every camera frame's tag pose
+# to an alpha-beta filter (posefilter.py), step() runs at most control_hz with the real
+# dt since the last step and steers on the filter's prediction for that moment.
+# run_due() is called once per frame, so the control rate is min(fps, control_hz):
+# below control_hz frames per second every frame gets a step, with a longer dt. Through
+# short dropouts the prediction keeps the PIDs going (filter max_predict_ms), after
+# that the car creeps straight ahead until no_tag_timeout_ms and then stops.
+# Gains and timings come from p_control.json, anything missing (also inside the
+# velocity, steer and filter blocks) uses DEFAULTS.
+import json
+import time
+from pid import PID
+from posefilter import PoseFilter
+
+DEFAULTS = {
+    'control_hz': 20,
+    'target_dist': 7,
+    'target_angle': 0,  # car should turn right when angle is negative, left when angle is positive
+    'no_tag_timeout_ms': 1000,
+    'creep_throttle': 0.4,
+    'quiet': True,
+    'velocity': {'kp': 0.1, 'ki': 0.0, 'kd': 0.0, 'limit': 1.0},
+    'steer': {'kp': 10, 'ki': 0.0, 'kd': 0.0, 'limit': 45},
+    'filter': {'alpha': 0.5, 'beta': 0.1, 'gates': (2.0, 3.0, 0.5), 'max_predict_ms': 300},
+    'detect_every': 1,  # 2 runs find_apriltags on every other frame
+}
+
+def load_config(path='p_control.json'):
+    config = dict(DEFAULTS)
+    try:
+        with open(path) as f:
+            loaded = json.load(f)
+    except OSError:
+        print('no %s, using the default gains' % path)
+        return config
+    for key, value in loaded.items():
+        # a partial "velocity", "steer" or "filter" block keeps the defaults it leaves out
+        config[key] = dict(DEFAULTS[key], **value) if isinstance(DEFAULTS.get(key), dict) else value
+    return config
+
+class Follower:
+    '''
+    example usage:
+        follower = Follower(motors, load_config())
+        while True:
+            tags = img.find_apriltags()
+            follower.see(tags[0] if tags else None)
+            follower.run_due()    # drives the motors when a control step is due (at most once per call)
+    '''
+    def __init__(self, motors, config=DEFAULTS):
+        self.motors = motors
+        self.period_ms = 1000 // config['control_hz']
+        self.target_dist = config['target_dist']
+        self.target_angle = config['target_angle']
+        self.timeout_ms = config['no_tag_timeout_ms']
+        self.creep = config['creep_throttle']
+        self.quiet = config['quiet']
+        self.velocity = PID(**config['velocity'])
+        self.steer = PID(**config['steer'])
+        self.pose = PoseFilter(**config['filter'])
+
+        # filtered pose at the last control step
+        self.current_angle = 0
+        self.current_dist = 0
+        self.seen_ms = None
+
+        self.last_step = time.ticks_ms()
+        self.throttle = 0
+        self.angle = 0
+        self.steps = 0
+
+    #PERCEPTION
+    def see(self, tag):
+        if tag is None:
+            return
+        now = time.ticks_ms()
+        # x_translation ranges -7 to 7, rotation is only smoothed for now
+        if self.pose.update(tag.x_translation, -1 * tag.z_translation, tag.z_rotation, now):
+            self.seen_ms = now
+
+    #ACTUATION
+    def run_due(self):
+        now = time.ticks_ms()
+        dt_ms = time.ticks_diff(now, self.last_step)
+        if dt_ms >= self.period_ms:
+            self.last_step = now
+            self.step(dt_ms / 1000)
+
+    def step(self, dt):
+        self.steps += 1
+        now = time.ticks_ms()
+        age = time.ticks_diff(now, self.seen_ms) if self.seen_ms is not None else None
+        state = self.pose.predict(now)
+        if state is not None:
+            self.current_angle, self.current_dist, _ = state
+            self.throttle = self.velocity.update(self.current_dist - self.target_dist, dt)
+            self.angle = self.steer.update(self.current_angle - self.target_angle, dt)
+            if not self.quiet:
+                print("about to drive with {}, {}".format(self.throttle, self.angle))
+        elif age is not None and age <= self.timeout_ms:
+            if not self.quiet:
+                print('no apriltag, driving slowly forward')
+            self.throttle, self.angle = self.creep, 0
+        else:
+            if not self.quiet and self.throttle:
+                print('no apriltag for too long, stopping')
+            self.throttle, self.angle = 0, 0
+            self.velocity.reset()
+            self.steer.reset()
+        self.motors.throttle_angle(self.throttle, self.angle)
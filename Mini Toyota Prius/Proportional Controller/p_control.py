@@ -7,12 +7,14 @@ import time
 import math
 
 from tankdrive import Motors
+from tagtrack import TagTracker
+from follower import Follower, load_config
 
 motors = Motors(Pin('P4', Pin.OUT), Pin('P5', Pin.OUT), Pin('P8', Pin.OUT), Pin('P7', Pin.OUT))
 
 sensor.reset()
 sensor.set_pixformat(sensor.RGB565)
-sensor.set_framesize(sensor.QQVGA) # changing to QVGA (320x240) from QQVGA, makes it slower
+sensor.set_framesize(sensor.QQVGA) # 160x120, the focal lengths below are for this size
 sensor.skip_frames(time=2000)
 sensor.set_auto_gain(False)  # must turn this off to prevent image washout...
 sensor.set_auto_whitebal(False)  # must turn this off to prevent image washout...
@@ -34,53 +36,33 @@ f_y = (2.8 / 2.952) * 120  # find_apriltags defaults to this if not set
 c_x = 160 * 0.5  # find_apriltags defaults to this if not set (the image.w * 0.5)
 c_y = 120 * 0.5  # find_apriltags defaults to this if not set (the image.h * 0.5)
 
+# searches around the last tag and falls back to the full frame after a miss
+tracker = TagTracker(160, 120, fx=f_x, fy=f_y, cx=c_x, cy=c_y)
+
 
 def degrees(radians):
     return (180 * radians) / math.pi
 
-last_tag_seen = 0
-no_tag_timeout = 1  # time in seconds before car stops after not detecting apriltag
+config = load_config('p_control.json') # gains, control rate, quiet mode
+follower = Follower(motors, config) # PID steering at control_hz, or every frame when fps is lower
+
+frame = 0
 
 while True:
     clock.tick()
     img = sensor.snapshot()
-    tags_we_see = img.find_apriltags(fx=f_x, fy=f_y, cx=c_x, cy=c_y)
-    if tags_we_see:
-        for tag in tags_we_see:  # defaults to TAG36H11
-            img.draw_rectangle(tag.rect, color=(255, 0, 0))
-            img.draw_cross(tag.cx, tag.cy, color=(0, 255, 0))
-            print_args = (
-                tag.x_translation,
-                tag.y_translation,
-                tag.z_translation,
-                degrees(tag.x_rotation),
-                degrees(tag.y_rotation),
-                degrees(tag.z_rotation),
-            )
-            # Translation units are unknown. Rotation units are in degrees.
-            #print(tag.x_translation)
-            #print("Tx: %f, Ty %f, Tz %f, Rx %f, Ry %f, Rz %f" % print_args)
-            current_angle = tag.x_translation # range -7 to 7
-            current_dist = -1 * tag.z_translation
-            target_angle = 0 # car should turn right when angle is negative, left when angle is positive
-            target_dist = 7
-            kp_vel = 0.1
-            kp_steer = 10
-            throttle = kp_vel * (current_dist - target_dist)
-            angle = kp_steer * (current_angle - target_angle)
-            print("about to drive with {}, {}".format(throttle, angle))
-            motors.drive(*motors.interpret_throttle_angle(throttle, angle))
-            last_tag_seen = time.time()
-    else: # april tag not being detected, check how long its been since last detection
-        time_since_tag = time.time() - last_tag_seen
-        if time_since_tag < no_tag_timeout:
-            print('no apriltag, driving slowly forward')
-            motors.drive(*motors.interpret_throttle_angle(0.4, 0))  # moves
-        else:
-            print('no apriltag for too long, stopping')
-            motors.drive(*motors.interpret_throttle_angle(0, 0))  # car stops
-
-        motors.drive(*motors.interpret_throttle_angle(throttle, angle))
-    if not tags_we_see:
-        print('no april tag was seen')
-        motors.drive(*motors.interpret_throttle_angle(0, 0)) # stop driving
+    frame += 1
+    if frame % config['detect_every']: # skipped frame, the pose filter predicts through it
+        follower.run_due()
+        continue
+    tags_we_see = tracker.find(img)
+    for tag in tags_we_see:  # defaults to TAG36H11
+        img.draw_rectangle(tag.rect, color=(255, 0, 0))
+        img.draw_cross(tag.cx, tag.cy, color=(0, 255, 0))
+        # Translation units are unknown. Rotation units are in degrees.
+        #print("Tx: %f, Ty %f, Tz %f, Rx %f, Ry %f, Rz %f" % (tag.x_translation, tag.y_translation,
+        #      tag.z_translation, degrees(tag.x_rotation), degrees(tag.y_rotation), degrees(tag.z_rotation)))
+    follower.see(tags_we_see[0] if tags_we_see else None) # perception: newest pose
+    follower.run_due() # actuation: only when a control step is due
+    if not config['quiet']:
+        tracker.log(clock.fps())
@@ -1,5 +1,17 @@
 # tankdrive.py - By: Aengus, Izzy, Tyler - Tue Oct 8 2024
 from machine import PWM
+import time
+
+FULL = 32767 # 65535/2, the most duty a side gets
+SCALE = 1024 # throttle fixed point
+
+def mix_factors(angle):
+    # (left, right) multiples of the throttle for a whole degree, see interpret_throttle_angle
+    if angle == 0:
+        return 1, 1
+    if angle <= 180: # 180 spins left (the old code raised AssertionError there)
+        return 1 - angle / 45, 1
+    return 1, (angle - 315) / 45
 
 class Motors:
     '''
@@ -7,59 +19,74 @@ class Motors:
                     lf,      lb,      rf,      rb
     motors = Motors(Pin(27), Pin(26), Pin(19), Pin(21))
     motors.drive(1.0, -1.0)
+    motors.throttle_angle(0.5, 20)     # same as drive(*interpret_throttle_angle(0.5, 20)), but faster
+    motors = Motors(..., slew=65535)   # a side takes at least half a second from stop to full duty
     '''
-    def __init__(self, lf, lb, rf, rb):
+    def __init__(self, lf, lb, rf, rb, slew=None):
         self.pwm_LF = PWM(lf)
         self.pwm_LF.freq(20000)
-        self.pwm_LF.duty_u16(0) # can be any positive integer 0-1023
+        self.pwm_LF.duty_u16(0) # can be any positive integer 0-65535
 
         self.pwm_LB = PWM(lb)
         self.pwm_LB.freq(20000)
-        self.pwm_LB.duty_u16(0) # can be any positive integer 0-1023
+        self.pwm_LB.duty_u16(0) # can be any positive integer 0-65535
 
         self.pwm_RF = PWM(rf)
         self.pwm_RF.freq(20000)
-        self.pwm_RF.duty_u16(0) # can be any positive integer 0-1023
+        self.pwm_RF.duty_u16(0) # can be any positive integer 0-65535
 
         self.pwm_RB = PWM(rb)
         self.pwm_RB.freq(20000)
-        self.pwm_RB.duty_u16(0) # can be any positive integer 0-1023
+        self.pwm_RB.duty_u16(0) # can be any positive integer 0-65535
+
+        # mixer lookup table, signed duty per unit of throttle for every whole degree
+        self.mix_left = [int(FULL * mix_factors(a)[0]) for a in range(360)]
+        self.mix_right = [int(FULL * mix_factors(a)[1]) for a in range(360)]
+
+        # signed duty currently on each side (positive is forward), writes are skipped when unchanged
+        self.left = 0
+        self.right = 0
+        self.writes = 0
+        self.slew = slew # duty units per second, None for no limit
+        self.last_ms = time.ticks_ms()
+        self.slew_carry = 0 # duty units * 1000 not applied yet
 
-    def drive(self, left, right): # where each is a float between -1.0 and 1.0
-        '''
-        test cases to catch:
-        both arguments must be numbers
-        if the numbers are out of range, round them into range
-        '''
-        #print('about to drive motors with {}, {}'.format(left, right))
-        assert isinstance(left, float) or isinstance(left, int)
-        assert isinstance(right, float) or isinstance(right, int)
-        if left < -1:
-            left = -1
-        if left > 1:
-            left = 1
-        if right < -1:
-            right = -1
-        if right > 1:
-            right = 1
-        if left == 0: # stop both left ones
-            self.pwm_LF.duty_u16(0)
-            self.pwm_LB.duty_u16(0)
-        elif left > 0: # left forward
-            self.pwm_LF.duty_u16(int(65535/2 * left))
-            self.pwm_LB.duty_u16(0)
-        elif left < 0: # left backward
-            self.pwm_LF.duty_u16(0)
-            self.pwm_LB.duty_u16(int(-65535/2 * left))
-        if right == 0: # stop both right ones
-            self.pwm_RF.duty_u16(0)
-            self.pwm_RB.duty_u16(0)
-        elif right > 0: # right forward
-            self.pwm_RF.duty_u16(int(65535/2 * right))
-            self.pwm_RB.duty_u16(0)
-        elif right < 0: # right backward
-            self.pwm_RF.duty_u16(0)
-            self.pwm_RB.duty_u16(int(-65535/2 * right))
+    def drive(self, left, right): # where each is a float between -1.0 and 1.0, out of range values are clamped
+        self.set_duty(int(FULL * left), int(FULL * right))
+
+    def throttle_angle(self, throttle, angle):
+        a = round(angle) % 360
+        t = int(throttle * SCALE)
+        self.set_duty(t * self.mix_left[a] // SCALE, t * self.mix_right[a] // SCALE)
+
+    def set_duty(self, left, right): # signed duty -32767 to 32767 for each side
+        left = -FULL if left < -FULL else FULL if left > FULL else left
+        right = -FULL if right < -FULL else FULL if right > FULL else right
+        if self.slew is not None:
+            now = time.ticks_ms()
+            budget = self.slew * time.ticks_diff(now, self.last_ms) + self.slew_carry
+            self.last_ms = now
+            step = budget // 1000
+            # keep the fraction of a duty unit for the next call, or a small slew at a high
+            # call rate would round to 0 every time and the output would never move
+            self.slew_carry = budget % 1000 if left != self.left or right != self.right else 0
+            left = min(self.left + step, max(self.left - step, left))
+            right = min(self.right + step, max(self.right - step, right))
+        if left != self.left:
+            self.side(self.pwm_LF, self.pwm_LB, self.left, left)
+            self.left = left
+        if right != self.right:
+            self.side(self.pwm_RF, self.pwm_RB, self.right, right)
+            self.right = right
+
+    def side(self, forward, backward, old, new):
+        # only the channels whose duty changes are written
+        if new > 0 or old > 0:
+            forward.duty_u16(new if new > 0 else 0)
+            self.writes += 1
+        if new < 0 or old < 0:
+            backward.duty_u16(-new if new < 0 else 0)
+            self.writes += 1
 
     def interpret_throttle_angle(self, throttle, angle):
         angle = angle % 360
@@ -72,4 +99,3 @@ class Motors:
             #return throttle*((angle-315)/45), throttle
             return throttle, throttle*((angle-315)/45)
         raise AssertionError
-        raise AssertionError
@@ -1,6 +1,9 @@
 import time
 import network
 from mqtt import MQTTClient
+from mqtt_service import client_id
+from priuscmd import Encoder, bucket
+from tagtrack import TagTracker
 
 import sensor
 import time
@@ -24,45 +27,86 @@ print("WiFi Connected", wlan.ifconfig())
 mqtt_broker = "broker.hivemq.com" 
 port = 1883     # this reads anything sent to ME35
 topic_pub = "ME35-24/prius5"
+TEXT_COMMANDS = False # True sends the old "f, 12.3456" text for a car that has not been updated
+encoder = Encoder(text=TEXT_COMMANDS)
+KEEPALIVE_MS = 500 # resend an unchanged command this often while the tag is in view
+REPORT_MS = 1000
         
-client = MQTTClient("ME35_chris", mqtt_broker, port, keepalive=60)
+client = MQTTClient(client_id("PriusCam"), mqtt_broker, port, keepalive=60)
 client.connect()
 
 sensor.reset()
 sensor.set_pixformat(sensor.RGB565)
-sensor.set_framesize(sensor.QQVGA)
+sensor.set_framesize(sensor.QQVGA) # 160x120, QVGA would see the tag from further away but runs slower
 sensor.skip_frames(time=2000)
 sensor.set_auto_gain(False)  # must turn this off to prevent image washout...
 sensor.set_auto_whitebal(False)  # must turn this off to prevent image washout...
 clock = time.clock()
 
 
+def direction(tag):
+    r = (180 * tag.rotation) / math.pi
+    if 150 <= r <= 210:
+        return "f"
+    elif 240 <= r <= 300:
+        return "r"
+    elif r <= 30 or r >= 330:
+        return "b"
+    elif 60 <= r <= 120:
+        return "l"
+    return ""
+
+class Publisher:
+    '''
+    At most one message per frame: the frame's decision is only sent when the command
+    or the distance (in priuscmd.BUCKET_STEP steps) changes, or every keepalive_ms while the tag stays in view.
+    example usage:
+        publisher = Publisher(client, topic_pub, encoder)
+        publisher.frame(cmd, distance, tag_id)   # once per frame
+        publisher.report(clock.fps())            # prints fps and msg/s once a second
+    '''
+    def __init__(self, client, topic, encoder, keepalive_ms=KEEPALIVE_MS, report_ms=REPORT_MS):
+        self.client = client
+        self.topic = topic
+        self.encoder = encoder
+        self.keepalive_ms = keepalive_ms
+        self.report_ms = report_ms
+        self.last = None # (cmd, bucket) that was sent last
+        self.sent_at = time.ticks_ms()
+        self.report_at = time.ticks_ms()
+        self.messages = 0
+
+    def frame(self, cmd, distance, tag_id):
+        now = time.ticks_ms()
+        decision = (cmd, bucket(distance))
+        if decision != self.last or time.ticks_diff(now, self.sent_at) >= self.keepalive_ms:
+            self.client.publish(self.topic, self.encoder.encode(cmd, distance, tag_id))
+            self.last = decision
+            self.sent_at = now
+            self.messages += 1
+
+    def report(self, fps):
+        elapsed = time.ticks_diff(time.ticks_ms(), self.report_at)
+        if elapsed >= self.report_ms:
+            print("fps %.1f, msg/s %.1f" % (fps, self.messages * 1000 / elapsed))
+            self.messages = 0
+            self.report_at = time.ticks_ms()
+
+publisher = Publisher(client, topic_pub, encoder)
+tracker = TagTracker(sensor.width(), sensor.height())
+
 while True:
     clock.tick()
     img = sensor.snapshot()
-    for tag in img.find_apriltags():
+    tags = tracker.find(img) # searches around the last tag, full frame after a miss
+    for tag in tags:
         img.draw_rectangle(tag.rect, color=(255, 0, 0))
         img.draw_cross(tag.cx, tag.cy, color=(0, 255, 0))
-        print_args = (tag.name, tag.id, (180 * tag.rotation) / math.pi)
-        r = (180 * tag.rotation) / math.pi
+    if tags:
+        tag = max(tags, key=lambda t: t.w * t.h) # the nearest tag decides for the whole frame
         distance = tag.z_translation  # z_translation gives an estimate of the distance
-        #print("Tag Family %s, Tag ID %d, rotation %f (degrees)" % print_args)
-        #print(r)
+        #print("Tag Family %s, Tag ID %d, rotation %f (degrees)" % (tag.name, tag.id, (180 * tag.rotation) / math.pi))
         #print("Distance from tag: %f" % distance)
-        
-        msg = ""
-        if 150 <= r <= 210:
-            msg = "f"
-        elif 240 <= r <= 300:
-            msg = "r"
-        elif r <= 30 or r >= 330:
-            msg = "b"
-        elif 60 <= r <= 120:
-            msg = "l"
-            
-        command = msg + ", " + str(distance)
-        
-        client.publish(topic_pub, command)
-        time.sleep_ms(10)
-        
-    #print(clock.fps())
+        publisher.frame(direction(tag), distance, tag.id)
+    publisher.report(clock.fps())
+    tracker.log(clock.fps())
@@ -1,199 +1,239 @@
 from machine import Pin, PWM, I2C
-from mqtt import MQTTClient
-import time, mqtt
+from mqtt_service import MQTTService
+from wifi import WiFi
+import priuscmd
+from speedprofile import SpeedProfile
+from telemetry import Telemetry, APPLIED, MISSED, WATCHDOG, RUNNING
+import time, asyncio
+try:
+    from time import ticks_ms, ticks_diff, ticks_add
+except ImportError:  # CPython
+    def ticks_ms():
+        return int(time.monotonic() * 1000)
+    def ticks_diff(a, b):
+        return a - b
+    def ticks_add(a, b):
+        return a + b
 
-if True:
-    import network
-    import time
+SSID = 'Tufts_Robot'
+KEY = ''
+MQTT_BROKER = 'broker.hivemq.com'
+PORT = 1883
+TOPIC = 'ME35-24/prius5' # openmv.py publishes drive commands here
+DRIVE_COMMANDS = ('f', 'b', 'l', 'r')
 
-    wlan = network.WLAN(network.STA_IF)
-    wlan.active(True)
-    wlan.connect('Tufts_Robot', '')
-
-    print('Wi-Fi connection pending', end = '')
-    while wlan.ifconfig()[0] == '0.0.0.0':
-        print('.', end='')
-        time.sleep(1)
-
-    # We should have a valid IP now via DHCP
-    print('\nWi-Fi connection successful: {}'.format(wlan.ifconfig()))
-
-def buzzer(frequency=440, duration=1):
+async def buzzer(frequency=440, duration=1):
     buzzer_pwm = PWM(Pin(18, Pin.OUT))  # GPIO18 pin
     buzzer_pwm.freq(frequency)
     buzzer_pwm.duty_u16(1000)
-    time.sleep(duration)
+    await asyncio.sleep(duration) # the motors keep running while it beeps
     buzzer_pwm.duty_u16(0)
-    
+
     buzzer_pwm.deinit()
-        
-class CarRight: 
-    def __init__(self):
-        # Motor setup
-        self.right1 = PWM(Pin('GPIO14', Pin.OUT)) # will be in different class eventually
-        self.right1.freq(100)
-        self.right2 = PWM(Pin('GPIO15', Pin.OUT))
-        self.right2.freq(100)
-        self.right2.duty_u16(0)
-        self.right1.duty_u16(0)
-        
-        self.status = False
-        self.mqtt_sub_R()
-
-    def backward_R(self, duty):
-        self.right1.duty_u16(duty)
-        self.right2.duty_u16(0)
-    
-    def forward_R(self, duty):
-        self.right1.duty_u16(0)
-        self.right2.duty_u16(duty)
-        
-    def left_R(self, duty):
-        self.right1.duty_u16(0)
-        self.right2.duty_u16(20000)
-    
-    def right_R(self, duty):
-        self.right1.duty_u16(0)
-        self.right2.duty_u16(duty)
-        
-    def stop_R(self):
-        self.right1.duty_u16(0)
-        self.right2.duty_u16(0)
-    
-    def mqtt_sub_R(self):
-        self.stop_R()
-        mqtt_broker = 'broker.hivemq.com' 
-        port = 1883
-        topic = 'ME35-24/prius5'       # this reads anything sent to ME35
-        #topic_pub = 'ME35-24/prius5'
-        
-        def callback(topic, msg):
-            topic, msg = topic.decode(), msg.decode()
-            print(topic, msg)
-            
-            if msg == "start":
-                self.status = True
-                buzzer()
-            elif msg == "stop":
-                buzzer()
-                self.stop_R()
-                self.status = False
-            
-            if self.status == True and msg != "start":
-                split = msg.split(",")
-        
-                split[1] = float(split[1])
-                
-                dist = abs(split[1])
-                #print(dist)
-                
-                if dist <= 7:
-                    du = 25000
-                elif 7 < dist <= 12:
-                    du = 45000
-                elif 12 < dist:
-                    du = 65000
-                
-                if split[0] == 'f':
-                    self.forward_R(du) # go forward
-                elif split[0] == 'b':
-                    self.backward_R(du) # go backward
-                elif split[0] == 'r':
-                    self.right_R(du) # go right
-                elif split[0] == 'l':
-                    self.left_R(du) # go left
-        
-        client = MQTTClient('PriusR', mqtt_broker, port, keepalive=60)
-        client.set_callback(callback)
-        client.connect()
-        client.subscribe(topic.encode())
 
-        while True:
-            client.check_msg()
-            time.sleep(0.1)
-
-class CarLeft: 
-    def __init__(self):
-        # Motor setup
-        self.left1 = PWM(Pin('GPIO16', Pin.OUT))
-        self.left1.freq(100)
-        self.left2 = PWM(Pin('GPIO17', Pin.OUT))
-        self.left2.freq(100)
-        self.left2.duty_u16(0)
-        self.left1.duty_u16(0)
+class Car:
+    '''
+    Both sides of the car on one board with one MQTT connection. Each command is
+    parsed once and moves both wheels in the same step.
+    The MQTT handler only keeps the newest drive command, a task running at rate_hz
+    applies it, so a burst of camera messages never queues up in front of the motors.
+    Commands only set target duties: every tick the motors ramp toward them by at most
+    full duty per ramp_ms, and if no drive command arrives for deadline_ms the watchdog
+    sets the targets to zero, so the car stops within deadline_ms + ramp_ms.
+    Every tick is recorded for telemetry and sent to TOPIC/telemetry once per telemetry_ms,
+    decode it on a computer with telemetry_decode.py.
+
+    example usage:
+        car = Car()   # left motor GPIO16/17, right motor GPIO14/15, runs forever
+        car.report()  # commands received, applied, dropped as stale, latency in ms
+        car.state()   # target and current duties, watchdog trips
+    '''
+    def __init__(self, left=('GPIO16', 'GPIO17'), right=('GPIO14', 'GPIO15'), name='Prius',
+                 rate_hz=50, report_s=5, ramp_ms=300, deadline_ms=1000, profile='speed_profile.json',
+                 telemetry_ms=1000):
+        # Motor setup, the second pin of each pair drives the wheel forward
+        self.left1, self.left2 = self.motor(left[0]), self.motor(left[1])
+        self.right1, self.right2 = self.motor(right[0]), self.motor(right[1])
+
         self.status = False
-        self.mqtt_sub_L()
-    
-    def backward_L(self, duty):
-        self.left1.duty_u16(duty)
-        self.left2.duty_u16(0)
-    
-    def forward_L(self, duty):
-        self.left1.duty_u16(0)
-        self.left2.duty_u16(duty)
-        
-    def left_L(self, duty):
-        self.left1.duty_u16(0)
-        self.left2.duty_u16(duty)
-    
-    def right_L(self, duty):
-        self.left1.duty_u16(0)
-        self.left2.duty_u16(20000)
-        
-    def stop_L(self):
-        self.left1.duty_u16(0)
-        self.left2.duty_u16(0)
-        
-    def mqtt_sub_L(self):
-        self.stop_L()
-        mqtt_broker = 'broker.hivemq.com' 
-        port = 1883
-        topic = 'ME35-24/prius5'       # this reads anything sent to ME35
-        #topic_pub = 'ME35-24/prius5'
-
-        def callback(topic, msg):
-            topic, msg = topic.decode(), msg.decode()
-            print(topic, msg)
-            
-            if msg == "start":
-                self.status = True
-                buzzer()
-            elif msg == "stop":
-                buzzer()
-                self.stop_L()
-                self.status = False
-
-            
-            if self.status == True and msg != "start":
-                split = msg.split(",")
-        
-                split[1] = float(split[1])
-                
-                dist = abs(split[1])
-                print(dist)
-                
-                if dist <= 7:
-                    du = 25000
-                elif 7 < dist <= 12:
-                    du = 45000
-                elif 12 < dist:
-                    du = 65000
-                
-                if split[0] == 'f':
-                    self.forward_L(du) # go forward
-                elif split[0] == 'b':
-                    self.backward_L(du) # go backward
-                elif split[0] == 'r':
-                    self.right_L(du) # go right
-                elif split[0] == 'l':
-                    self.left_L(du) # go left
-                
-
-        client = MQTTClient('PriusL', mqtt_broker, port, keepalive=60)
-        client.set_callback(callback)
-        client.connect()
-        client.subscribe(topic.encode())
+        self.period_ms = 1000 // rate_hz
+        self.profile = SpeedProfile.load(profile) # distance to duty lookup table
+        self.report_s = report_s
+
+        # Motor output, signed duty per side (positive is forward)
+        self.target_left = 0
+        self.target_right = 0
+        self.left = 0 # on the motors right now
+        self.right = 0
+        self.ramp_step = 65535 * self.period_ms // ramp_ms # most a side changes per tick
+        self.deadline_ms = deadline_ms
+        self.last_command = None # ticks_ms() of the last drive command applied
+        self.watchdog_trips = 0
+
+        # Latest drive command
+        self.cmd = None
+        self.duty = 0
+        self.received = 0 # ticks_ms() when the message arrived
+        self.pending = False
+        self.seq = None # sequence number of the newest binary command
+
+        # Stats
+        self.commands = 0
+        self.applied = 0
+        self.stale = 0 # replaced by a newer command before the motor task ran
+        self.out_of_order = 0 # duplicate or older sequence numbers, dropped
+        self.ignored = 0 # not a drive command, dropped
+        self.best_offset = None # smallest receive minus send time, the two clocks are not synced
+        self.delay = 0 # how much later than the fastest message the last one arrived
+        self.latency = 0
+        self.latency_total = 0
+        self.latency_max = 0
+        self.missed = 0 # ticks that came more than a tick period late
+
+        # Wi-Fi and MQTT come up in the background
+        self.wifi = WiFi(SSID, KEY)
+        self.mq = MQTTService(name, MQTT_BROKER, PORT, wifi=self.wifi)
+        self.mq.on(TOPIC, self.on_message)
+        self.telemetry = Telemetry(self.mq, TOPIC + '/telemetry', upload_ms=telemetry_ms)
+        asyncio.run(self.main())
 
+    #MOTORS
+    def motor(self, pin):
+        pwm = PWM(Pin(pin, Pin.OUT))
+        pwm.freq(100)
+        pwm.duty_u16(0)
+        return pwm
+
+    def side(self, backward, forward, duty):
+        backward.duty_u16(-duty if duty < 0 else 0)
+        forward.duty_u16(duty if duty > 0 else 0)
+
+    def wheels(self, left, right): # signed target duty for each side, positive is forward
+        self.target_left = left
+        self.target_right = right
+
+    def ramp(self, now, target):
+        if target > now:
+            return min(target, now + self.ramp_step)
+        return max(target, now - self.ramp_step)
+
+    def output(self):
+        # one ramp step toward the targets, PWM is only written when a side changes
+        left = self.ramp(self.left, self.target_left)
+        right = self.ramp(self.right, self.target_right)
+        if left != self.left:
+            self.side(self.left1, self.left2, left)
+            self.left = left
+        if right != self.right:
+            self.side(self.right1, self.right2, right)
+            self.right = right
+
+    def state(self):
+        return {'target': (self.target_left, self.target_right), 'duty': (self.left, self.right),
+                'running': self.status, 'watchdog_trips': self.watchdog_trips}
+
+    def drive(self, cmd, du):
+        # returns False if cmd isn't a drive command, the targets stay as they were
+        if cmd == 'f':
+            self.wheels(du, du) # go forward
+        elif cmd == 'b':
+            self.wheels(-du, -du) # go backward
+        elif cmd == 'r':
+            self.wheels(self.profile.turn_duty, du) # go right
+        elif cmd == 'l':
+            self.wheels(du, self.profile.turn_duty) # go left
+        else:
+            return False
+        return True
+
+    def stop(self):
+        self.wheels(0, 0)
+
+    #MQTT CALLBACK
+    def on_message(self, topic, msg):
+        word = msg.split(b",")[0].strip() # teachable.py sends "start, " and "stop, "
+        if word == b"start":
+            print("start")
+            self.status = True
+            self.seq = None # the camera may have restarted
+            asyncio.create_task(buzzer())
+        elif word == b"stop":
+            print("stop")
+            asyncio.create_task(buzzer())
+            self.status = False
+            self.pending = False
+            self.stop()
+        elif self.status:
+            command = priuscmd.decode(msg) # binary or the old text form
+            if command is None:
+                return
+            cmd, dist, tag_id, seq, sent = command
+            if seq is not None:
+                if not priuscmd.newer(seq, self.seq):
+                    self.out_of_order += 1
+                    return
+                self.seq = seq
+                offset = ticks_diff(self.mq.last_received, sent)
+                if self.best_offset is None or offset < self.best_offset:
+                    self.best_offset = offset
+                self.delay = offset - self.best_offset
+            if cmd not in DRIVE_COMMANDS: # e.g. '' when the tag matches no direction, must not feed the watchdog
+                self.ignored += 1
+                return
+            self.commands += 1
+            if self.pending:
+                self.stale += 1
+            self.cmd = cmd
+            self.duty = self.profile.duty(dist)
+            self.received = self.mq.last_received
+            self.pending = True
+
+    #ASYNC STUFF
+    async def motor_task(self):
+        next_tick = last_tick = ticks_ms()
         while True:
-            client.check_msg()
-            time.sleep(0.1)
+            now = ticks_ms()
+            period = ticks_diff(now, last_tick)
+            last_tick = now
+            flags = RUNNING if self.status else 0
+            if period > 2 * self.period_ms:
+                self.missed += 1
+                flags |= MISSED
+            received = 0
+            if self.pending:
+                self.pending = False
+                if self.drive(self.cmd, self.duty):
+                    self.last_command = self.received
+                received = self.received
+                self.applied += 1
+                self.latency = ticks_diff(now, self.received)
+                self.latency_total += self.latency
+                self.latency_max = max(self.latency_max, self.latency)
+                flags |= APPLIED
+            moving = self.target_left or self.target_right
+            if moving and (self.last_command is None or ticks_diff(now, self.last_command) > self.deadline_ms):
+                print("no drive command for %d ms, stopping" % self.deadline_ms)
+                self.watchdog_trips += 1
+                self.stop()
+                flags |= WATCHDOG
+            self.output()
+            self.telemetry.record(now, received, self.left, self.right, period, self.delay, flags)
+            next_tick = ticks_add(next_tick, self.period_ms)
+            delay = ticks_diff(next_tick, ticks_ms())
+            if delay < 0: # fell behind, don't try to catch up with a burst of updates
+                next_tick = ticks_ms()
+                delay = 0
+            await asyncio.sleep(delay / 1000)
+
+    def report(self):
+        average = self.latency_total / self.applied if self.applied else 0
+        return 'commands %d applied %d stale %d out of order %d ignored %d latency last %d avg %.1f max %d ms, network delay %d ms, missed ticks %d' % (
+            self.commands, self.applied, self.stale, self.out_of_order, self.ignored, self.latency, average, self.latency_max, self.delay, self.missed)
+
+    async def log(self):
+        while self.report_s:
+            await asyncio.sleep(self.report_s)
+            print(self.report())
+
+    async def main(self):
+        await asyncio.gather(self.wifi.run(), self.mq.run(), self.motor_task(), self.log(), self.telemetry.uplink())
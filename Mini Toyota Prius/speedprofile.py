@@ -0,0 +1,71 @@
+# speedprofile.py - distance to motor duty for the Prius, from speed_profile.json
+#
+# A profile is either a piecewise-linear table of [distance, duty] points or a curve
+#   {"curve": {"start": 3, "full": 20, "min_duty": 20000, "max_duty": 65000, "exponent": 1.5}}
+# (min_duty up to start, max_duty from full on, in between min + (max - min) * x ** exponent).
+# Whichever profile the config selects is compiled once into an integer lookup table
+# with one entry per `resolution` distance units, so duty() is a multiply and an index.
+import json
+from array import array
+
+DEFAULT = {
+    'profile': 'steps',
+    'resolution': 0.1,
+    'max_distance': 30,
+    'turn_duty': 20000, # the other wheel on a turn
+    'profiles': {
+        # the original three speeds: <=7, 7-12, >12
+        'steps': {'points': [[0, 25000], [7, 25000], [7.01, 45000], [12, 45000], [12.01, 65000]]},
+    },
+}
+
+def interpolate(points, d):
+    if d <= points[0][0]:
+        return points[0][1]
+    for (d0, v0), (d1, v1) in zip(points, points[1:]):
+        if d <= d1:
+            return v0 + (v1 - v0) * (d - d0) / (d1 - d0) if d1 > d0 else v1
+    return points[-1][1]
+
+def curve(c, d):
+    if d <= c['start']:
+        return c['min_duty']
+    if d >= c['full']:
+        return c['max_duty']
+    x = (d - c['start']) / (c['full'] - c['start'])
+    return c['min_duty'] + (c['max_duty'] - c['min_duty']) * x ** c.get('exponent', 1)
+
+class SpeedProfile:
+    '''
+    example usage:
+        profile = SpeedProfile.load('speed_profile.json')   # or SpeedProfile() for the old three steps
+        du = profile.duty(distance)                          # 0-65535
+        profile.turn_duty
+    '''
+    def __init__(self, config=DEFAULT):
+        self.name = config.get('profile', DEFAULT['profile'])
+        spec = config.get('profiles', DEFAULT['profiles'])[self.name]
+        resolution = config.get('resolution', DEFAULT['resolution'])
+        max_distance = config.get('max_distance', DEFAULT['max_distance'])
+        self.turn_duty = config.get('turn_duty', DEFAULT['turn_duty'])
+        self.scale = 1 / resolution
+        size = int(max_distance * self.scale) + 1
+        if 'points' in spec:
+            points = sorted(spec['points'])
+            value = lambda d: interpolate(points, d)
+        else:
+            value = lambda d: curve(spec['curve'], d)
+        self.lut = array('H', (max(0, min(65535, int(value(i * resolution)))) for i in range(size)))
+
+    @classmethod
+    def load(cls, path='speed_profile.json'):
+        try:
+            with open(path) as f:
+                return cls(json.load(f))
+        except OSError:
+            print('no %s, using the original three speeds' % path)
+            return cls()
+
+    def duty(self, distance):
+        i = int(abs(distance) * self.scale)
+        return self.lut[i] if i < len(self.lut) else self.lut[-1]
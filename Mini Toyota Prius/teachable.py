@@ -1,16 +1,41 @@
 #Code to run on PC for Teachable Machine Joystick
+from pyscript import document
+from pyscript.ffi import create_proxy
 from pyscript.js_modules import teach, mqtt_library
 import asyncio
+from gesture import Gestures
 
 
 class TM_manager:
-    def __init__(self):
+    '''
+    Predictions come straight from the model: teach.s calls s.onPrediction with the
+    array of {className, probability} after every inference, so there is no page text
+    to parse and a gesture goes out in the same inference cycle that recognised it.
+    gesture.Gestures smooths them (moving average, enter/exit thresholds, dwell time)
+    and a message is only sent when the gesture changes.
+    The hook isn't in every teach.js: with mode='auto' (the default), if no prediction
+    has come through it callback_wait_s after the model started, it says so and reads
+    the class divs every poll_s instead (faster than the old 500 ms, the smoothing needs
+    a few readings per gesture). mode='poll' always polls, mode='callback' never does.
+
+    example usage:
+        tm = TM_manager(alpha=0.8, enter=0.75, exit=0.5, dwell_ms=50)
+    '''
+    def __init__(self, mode='auto', alpha=0.8, enter=0.75, exit=0.5, dwell_ms=50, poll_s=0.1, callback_wait_s=3):
         self.model_url = "https://teachablemachine.withgoogle.com/models/NBhO5RYqS/"
         self.num_classes = 3
+        self.messages = {'start': "start, ", 'stop': "stop, "} # gesture label -> what gets sent
 
         self.mqtt_topic = "ME35-24/prius5"
         self.myClient = mqtt_library.myClient
 
+        self.mode = mode
+        self.poll_s = poll_s
+        self.callback_wait_s = callback_wait_s
+        self.callbacks = 0 # predictions that came through s.onPrediction
+        self.smoothing = dict(alpha=alpha, enter=enter, exit=exit, dwell_ms=dwell_ms)
+        self.gestures = None # made once the model reports its class names
+
     async def connect_mqtt(self):
         self.myClient.init()
         while not self.myClient.connected:
@@ -19,12 +44,22 @@ class TM_manager:
     async def run_model(self):
         s = teach.s
         s.URL2 = self.model_url
+        if self.mode != 'poll':
+            self.callback = create_proxy(self.on_prediction) # kept so it is not garbage collected
+            s.onPrediction = self.callback
         await s.init()
 
     def send(self, msg):
         print('send ', msg)
         self.myClient.publish(self.mqtt_topic, str(msg))
 
+    def on_prediction(self, prediction):
+        # prediction is the model output, one {className, probability} per class
+        self.callbacks += 1
+        if self.mode == 'poll': # fell back already, the page text is the only source now
+            return
+        self.update([p.className for p in prediction], [p.probability for p in prediction])
+
     def get_predictions(self):
         predictions = []
         for i in range (self.num_classes):
@@ -38,26 +73,28 @@ class TM_manager:
                     return ""
         return predictions
 
+    def update(self, labels, probabilities):
+        if self.gestures is None:
+            self.gestures = Gestures(labels, **self.smoothing)
+        label = self.gestures.update(probabilities)
+        message = self.messages.get(label)
+        if message is not None and self.myClient.connected:
+            self.send(message)
+
     async def run(self):
-        threshold = 0.85
-        last_sent_message = None
+        if self.mode == 'auto':
+            await asyncio.sleep(self.callback_wait_s)
+            if self.callbacks:
+                self.mode = 'callback'
+            else:
+                print('no predictions through teach.s.onPrediction after %d s, polling the page instead' % self.callback_wait_s)
+                self.mode = 'poll'
         while True:
-            if self.myClient.connected:
+            if self.mode == 'poll' and self.myClient.connected:
                 predictions = self.get_predictions()
                 if predictions and len(predictions) == self.num_classes:
-                    max_prediction = max(predictions, key=lambda x: x[1])
-                    gesture_label, confidence = max_prediction
-
-                    if confidence >= threshold:
-                        if gesture_label == 'start' and last_sent_message != "start":
-                            self.send("start, ")
-                            last_sent_message = "start"
-                        elif gesture_label == "stop" and last_sent_message != "stop":
-                            self.send("stop, ")
-                            last_sent_message = "stop"
-                    else:
-                        last_sent_message = None
-            await asyncio.sleep(0.5)
+                    self.update([label for label, _ in predictions], [confidence for _, confidence in predictions])
+            await asyncio.sleep(self.poll_s)
 
 tm_manger = TM_manager()
 await tm_manger.connect_mqtt()
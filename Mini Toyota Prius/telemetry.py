@@ -0,0 +1,76 @@
+# telemetry.py - Prius motor loop telemetry, recorded into a ring buffer and sent over MQTT
+#
+# Every motor tick is one 17 byte record, little endian:
+#   tick ticks_ms (uint32), receive ticks_ms of the command applied this tick or 0 (uint32),
+#   left and right duty (int16, signed duty / 2), tick period ms (uint16),
+#   network delay ms (uint16), flags (uint8, see below)
+# uplink() publishes whatever has been recorded every upload_ms as one frame:
+#   b'PT', version, record size, record count (uint16), records lost to overflow (uint16)
+# followed by the records. telemetry_decode.py turns frames into histograms.
+import asyncio
+import struct
+
+MAGIC = b'PT'
+VERSION = 1
+HEADER = '<2sBBHH'
+HEADER_SIZE = 8
+RECORD = '<IIhhHHB'
+RECORD_SIZE = 17
+
+# flags
+APPLIED = 0x01  # a new command reached the motors this tick
+MISSED = 0x02  # the tick came more than a whole tick period late
+WATCHDOG = 0x04  # the watchdog stopped the car this tick
+RUNNING = 0x08  # between "start" and "stop"
+
+class Telemetry:
+    '''
+    example usage:
+        telemetry = Telemetry(mq, 'ME35-24/prius5/telemetry')
+        telemetry.record(now, received, left, right, period_ms, delay_ms, flags)   # every tick
+        asyncio.create_task(telemetry.uplink())   # batches go out every upload_ms
+    '''
+    def __init__(self, mq, topic, capacity=128, batch=60, upload_ms=1000):
+        self.mq = mq
+        self.topic = topic
+        self.capacity = capacity
+        self.upload_ms = upload_ms
+        self.ring = bytearray(capacity * RECORD_SIZE)
+        self.head = 0
+        self.count = 0
+        self.lost = 0  # overwritten before they were sent
+        self.frame = bytearray(HEADER_SIZE + batch * RECORD_SIZE)
+        self.batch = batch
+        self.sent = 0
+
+    def record(self, tick, received, left, right, period, delay, flags):
+        if self.count == self.capacity:  # full, drop the oldest
+            self.head = (self.head + 1) % self.capacity
+            self.count -= 1
+            self.lost += 1
+        i = (self.head + self.count) % self.capacity
+        struct.pack_into(RECORD, self.ring, i * RECORD_SIZE, tick, received, left // 2, right // 2,
+                         min(period, 0xFFFF), max(0, min(delay, 0xFFFF)), flags)
+        self.count += 1
+
+    def take(self):
+        # moves up to batch records into the frame, returns its length
+        n = min(self.count, self.batch)
+        struct.pack_into(HEADER, self.frame, 0, MAGIC, VERSION, RECORD_SIZE, n, min(self.lost, 0xFFFF))
+        self.lost = 0
+        for k in range(n):
+            src = self.head * RECORD_SIZE
+            dst = HEADER_SIZE + k * RECORD_SIZE
+            self.frame[dst:dst + RECORD_SIZE] = self.ring[src:src + RECORD_SIZE]
+            self.head = (self.head + 1) % self.capacity
+        self.count -= n
+        return HEADER_SIZE + n * RECORD_SIZE
+
+    async def uplink(self):
+        while True:
+            await asyncio.sleep(self.upload_ms / 1000)
+            while self.count and self.mq.connected:
+                size = self.take()
+                if self.mq.publish(self.topic, memoryview(self.frame)[:size]):
+                    self.sent += 1
+                await asyncio.sleep(0)  # let the motor task run between frames
@@ -0,0 +1,118 @@
+# telemetry_decode.py - turns Prius telemetry frames into latency histograms (runs on the computer)
+#
+# usage:
+#   python telemetry_decode.py capture.bin                  # frames saved back to back
+#   python telemetry_decode.py --live -o capture.bin        # subscribe to ME35-24/prius5/telemetry (needs paho-mqtt)
+#   python telemetry_decode.py capture.bin --records        # print every record too
+#
+# Latency is how long a command waited between the MQTT handler and the motors
+# (tick - received), period is the time between motor ticks, delay is how much later
+# than the fastest message each command arrived (see Car.on_message).
+import argparse
+import struct
+import sys
+
+from telemetry import MAGIC, VERSION, HEADER, HEADER_SIZE, RECORD, RECORD_SIZE, APPLIED, MISSED, WATCHDOG, RUNNING
+
+TOPIC = 'ME35-24/prius5/telemetry'
+BROKER = 'broker.hivemq.com'
+TICKS_MASK = (1 << 30) - 1 # ticks_ms() wraps at 2**30 on the board
+
+def frames(data):
+    # splits a capture into (lost, records) per frame
+    i = 0
+    while i + HEADER_SIZE <= len(data):
+        magic, version, size, count, lost = struct.unpack_from(HEADER, data, i)
+        if magic != MAGIC or version != VERSION or size != RECORD_SIZE:
+            raise ValueError('not a version %d telemetry frame at byte %d' % (VERSION, i))
+        i += HEADER_SIZE
+        if i + count * size > len(data):
+            raise ValueError('frame at byte %d is cut short' % (i - HEADER_SIZE))
+        records = [struct.unpack_from(RECORD, data, i + k * size) for k in range(count)]
+        i += count * size
+        yield lost, records
+
+def histogram(name, values, bins=(0, 1, 2, 5, 10, 20, 50, 100, 200, 500, 1000), width=40):
+    print('%s: %d samples' % (name, len(values)))
+    if not values:
+        return
+    values = sorted(values)
+    print('  min %d  median %d  p95 %d  p99 %d  max %d ms' % (
+        values[0], values[len(values) // 2], values[int(len(values) * 0.95)],
+        values[int(len(values) * 0.99)], values[-1]))
+    edges = list(bins) + [None]
+    counts = [0] * (len(edges) - 1)
+    for v in values:
+        for k in range(len(counts)):
+            if edges[k + 1] is None or v < edges[k + 1]:
+                counts[k] += 1
+                break
+    top = max(counts)
+    for k, n in enumerate(counts):
+        label = '%d-%d' % (edges[k], edges[k + 1] - 1) if edges[k + 1] is not None else '%d+' % edges[k]
+        print('  %9s ms %6d %s' % (label, n, '#' * (n * width // top if top else 0)))
+
+def summarize(data, show_records=False):
+    latency, period, delay = [], [], []
+    ticks = lost = missed = watchdog = running = 0
+    for frame_lost, records in frames(data):
+        lost += frame_lost
+        for tick, received, left, right, tick_period, net_delay, flags in records:
+            ticks += 1
+            if show_records:
+                print('%10d %10d %6d %6d %4d %4d %s' % (tick, received, left * 2, right * 2, tick_period, net_delay,
+                      ''.join(c for c, bit in (('A', APPLIED), ('M', MISSED), ('W', WATCHDOG), ('R', RUNNING)) if flags & bit)))
+            period.append(tick_period)
+            if flags & APPLIED:
+                latency.append((tick - received) & TICKS_MASK)
+                delay.append(net_delay)
+            missed += bool(flags & MISSED)
+            watchdog += bool(flags & WATCHDOG)
+            running += bool(flags & RUNNING)
+    print('%d ticks (%d running), %d lost to overflow, %d missed deadlines, %d watchdog stops' % (
+        ticks, running, lost, missed, watchdog))
+    histogram('command latency (receive to motors)', latency)
+    histogram('motor loop period', period)
+    histogram('network delay', delay)
+
+def live(path, broker, topic):
+    try:
+        import paho.mqtt.client as mqtt
+    except ImportError:
+        sys.exit('--live needs paho-mqtt (pip install paho-mqtt)')
+    out = open(path, 'ab')
+    def on_message(client, userdata, msg):
+        out.write(msg.payload)
+        out.flush()
+        for lost, records in frames(msg.payload):
+            print('frame: %d records, %d lost' % (len(records), lost))
+    client = mqtt.Client()
+    client.on_message = on_message
+    client.connect(broker, 1883)
+    client.subscribe(topic)
+    print('saving %s to %s, ctrl-c to stop and summarize' % (topic, path))
+    try:
+        client.loop_forever()
+    except KeyboardInterrupt:
+        pass
+    out.close()
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Decode Prius telemetry frames')
+    parser.add_argument('capture', nargs='?', help='file of frames saved back to back')
+    parser.add_argument('--live', action='store_true', help='record from the broker first')
+    parser.add_argument('-o', '--output', default='telemetry.bin', help='where --live saves frames')
+    parser.add_argument('--broker', default=BROKER)
+    parser.add_argument('--topic', default=TOPIC)
+    parser.add_argument('--records', action='store_true', help='print every record')
+    args = parser.parse_args(argv)
+    if args.live:
+        live(args.output, args.broker, args.topic)
+        args.capture = args.output
+    if not args.capture:
+        parser.error('give a capture file or --live')
+    with open(args.capture, 'rb') as f:
+        summarize(f.read(), args.records)
+
+if __name__ == '__main__':
+    main()
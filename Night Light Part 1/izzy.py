@@ -1,6 +1,7 @@
-import time, mqtt, machine, network, secrets, asyncio, neopixel
+import time, machine, secrets, asyncio, neopixel
 from machine import Pin, PWM
-from mqtt import MQTTClient
+from mqtt_service import MQTTService
+from wifi import WiFi
 from secrets import mysecrets, nlsecrets
 
 class NightLight:
@@ -10,6 +11,7 @@ class NightLight:
         self.mqtt_broker = 'broker.hivemq.com' 
         self.port = 1883
         self.topic_sub = nlsecrets['Sub_Topic'] # this reads anything sent to our subscribed topic
+        self.wifi = WiFi(mysecrets['SSID'], mysecrets['key']) # connects when its run() task starts
         self.buzz = PWM(Pin('GPIO18', Pin.OUT))
         self.buzz.freq(440)
         self.state = (100,0,100)
@@ -20,18 +22,6 @@ class NightLight:
         self.led.freq(50)
         
         
-    #WIFI
-    def connect(self):
-        wlan = network.WLAN(network.STA_IF)
-        wlan.active(True)
-        wlan.connect(mysecrets['SSID'], mysecrets['key'])
-        while wlan.ifconfig()[0] == '0.0.0.0':
-            print('.', end=' ')
-            time.sleep(1)
-        # We should have a valid IP now via DHCP
-        print(wlan.ifconfig())
-        return wlan.ifconfig()
-    
     #NEOPIXEL RGB VALUE
     def update_state(self, button_pressed):
         if button_pressed:  # Assuming button_pressed is a boolean
@@ -64,12 +54,10 @@ class NightLight:
     
     #MQTT CALLBACK
     def mqtt_connect(self, callback):
-        client = MQTTClient('ME35_chris', self.mqtt_broker , self.port, keepalive=60)
-        client.connect()
-        print('Connected to %s MQTT broker' % (self.mqtt_broker))
-        client.set_callback(callback)
-        client.subscribe(self.topic_sub)
-        return client
+        # connects when its run() task starts, then reconnects on its own
+        mq = MQTTService('NightLight', self.mqtt_broker, self.port, wifi=self.wifi)
+        mq.on(self.topic_sub, callback)
+        return mq
     
     #RESET PINS
     def reset(self):
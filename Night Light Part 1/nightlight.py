@@ -1,6 +1,5 @@
-import machine, asyncio, neopixel, izzy, mqtt
+import machine, asyncio, neopixel, izzy
 from machine import Pin, PWM
-from mqtt import MQTTClient
 nl = izzy.NightLight()
 
 async def check_mqtt():
@@ -13,10 +12,8 @@ async def check_mqtt():
             is_active = False
             print('Off!')
         print((topic.decode(), msg.decode()))
-    client = nl.mqtt_connect(callback)
-    while True:
-        client.check_msg()
-        await asyncio.sleep(0.1)
+    mq = nl.mqtt_connect(callback)
+    await mq.run()
 
 async def check_btn():
     global is_active
@@ -49,8 +46,7 @@ async def breathe():
 async def main():
     global is_active
     is_active = False
-    nl.connect()
-    tasks = asyncio.gather(check_mqtt(),check_btn(),breathe())
+    tasks = asyncio.gather(nl.wifi.run(),check_mqtt(),check_btn(),breathe())
     await tasks # wait for duration
     
 asyncio.run(main())
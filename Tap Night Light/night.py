@@ -1,17 +1,19 @@
-import time, mqtt, machine, network, secrets, asyncio, neopixel
+import time, machine, secrets, asyncio, neopixel
 from machine import Pin, PWM, I2C
-from mqtt import MQTTClient
+from mqtt_service import MQTTService
+from wifi import WiFi
 from secrets import mysecrets, nlsecrets
+from accel import TapAccel, SINGLE_TAP, DOUBLE_TAP
 
 class NightLight:
     
     #INITIALIZE
-    def __init__(self, scl, sda, addr=0x62):
+    def __init__(self, scl, sda, int_pin=None, addr=0x62):
         
         # I2C stuff for accelerometer
         self.addr = addr
         self.i2c = I2C(0, scl=scl, sda=sda, freq=100000)
-        self.init_tap_detection()
+        self.accel = TapAccel(self.i2c, int_pin, addr=addr)
         
         # MQTT setup
         self.mqtt_broker = 'broker.hivemq.com' 
@@ -68,72 +70,28 @@ class NightLight:
         self.light2.off()
         self.led_status = False
         
-        # Connect to wifi and MQTT
-        self.connect()
+        # Wi-Fi and MQTT connect in the background once main() runs
+        self.wifi = WiFi(mysecrets['SSID'], mysecrets['key'])
         self.mqtt_connect()
         
         # Run tasks
         asyncio.run(self.main())
         
-    #ACCELEROMETER SETUP
-    def write_byte(self, reg, value):
-        self.i2c.writeto_mem(self.addr, reg, value.to_bytes(1, 'little'))
-
-    def read_byte(self, reg):
-        return int.from_bytes(self.i2c.readfrom_mem(self.addr, reg, 1), 'little')
-
-    def init_tap_detection(self):
-        # Enable single (bit 5) and double (bit 4) tap interrupts
-        tap_interrupt = (1 << 5) | (1 << 4)  # Puts a 1 at bit 5 and a 1 at bit 4
-        self.write_byte(0x16, tap_interrupt)
-        # Re-check if bits 5 and 4 are set in register 0x16
-        int_config = self.read_byte(0x16)
-        print(f"Interrupt config (0x16): {int_config:08b}")  # Should print 00110000
-
-        self.write_byte(0x10, 0x03)  # Set ODR to 250Hz
-        self.write_byte(0x11, 0x02)  # Set to normal mode
-        
-        # Set tap threshold (e.g., 250 mg in 8g range, value = 4 in 8g mode, adjust as necessary)
-        self.write_byte(0x0F, 0x00)  # Set to 2g mode
-        self.write_byte(0x2B, 0x03)  # Lower threshold for 2g mode
-
-        # Set tap parameters: TAP_DUR (bits 0-2), TAP_SHOCK (bit 6), TAP_QUIET (bit 7) in register 0x2A
-        tap_dur = 0x07  # Big value for tap duration
-        tap_shock = 0x01  # Low value for shock
-        tap_quiet = 0x01  # Low value for quiet
-        tap_settings = (tap_quiet << 7) | (tap_shock << 6) | tap_dur
-        self.write_byte(0x2A, tap_settings)
-
+    #ACCELEROMETER TAPS
     async def check_tap_status(self):
         while True:
-            if self.go:
-                # Check the interrupt status register for single and double tap (register 0x09)
-                status = self.read_byte(0x09)
-                single_tap = status & 0x20  # Bit 5 for single tap
-                double_tap = status & 0x10  # Bit 4 for double tap
-                if single_tap:
-                    print("Single tap detected!")
-                    self.update_state(True) # Update state and NeoPixel light after single tap
-                if double_tap:
-                    print("Double tap detected!")
-                    self.play_song()
-                    self.client.publish(self.topic_pub, self.msg)
-                await asyncio.sleep(0.01)
+            _, status, _ = await self.accel.queue.get() # wakes up only when the accelerometer reports a tap
             if not self.go:
-                self.reset()
-                await asyncio.sleep(0.01)
-    
-    #WIFI
-    def connect(self):
-        wlan = network.WLAN(network.STA_IF)
-        wlan.active(True)
-        wlan.connect(mysecrets['SSID'], mysecrets['key'])
-        while wlan.ifconfig()[0] == '0.0.0.0':
-            print('.', end=' ')
-            time.sleep(1)
-        # We should have a valid IP now via DHCP
-        print(wlan.ifconfig())
-        return wlan.ifconfig()
+                continue # taps are ignored while off, breathe() keeps the outputs reset
+            single_tap = status & SINGLE_TAP
+            double_tap = status & DOUBLE_TAP
+            if single_tap:
+                print("Single tap detected!")
+                self.update_state(True) # Update state and NeoPixel light after single tap
+            if double_tap:
+                print("Double tap detected!")
+                self.play_song()
+                self.mq.publish(self.topic_pub, self.msg)
     
     #NEOPIXEL RGB VALUE
     def update_state(self, button_pressed):
@@ -176,11 +134,9 @@ class NightLight:
                 self.go = False
                 print('Off!')
             print((topic.decode(), msg.decode()))
-        self.client = MQTTClient('ME35_chris', self.mqtt_broker , self.port, keepalive=60)
-        self.client.connect()
-        print('Connected to %s MQTT broker' % (self.mqtt_broker))
-        self.client.set_callback(callback)
-        self.client.subscribe(self.topic_sub)
+        # connects when main() runs it, then reconnects on its own if the broker drops us
+        self.mq = MQTTService('TapNightLight', self.mqtt_broker, self.port, wifi=self.wifi)
+        self.mq.on(self.topic_sub, callback)
     
     #RESET PINS
     def reset(self):
@@ -192,11 +148,6 @@ class NightLight:
         self.light2.off()
     
     #ASYNC STUFF
-    async def check_mqtt(self):
-        while True:
-            self.client.check_msg()
-            await asyncio.sleep(0.1)
-            
     async def breathe(self):
         while True:
             if self.go:
@@ -239,12 +190,13 @@ class NightLight:
                 
     async def main(self):
         self.go = False
-        tasks = asyncio.gather(self.check_mqtt(),self.check_btn(),self.breathe(),self.check_tap_status())
+        tasks = asyncio.gather(self.wifi.run(),self.mq.run(),self.check_btn(),self.breathe(),self.accel.run(),self.check_tap_status())
         await tasks # wait for duration
 
         
 # Main code!
 scl = Pin('GPIO5', Pin.OUT)
 sda = Pin('GPIO4', Pin.OUT)
+int_pin = Pin('GPIO6', Pin.IN) # accelerometer INT1
 
-nl = NightLight(scl, sda)
+nl = NightLight(scl, sda, int_pin)
@@ -0,0 +1,59 @@
+# exposure.py - how long each zombie has been in range, with one heap instead of a Timer each
+#
+# start() puts (deadline, zombie, generation) on a min-heap; due() pops everything
+# whose deadline has passed, so checking costs nothing while nobody is close and
+# one heap operation per zombie that is. stop() doesn't search the heap, it bumps
+# the zombie's generation and the stale entry is thrown away when it comes to the top.
+# Nothing runs in an interrupt: the game loop calls due() and handles the hits itself.
+import heapq
+import time
+
+class Exposure:
+    '''
+    example usage:
+        exposure = Exposure(13, period_ms=3000)
+        exposure.start(2)                 # zombie 3 came in range
+        exposure.stop(2)                  # and left again before 3 s
+        for zombie_id in exposure.due():  # every loop, zombies that stayed in range 3 s
+            hit(zombie_id)
+    '''
+    def __init__(self, num_zombies, period_ms=3000):
+        self.period_ms = period_ms
+        self.heap = []
+        self.generation = [0] * num_zombies
+        self.active = [False] * num_zombies  # started and not stopped (stays True after it is due)
+        self.pending = [False] * num_zombies  # on the heap and not due yet
+
+    def start(self, zombie_id, now=None):
+        # returns False if this zombie's exposure is already running
+        if self.active[zombie_id]:
+            return False
+        now = time.ticks_ms() if now is None else now
+        self.active[zombie_id] = True
+        self.pending[zombie_id] = True
+        self.generation[zombie_id] += 1
+        heapq.heappush(self.heap, (time.ticks_add(now, self.period_ms), zombie_id, self.generation[zombie_id]))
+        return True
+
+    def stop(self, zombie_id):
+        # returns True if the exposure was still counting down
+        was_pending = self.pending[zombie_id]
+        self.active[zombie_id] = False
+        self.pending[zombie_id] = False
+        self.generation[zombie_id] += 1
+        return was_pending
+
+    def due(self, now=None):
+        now = time.ticks_ms() if now is None else now
+        hits = []
+        while self.heap:
+            deadline, zombie_id, generation = self.heap[0]
+            if generation != self.generation[zombie_id]:
+                heapq.heappop(self.heap)  # stopped or restarted since
+            elif time.ticks_diff(now, deadline) >= 0:
+                heapq.heappop(self.heap)
+                self.pending[zombie_id] = False
+                hits.append(zombie_id)
+            else:
+                break
+        return hits
@@ -1,14 +1,18 @@
 import time, machine, neopixel
-from Tufts_ble import Sniff, Yell
-from machine import Timer, Pin, PWM
+from Tufts_ble import Yell
+from machine import Pin, PWM
+from zombies import ZombieTracker
+from scanner import RingSniff
+from exposure import Exposure
 
 class Human:
     
     def __init__(self, num_zombies):
         # tells if a zombie is in range or not, starts out of range
-        self.in_range = [False] * num_zombies  # Track range status for each zombie
-        self.timer_running = [False] * num_zombies  # Track timer status for each zombie
-        self.timers = [Timer() for _ in range(num_zombies)]  # Create a separate timer for each zombie
+        self.zombies = ZombieTracker(num_zombies)  # per zombie RSSI average and last seen time
+        self.in_range = self.zombies.in_range  # Track range status for each zombie
+        self.exposure = Exposure(num_zombies, period_ms=3000)  # one heap of 3 second deadlines for every zombie
+        self.timer_running = self.exposure.active  # Track timer status for each zombie
         self.not_zombie = True
         self.num_zombies = num_zombies
         
@@ -18,6 +22,7 @@ class Human:
         #initialize buzzer
         self.buzz = PWM(Pin('GPIO18', Pin.OUT))
         self.buzz.freq(200)
+        self.buzz_until = None # ticks_ms to turn the hit buzz off
         
         #initialize LEDs
         self.led1 = Pin('GPIO5', Pin.OUT)
@@ -39,15 +44,13 @@ class Human:
         #automatically start calling central
         self.central()
         
-    # Define a callback function for the timer
-    def callback(self, timer, zombie_id):
-        m = Yell()
+    # A zombie stayed in range for 3 seconds, called from the game loop (not an interrupt)
+    def hit(self, zombie_id):
         if self.not_zombie:
             print(f"hit by zombie {zombie_id + 1}!")
-            #buzz when hit
+            #buzz when hit, the game loop turns it off after 100 ms
             self.buzz.duty_u16(1000)
-            time.sleep(0.1)
-            self.buzz.duty_u16(0)
+            self.buzz_until = time.ticks_add(time.ticks_ms(), 100)
             #increase counters
             if self.counter[zombie_id] == 2 and not zombie_id == 4: #we are not allowed to become zombie 5
                 print(f"become zombie {zombie_id + 1}")
@@ -62,9 +65,11 @@ class Human:
                     #turn on second LED
                     self.led2.on()
                 print(self.counter[zombie_id])
-            # Stop the timer for this specific zombie
-            # self.timer_running[zombie_id] = False
-            # m.advertise(f"$${zombie_id +1}:{self.counter[zombie_id]}")
+            
+    def buzz_off(self):
+        if self.buzz_until is not None and time.ticks_diff(time.ticks_ms(), self.buzz_until) >= 0:
+            self.buzz.duty_u16(0)
+            self.buzz_until = None
             
     #check if button is pressed to advertise hit array info to computer
     def check_send_array(self):
@@ -83,48 +88,47 @@ class Human:
     def start_timer(self, zombie_id):
         if self.in_range[zombie_id] and not self.timer_running[zombie_id] and self.not_zombie:
             print(f"timer started for zombie {zombie_id + 1}")
-            self.timers[zombie_id].init(period=3000, mode=Timer.ONE_SHOT, callback=lambda t: self.callback(t, zombie_id))  # 3 seconds
-            self.timer_running[zombie_id] = True
+            self.exposure.start(zombie_id)  # due in 3 seconds
             
     # Interrupt the timer when out of range for a specific zombie
     def end_timer(self, zombie_id):
         if not self.in_range[zombie_id] and self.timer_running[zombie_id]:
-            self.timers[zombie_id].deinit()
+            self.exposure.stop(zombie_id)
             print(f"timer stopped for zombie {zombie_id + 1}")
-            self.timer_running[zombie_id] = False
             
     #turn the neopixel green when no zombies in range, and red if any in range
     def scan(self):
-        any_in_range = False
-        for i in range(self.num_zombies):
-            if self.in_range[i]:
-                self.light[0] = self.red
-                self.light.write()
-                any_in_range = True
-        if not any_in_range:
-            self.light[0] = self.green
+        if self.zombies.changed: # only write the neopixel when someone came in or left range
+            self.zombies.changed = False
+            self.light[0] = self.red if self.zombies.near else self.green
             self.light.write()
             
+    # Start or stop the timer for a zombie whose range changed
+    def update_range(self, zombie_id):
+        if self.in_range[zombie_id]:
+            self.start_timer(zombie_id)
+        else:
+            self.end_timer(zombie_id)
+            
+    # One advertisement from the scanner's ring
+    def heard(self, name, rssi, ms):
+        zombie_id = self.zombies.heard(name, rssi, ms)  # None if it isn't a zombie
+        if zombie_id is not None:
+            if self.in_range[zombie_id] and not self.timer_running[zombie_id]:
+                print(f"Zombie {zombie_id + 1} detected, RSSI: {rssi}")
+            self.update_range(zombie_id)
+            
     # Define sniffing for humans
     def central(self):
-        c = Sniff('!', verbose=True)
+        c = RingSniff('!', capacity=64)  # keeps every advertisement between two loops
         c.scan(0)  # Scan indefinitely
         while self.not_zombie:  # Loop checking distances while not a zombie
-            latest = c.last
-            if latest:
-                c.last = ''  # Clear the flag for the next advertisement
-                rssi = c.get_rssi()
-                if rssi > -60:# If within range
-                    # Check if the signal is from any zombie
-                    for zombie_id in range(self.num_zombies):
-                        if latest == f'!{zombie_id + 1}':  # Compare to dynamic zombie IDs
-                            self.in_range[zombie_id] = True
-                            self.start_timer(zombie_id)
-                            print(f"Zombie {zombie_id + 1} detected, RSSI: {rssi}")
-                else:
-                    for zombie_id in range(self.num_zombies):
-                        self.in_range[zombie_id] = False
-                        self.end_timer(zombie_id)
+            c.drain(self.heard)  # everything heard since the last time round
+            for zombie_id in self.zombies.expire():  # zombies we stopped hearing
+                self.end_timer(zombie_id)
+            for zombie_id in self.exposure.due():  # zombies that have been in range for 3 seconds
+                self.hit(zombie_id)
+            self.buzz_off()
             self.scan()
             self.check_send_array()
             time.sleep(0.1)
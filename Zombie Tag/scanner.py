@@ -0,0 +1,58 @@
+# scanner.py - keeps every zombie advertisement instead of just the newest one
+#
+# Tufts_ble.Sniff stores a matching name in .last from its irq handler, so anything
+# that arrives between two polls of the game loop overwrites the one before.
+# RingSniff lets Sniff.irq do the matching, then moves the name, RSSI and arrival
+# time into a fixed size ring and clears .last. The irq handler only ever moves
+# `head` and the game loop only moves `tail`, so neither has to lock out the other;
+# when the ring is full new packets are dropped and counted.
+from array import array
+import time
+from Tufts_ble import Sniff
+
+_IRQ_SCAN_RESULT = 5
+
+class RingSniff(Sniff):
+    '''
+    example usage:
+        c = RingSniff('!', capacity=32)
+        c.scan(0)
+        c.drain(lambda name, rssi, ms: print(name, rssi, ms))   # every packet since the last drain
+        c.received, c.dropped
+    '''
+    def __init__(self, discriminator='!', capacity=32, verbose=False):
+        super().__init__(discriminator, verbose=verbose)
+        self.capacity = capacity
+        self.names = [''] * capacity
+        self.rssis = array('h', [0] * capacity)
+        self.times = array('L', [0] * capacity)
+        self.head = 0  # packets written, only the irq handler changes it
+        self.tail = 0  # packets read, only drain() changes it
+        self.received = 0
+        self.dropped = 0  # arrived while the ring was full
+
+    def irq(self, event, data):
+        super().irq(event, data)
+        if event == _IRQ_SCAN_RESULT and self.last:
+            if self.head - self.tail >= self.capacity:
+                self.dropped += 1
+            else:
+                i = self.head % self.capacity
+                self.names[i] = self.last
+                self.rssis[i] = self.get_rssi()
+                self.times[i] = time.ticks_ms()
+                self.head += 1
+                self.received += 1
+            self.last = ''
+
+    def drain(self, handler, limit=None):
+        # calls handler(name, rssi, ticks_ms) oldest first, returns how many there were
+        end = self.head
+        if limit is not None and end - self.tail > limit:
+            end = self.tail + limit
+        n = end - self.tail
+        while self.tail != end:
+            i = self.tail % self.capacity
+            handler(self.names[i], self.rssis[i], self.times[i])
+            self.tail += 1
+        return n
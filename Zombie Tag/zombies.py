@@ -0,0 +1,75 @@
+# zombies.py - which zombies are close, from their BLE advertisements ('!1', '!2', ...)
+#
+# The zombie number is parsed out of the name once and used as an index, so a packet
+# costs the same however many players there are. Each zombie keeps its own moving
+# average of RSSI and the time it was last heard: it comes in range when its average
+# rises above enter_rssi and leaves when the average drops below exit_rssi or nothing
+# has been heard from it for timeout_ms. After a gap longer than timeout_ms the average
+# starts over from the new packet. One zombie's weak packet only affects itself.
+import time
+
+class ZombieTracker:
+    '''
+    example usage:
+        zombies = ZombieTracker(13)                  # zombies '!1' to '!13'
+        zombie_id = zombies.heard('!3', -55)         # 2, or None if it isn't a zombie
+        zombies.in_range[2]                          # True
+        for zombie_id in zombies.expire(): ...       # zombies that went quiet, now out of range
+        zombies.near                                 # ids in range right now
+    '''
+    def __init__(self, num_zombies, prefix='!', enter_rssi=-60, exit_rssi=-65, alpha=0.3, timeout_ms=1000):
+        self.num_zombies = num_zombies
+        self.prefix = prefix
+        self.enter_rssi = enter_rssi
+        self.exit_rssi = exit_rssi
+        self.alpha = alpha
+        self.timeout_ms = timeout_ms
+        self.rssi = [None] * num_zombies  # moving average per zombie
+        self.last_seen = [0] * num_zombies  # ticks_ms of the last packet
+        self.in_range = [False] * num_zombies
+        self.near = set()
+        self.changed = False  # set when someone came in or left range, for the caller to clear
+
+    def parse(self, name):
+        # '!3' -> 2, None for anything else
+        if not name.startswith(self.prefix):
+            return None
+        try:
+            zombie_id = int(name[len(self.prefix):]) - 1
+        except ValueError:
+            return None
+        return zombie_id if 0 <= zombie_id < self.num_zombies else None
+
+    def heard(self, name, rssi, now=None):
+        zombie_id = self.parse(name)
+        if zombie_id is None:
+            return None
+        now = time.ticks_ms() if now is None else now
+        average = self.rssi[zombie_id]
+        if time.ticks_diff(now, self.last_seen[zombie_id]) > self.timeout_ms:
+            average = None  # not heard for a while, don't average against where it was then
+        self.last_seen[zombie_id] = now
+        average = rssi if average is None else average + self.alpha * (rssi - average)
+        self.rssi[zombie_id] = average
+        if not self.in_range[zombie_id] and average > self.enter_rssi:
+            self.set(zombie_id, True)
+        elif self.in_range[zombie_id] and average < self.exit_rssi:
+            self.set(zombie_id, False)
+        return zombie_id
+
+    def expire(self, now=None):
+        # only zombies in range can time out, so this is cheap when nobody is around
+        now = time.ticks_ms() if now is None else now
+        gone = [z for z in self.near if time.ticks_diff(now, self.last_seen[z]) > self.timeout_ms]
+        for zombie_id in gone:
+            self.rssi[zombie_id] = None  # start over from the next packet
+            self.set(zombie_id, False)
+        return gone
+
+    def set(self, zombie_id, in_range):
+        self.in_range[zombie_id] = in_range
+        if in_range:
+            self.near.add(zombie_id)
+        else:
+            self.near.discard(zombie_id)
+        self.changed = True
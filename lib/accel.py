@@ -0,0 +1,207 @@
+# accel.py - tap detection for the 0x62 accelerometer (drum set and tap night light)
+# Copy the lib folder to /lib on the board.
+#
+# Wire the accelerometer's INT1 pin to a GPIO and pass it as int_pin: the status
+# register is then only read after the interrupt fires. Without an int_pin the
+# driver falls back to polling the status register every poll_ms.
+#
+# Each read is one burst from 0x02 to 0x09 (X, Y, Z, temperature, status), so the
+# tap status and the acceleration that goes with it cost a single I2C transaction.
+import asyncio
+from machine import Pin
+
+# registers
+ACC_X = 0x02  # X, Y, Z are little endian 12 bit values in the top of 16 bits
+INT_STATUS = 0x09
+RANGE = 0x0F
+ODR = 0x10
+POWER = 0x11
+INT_EN = 0x16
+INT_MAP = 0x19
+INT_OUT_CTRL = 0x20
+INT_LATCH = 0x21
+TAP_TIMING = 0x2A
+TAP_THRESHOLD = 0x2B
+
+# status bits (register 0x09)
+SINGLE_TAP = 0x20
+DOUBLE_TAP = 0x10
+
+LATCHED = 0x0F
+RESET_INT = 0x80
+
+SAMPLE_SIZE = INT_STATUS - ACC_X + 1
+
+try:
+    Flag = asyncio.ThreadSafeFlag
+except AttributeError:  # CPython (sim), interrupts run on the event loop thread there
+    class Flag(asyncio.Event):
+        async def wait(self):
+            await super().wait()
+            self.clear()
+
+class TapQueue:
+    '''
+    fixed size queue of (source, status, velocity) tap events, shared by any number of TapAccel
+    when it is full the oldest tap is dropped
+    '''
+    def __init__(self, size=8):
+        self.sources = bytearray(size)
+        self.statuses = bytearray(size)
+        self.velocities = bytearray(size)
+        self.size = size
+        self.head = 0
+        self.count = 0
+        self.dropped = 0
+        self.ready = Flag()
+
+    def put(self, source, status, velocity=127):
+        if self.count == self.size:
+            self.head = (self.head + 1) % self.size
+            self.count -= 1
+            self.dropped += 1
+        i = (self.head + self.count) % self.size
+        self.sources[i] = source
+        self.statuses[i] = status
+        self.velocities[i] = velocity
+        self.count += 1
+        self.ready.set()
+
+    def get_nowait(self):
+        if not self.count:
+            return None
+        i = self.head
+        self.head = (self.head + 1) % self.size
+        self.count -= 1
+        return self.sources[i], self.statuses[i], self.velocities[i]
+
+    async def get(self):
+        while not self.count:
+            await self.ready.wait()
+        return self.get_nowait()
+
+class TapAccel:
+    '''
+    example usage:
+        taps = TapQueue()
+        short = TapAccel(I2C(0, scl=scl, sda=sda), Pin('GPIO6', Pin.IN), taps, source=0)
+        asyncio.create_task(short.run())
+        source, status, velocity = await taps.get()
+
+    velocity is the tap intensity scaled to 1-127: the largest change of an axis from
+    where it rests (gravity included), full_scale is the change that maps to 127
+    (2048 is 2 g in 2 g mode). The axes come from the first read after the interrupt,
+    a little after the peak of the hit, so velocity reads low for very short taps.
+    '''
+    def __init__(self, i2c, int_pin=None, queue=None, source=0, addr=0x62, poll_ms=10, full_scale=2048):
+        self.i2c = i2c
+        self.addr = addr
+        self.int_pin = int_pin
+        self.queue = queue if queue is not None else TapQueue()
+        self.source = source
+        self.poll_ms = poll_ms
+        self.full_scale = full_scale
+        self.buf = bytearray(1)
+        self.sample = bytearray(SAMPLE_SIZE)
+        self.irq_flag = Flag()
+        self.reads = 0
+        self.rest = [0, 0, 0]  # axes with the board sitting still
+        self.init_tap_detection()
+        self.calibrate()
+        if int_pin is not None:
+            int_pin.irq(trigger=Pin.IRQ_RISING, handler=self.irq)
+
+    def write_byte(self, reg, value):
+        self.buf[0] = value
+        self.i2c.writeto_mem(self.addr, reg, self.buf)
+
+    def read_byte(self, reg):
+        self.i2c.readfrom_mem_into(self.addr, reg, self.buf)
+        self.reads += 1
+        return self.buf[0]
+
+    def read_sample(self):
+        # one transaction for X, Y, Z and the tap status, returns the status byte
+        self.i2c.readfrom_mem_into(self.addr, ACC_X, self.sample)
+        self.reads += 1
+        return self.sample[SAMPLE_SIZE - 1]
+
+    def axis(self, i):
+        value = self.sample[2 * i] | (self.sample[2 * i + 1] << 8)
+        if value & 0x8000:
+            value -= 0x10000
+        return value >> 4
+
+    def calibrate(self, samples=8):
+        # average a few samples as the resting baseline, keep the board still while this runs
+        total = [0, 0, 0]
+        for _ in range(samples):
+            self.read_sample()
+            for i in range(3):
+                total[i] += self.axis(i)
+        self.rest = [t // samples for t in total]
+
+    def settle(self):
+        # a sample without a tap nudges the baseline, so a board that gets moved keeps up
+        for i in range(3):
+            self.rest[i] += (self.axis(i) - self.rest[i]) // 16
+
+    def intensity(self):
+        # largest change of an axis from rest in the last sample, cheaper than a vector magnitude
+        rest = self.rest
+        return max(abs(self.axis(0) - rest[0]), abs(self.axis(1) - rest[1]), abs(self.axis(2) - rest[2]))
+
+    def velocity(self):
+        v = self.intensity() * 127 // self.full_scale
+        return 1 if v < 1 else 127 if v > 127 else v
+
+    def init_tap_detection(self):
+        # Enable single (bit 5) and double (bit 4) tap interrupts
+        self.write_byte(INT_EN, SINGLE_TAP | DOUBLE_TAP)
+        # 0x0F-0x11 in one write: 2g mode, ODR 250Hz, normal mode
+        self.i2c.writeto_mem(self.addr, RANGE, bytes((0x00, 0x03, 0x02)))
+        # 0x2A-0x2B in one write: TAP_DUR (bits 0-2), TAP_SHOCK (bit 6), TAP_QUIET (bit 7), then threshold
+        tap_dur = 0x07  # Big value for tap duration
+        tap_shock = 0x01  # Low value for shock
+        tap_quiet = 0x01  # Low value for quiet
+        tap_threshold = 0x03  # Lower threshold for 2g mode
+        self.i2c.writeto_mem(self.addr, TAP_TIMING, bytes(((tap_quiet << 7) | (tap_shock << 6) | tap_dur, tap_threshold)))
+        if self.int_pin is not None:
+            self.write_byte(INT_MAP, SINGLE_TAP | DOUBLE_TAP)  # route both taps to INT1
+            self.write_byte(INT_OUT_CTRL, 0x01)  # INT1 push-pull, active high
+            self.write_byte(INT_LATCH, LATCHED)  # hold INT1 high until we have read the status
+        print("Interrupt config (0x16): {:08b}".format(self.read_byte(INT_EN)))  # Should print 00110000
+
+    def irq(self, pin):
+        self.irq_flag.set()
+
+    def read_taps(self):
+        try:
+            status = self.read_sample() & (SINGLE_TAP | DOUBLE_TAP)
+            if status:
+                self.queue.put(self.source, status, self.velocity())
+            else:
+                self.settle()
+            if self.int_pin is not None:
+                self.write_byte(INT_LATCH, RESET_INT | LATCHED)  # release INT1 for the next tap
+                while self.int_pin.value():  # a tap latched again between the read and the reset
+                    again = self.read_sample() & (SINGLE_TAP | DOUBLE_TAP)
+                    if again:
+                        self.queue.put(self.source, again, self.velocity())
+                        status |= again
+                    self.write_byte(INT_LATCH, RESET_INT | LATCHED)
+        except OSError as e:
+            print("I2C read error:", e)
+            return 0
+        return status
+
+    async def run(self):
+        if self.int_pin is None:
+            while True:
+                self.read_taps()
+                await asyncio.sleep(self.poll_ms / 1000)
+        if self.int_pin.value():  # a tap latched before the irq was attached
+            self.read_taps()
+        while True:
+            await self.irq_flag.wait()
+            self.read_taps()
@@ -0,0 +1,62 @@
+# gesture.py - turns a stream of Teachable Machine predictions into gesture changes
+# Plain Python, used by both teachable.py pages (add it to the pyscript [files]) and
+# by sim/gesture_replay.py.
+#
+# Every class keeps an exponential moving average of its probability. A gesture
+# becomes a candidate when its average reaches `enter`, stays one while it is above
+# `exit`, and is taken once it has been a candidate for dwell_ms. The gesture being
+# held never goes back to "nothing", so a noisy frame can't make the same gesture
+# come out twice; only a different gesture (a neutral class counts) changes it.
+# The defaults are tuned with sim/gesture_replay.py for a model running at 10-15 fps.
+import time
+try:
+    from time import ticks_ms, ticks_diff
+except ImportError:  # CPython, Pyodide
+    def ticks_ms():
+        return int(time.monotonic() * 1000)
+    def ticks_diff(a, b):
+        return a - b
+
+class Gestures:
+    '''
+    example usage:
+        gestures = Gestures(['start', 'stop', 'nothing'], alpha=0.8, enter=0.75, exit=0.5, dwell_ms=50)
+        label = gestures.update([0.9, 0.05, 0.05])   # the new gesture when it changes, otherwise None
+        gestures.state                               # gesture being held, None until the first one
+    '''
+    def __init__(self, labels, alpha=0.8, enter=0.75, exit=0.5, dwell_ms=50):
+        self.labels = list(labels)
+        self.alpha = alpha
+        self.enter = enter
+        self.exit = exit
+        self.dwell_ms = dwell_ms
+        self.average = None
+        self.state = None
+        self.candidate = None
+        self.since = 0  # ticks_ms when the candidate reached enter
+        self.changes = 0
+
+    def update(self, probabilities, now=None):
+        now = ticks_ms() if now is None else now
+        if self.average is None:
+            self.average = [float(p) for p in probabilities]
+        else:
+            a = self.alpha
+            for i, p in enumerate(probabilities):
+                self.average[i] += a * (p - self.average[i])
+        average = self.average
+
+        if self.candidate is not None and average[self.candidate] < self.exit:
+            self.candidate = None
+        if self.candidate is None:
+            best = max(range(len(average)), key=average.__getitem__)
+            if average[best] < self.enter or self.labels[best] == self.state:
+                return None
+            self.candidate = best
+            self.since = now
+        if ticks_diff(now, self.since) < self.dwell_ms:
+            return None
+        self.state = self.labels[self.candidate]
+        self.candidate = None
+        self.changes += 1
+        return self.state
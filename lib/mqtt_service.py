@@ -0,0 +1,196 @@
+# mqtt_service.py - one shared asyncio MQTT connection per board
+# Copy the lib folder to /lib on the board.
+#
+# The client id is the role name plus the board's unique id, so two boards running
+# the same code no longer kick each other off the broker. Lost connections are
+# retried with exponential backoff. Incoming messages go into a bounded queue and
+# are handed to the handlers registered for their topic by a separate task.
+#
+# mqtt.MQTTClient has no async socket, so the reader drains every message that has
+# arrived and then yields for poll_ms (5 ms by default, the old loops slept 100 ms).
+# Given a wifi.WiFi, the service waits for the link instead of failing against it.
+# A refused CONNACK (MQTTException) counts as a failed connection like an OSError,
+# and the old client's socket is closed before every new attempt.
+import asyncio
+import machine
+from mqtt import MQTTClient, MQTTException
+try:
+    from time import ticks_ms, ticks_diff
+except ImportError:  # CPython
+    import time
+    def ticks_ms():
+        return int(time.monotonic() * 1000)
+    def ticks_diff(a, b):
+        return a - b
+
+def client_id(name):
+    return name + '-' + ''.join('{:02x}'.format(b) for b in machine.unique_id())
+
+class MQTTService:
+    '''
+    example usage:
+        mq = MQTTService('drums', wifi=wifi)  # wifi is optional
+        mq.on('ME35-24/boomtss', callback)   # callback(topic, msg), both bytes like MQTTClient
+        asyncio.create_task(mq.run())         # or put mq.run() in your asyncio.gather
+        await mq.ready.wait()                 # set while connected
+        mq.publish('ME35-24/boomtss', 'drums')
+    '''
+    def __init__(self, name, broker='broker.hivemq.com', port=1883, keepalive=60,
+                 queue_size=16, poll_ms=5, backoff_ms=500, max_backoff_ms=30000, wifi=None):
+        self.client_id = client_id(name)
+        self.wifi = wifi
+        self.broker = broker
+        self.port = port
+        self.keepalive = keepalive
+        self.poll_ms = poll_ms
+        self.backoff_ms = backoff_ms
+        self.max_backoff_ms = max_backoff_ms
+        self.client = None
+        self.connected = False
+        self.ready = asyncio.Event()
+        self.handlers = {}  # topic -> [callback, ...]
+        self.default_handler = None
+
+        # inbound queue: (topic, msg, receive time)
+        self.size = queue_size
+        self.topics = [None] * queue_size
+        self.msgs = [None] * queue_size
+        self.received_at = [0] * queue_size
+        self.head = 0
+        self.count = 0
+        self.arrived = asyncio.Event()
+
+        # stats
+        self.received = 0
+        self.dropped = 0
+        self.reconnects = 0
+        self.last_received = 0  # ticks_ms() when the message being handled arrived
+        self.last_latency_ms = 0  # receive to handler
+        self.max_latency_ms = 0
+
+    def on(self, topic, callback):
+        topic = topic.decode() if isinstance(topic, bytes) else topic
+        self.handlers.setdefault(topic, []).append(callback)
+        if self.connected:
+            self.client.subscribe(topic.encode())
+
+    def on_other(self, callback):
+        # messages on topics without a handler of their own
+        self.default_handler = callback
+
+    #CONNECTION
+    async def connect(self):
+        backoff = self.backoff_ms
+        while not self.connected:
+            if self.wifi and not self.wifi.up:
+                await self.wifi.ready.wait()
+            self.close()
+            try:
+                self.client = MQTTClient(self.client_id, self.broker, self.port, keepalive=self.keepalive)
+                self.client.set_callback(self.incoming)
+                self.client.connect()
+                for topic in self.handlers:
+                    self.client.subscribe(topic.encode())
+                self.connected = True
+                self.ready.set()
+                print('Connected to %s MQTT broker as %s' % (self.broker, self.client_id))
+            except (OSError, MQTTException) as e:
+                print('MQTT connect failed (%s), retrying in %d ms' % (e, backoff))
+                await asyncio.sleep(backoff / 1000)
+                backoff = min(backoff * 2, self.max_backoff_ms)
+
+    def lost(self, e):
+        print('MQTT connection lost:', e)
+        self.connected = False
+        self.ready.clear()
+        self.reconnects += 1
+        self.close()
+
+    def close(self):
+        # frees the socket of a dead client, a flapping broker would use up the socket pool
+        if self.client is not None:
+            try:
+                self.client.sock.close()
+            except (OSError, AttributeError):  # already closed, or never opened
+                pass
+            self.client = None
+
+    def publish(self, topic, msg, retain=False):
+        # returns False instead of raising when the connection is down
+        if not self.connected:
+            return False
+        if self.wifi and not self.wifi.up:
+            self.lost('Wi-Fi down')
+            return False
+        try:
+            self.client.publish(topic, msg, retain)
+            return True
+        except (OSError, MQTTException) as e:
+            self.lost(e)
+            return False
+
+    #INBOUND QUEUE
+    def incoming(self, topic, msg):
+        # MQTTClient callback, runs inside check_msg()
+        self.received += 1
+        if self.count == self.size:  # full, drop the oldest
+            self.head = (self.head + 1) % self.size
+            self.count -= 1
+            self.dropped += 1
+        i = (self.head + self.count) % self.size
+        self.topics[i] = topic
+        self.msgs[i] = msg
+        self.received_at[i] = ticks_ms()
+        self.count += 1
+        self.arrived.set()
+
+    async def get(self):
+        while not self.count:
+            self.arrived.clear()
+            await self.arrived.wait()
+        i = self.head
+        topic, msg = self.topics[i], self.msgs[i]
+        self.topics[i] = self.msgs[i] = None
+        self.head = (self.head + 1) % self.size
+        self.count -= 1
+        self.last_received = self.received_at[i]
+        self.last_latency_ms = ticks_diff(ticks_ms(), self.last_received)
+        return topic, msg
+
+    #TASKS
+    async def reader(self):
+        last_ping = ticks_ms()
+        while True:
+            if self.connected and self.wifi and not self.wifi.up:
+                self.lost('Wi-Fi down')
+            if not self.connected:
+                await self.connect()
+                last_ping = ticks_ms()
+            try:
+                while True:  # drain everything that has arrived
+                    before = self.received
+                    self.client.check_msg()
+                    if self.received == before:
+                        break
+                if ticks_diff(ticks_ms(), last_ping) > self.keepalive * 500:
+                    self.client.ping()
+                    last_ping = ticks_ms()
+            except (OSError, MQTTException) as e:
+                self.lost(e)
+                continue
+            await asyncio.sleep(self.poll_ms / 1000)
+
+    async def dispatcher(self):
+        while True:
+            topic, msg = await self.get()
+            if self.last_latency_ms > self.max_latency_ms:
+                self.max_latency_ms = self.last_latency_ms
+            callbacks = self.handlers.get(topic.decode())
+            if callbacks:
+                for callback in callbacks:
+                    callback(topic, msg)
+            elif self.default_handler:
+                self.default_handler(topic, msg)
+
+    async def run(self):
+        await asyncio.gather(self.reader(), self.dispatcher())
@@ -0,0 +1,55 @@
+# pid.py - PID controller with dt-aware updates
+# Copy the lib folder to /lib on the board (or onto the OpenMV camera).
+#
+# The integral term is clamped to +-i_limit and stops growing while the output is
+# saturated (no windup). With i_zone set it only integrates while the error is within
+# +-i_zone, so a long approach doesn't leave it pinned at i_limit once on target.
+# The derivative is taken on the error and low-pass filtered with d_alpha
+# (1.0 = unfiltered, smaller = smoother), it is zero on the first update.
+
+class PID:
+    '''
+    example usage:
+        steer = PID(kp=10, ki=1, kd=0.5, limit=45, i_limit=10, d_alpha=0.3, i_zone=5)
+        angle = steer.update(target - measured, dt)   # dt in seconds
+        steer.reset()                                 # when the target is lost
+    '''
+    def __init__(self, kp, ki=0.0, kd=0.0, limit=None, i_limit=None, d_alpha=1.0, i_zone=None):
+        self.kp = kp
+        self.ki = ki
+        self.kd = kd
+        self.limit = limit  # output is clamped to +-limit
+        self.i_limit = i_limit  # integral term (ki * integral) is clamped to +-i_limit
+        self.d_alpha = d_alpha
+        self.i_zone = i_zone  # only integrate while abs(error) <= i_zone, None for always
+        self.reset()
+
+    def reset(self):
+        self.integral = 0.0
+        self.derivative = 0.0
+        self.last_error = None
+        self.output = 0.0
+
+    def update(self, error, dt):
+        if dt <= 0:
+            return self.output
+        if self.last_error is not None:
+            raw = (error - self.last_error) / dt
+            self.derivative += self.d_alpha * (raw - self.derivative)
+        self.last_error = error
+
+        integral = self.integral
+        if self.i_zone is None or -self.i_zone <= error <= self.i_zone:
+            integral += error * dt
+        if self.ki and self.i_limit is not None:
+            bound = self.i_limit / abs(self.ki)
+            integral = max(-bound, min(bound, integral))
+
+        output = self.kp * error + self.ki * integral + self.kd * self.derivative
+        if self.limit is not None and (output > self.limit or output < -self.limit):
+            output = max(-self.limit, min(self.limit, output))
+            if abs(integral) > abs(self.integral):
+                integral = self.integral  # saturated, don't wind up any further
+        self.integral = integral
+        self.output = output
+        return output
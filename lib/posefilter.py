@@ -0,0 +1,90 @@
+# posefilter.py - alpha-beta filter over an AprilTag pose (x, z, rotation)
+# Copy the lib folder onto the OpenMV camera.
+#
+# Each axis keeps a value and a rate. A new measurement corrects the prediction by
+# alpha (value) and beta (rate); a measurement further than the axis' gate from the
+# prediction is rejected as an outlier, except the max_rejects-th in a row: then the
+# tag really moved and the filter starts over from that measurement (with the default
+# 3, two are rejected and the third restarts the filter). Between measurements
+# predict() extrapolates, for up to max_predict_ms after the last accepted one.
+import math
+import time
+
+class AlphaBeta:
+    def __init__(self, alpha, beta, gate=None, wrap=None):
+        self.alpha = alpha
+        self.beta = beta
+        self.gate = gate
+        self.wrap = wrap  # period for angles, the residual is taken the short way round
+        self.value = 0.0
+        self.rate = 0.0
+
+    def reset(self, value):
+        self.value = value
+        self.rate = 0.0
+
+    def predict(self, dt):
+        return self.value + self.rate * dt
+
+    def residual(self, measured, dt):
+        r = measured - self.predict(dt)
+        if self.wrap:
+            r = (r + self.wrap / 2) % self.wrap - self.wrap / 2
+        return r
+
+    def correct(self, r, dt):
+        self.value = self.predict(dt) + self.alpha * r
+        self.rate += self.beta * r / dt
+
+class PoseFilter:
+    '''
+    example usage:
+        pose = PoseFilter()
+        pose.update(tag.x_translation, -tag.z_translation, tag.z_rotation)   # every frame with a tag
+        state = pose.predict()   # (x, z, rotation) now, or None when the track is too old
+    '''
+    def __init__(self, alpha=0.5, beta=0.1, gates=(2.0, 3.0, 0.5), max_predict_ms=300, max_rejects=3):
+        self.axes = (AlphaBeta(alpha, beta, gates[0]),
+                     AlphaBeta(alpha, beta, gates[1]),
+                     AlphaBeta(alpha, beta, gates[2], wrap=2 * math.pi))
+        self.max_predict_ms = max_predict_ms
+        self.max_rejects = max_rejects
+        self.updated_ms = None  # time of the last accepted measurement
+        self.rejects = 0  # in a row
+        self.rejected = 0  # total
+
+    def age(self, now):
+        return time.ticks_diff(now, self.updated_ms) if self.updated_ms is not None else None
+
+    def update(self, x, z, rotation, now=None):
+        '''returns False if the measurement was rejected as an outlier'''
+        now = time.ticks_ms() if now is None else now
+        age = self.age(now)
+        measured = (x, z, rotation)
+        if age is None or age > self.max_predict_ms:
+            for axis, m in zip(self.axes, measured):
+                axis.reset(m)
+        elif age > 0:
+            dt = age / 1000
+            residuals = [axis.residual(m, dt) for axis, m in zip(self.axes, measured)]
+            if any(axis.gate is not None and abs(r) > axis.gate for axis, r in zip(self.axes, residuals)):
+                self.rejects += 1
+                if self.rejects < self.max_rejects:
+                    self.rejected += 1
+                    return False
+                for axis, m in zip(self.axes, measured): # the max_rejects-th outlier in a row: the tag really moved
+                    axis.reset(m)
+            else:
+                for axis, r in zip(self.axes, residuals):
+                    axis.correct(r, dt)
+        self.rejects = 0
+        self.updated_ms = now
+        return True
+
+    def predict(self, now=None):
+        now = time.ticks_ms() if now is None else now
+        age = self.age(now)
+        if age is None or age > self.max_predict_ms:
+            return None
+        dt = age / 1000
+        return tuple(axis.predict(dt) for axis in self.axes)
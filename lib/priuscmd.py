@@ -0,0 +1,69 @@
+# priuscmd.py - drive commands from the OpenMV camera to the Prius
+# Copy the lib folder to /lib on the board (and onto the camera).
+#
+# A command is a fixed 12 byte message, little endian:
+#   marker 0xA5, command ('f', 'b', 'l', 'r' or 0 for none), distance in hundredths
+#   (int16), tag id (uint16), sequence number (uint16), sender ticks_ms (uint32)
+# The old text form "f, 12.3456" is still understood by decode(), and an Encoder
+# made with text=True sends it, so either side can be updated first.
+#
+# Sequence numbers start at 0 when the camera boots and skip 0 when they wrap, so
+# the car drops duplicates and out of order frames but accepts a restarted camera.
+import struct
+try:
+    from time import ticks_ms
+except ImportError:  # CPython
+    import time
+    def ticks_ms():
+        return int(time.monotonic() * 1000) & 0x3FFFFFFF
+
+MARKER = 0xA5
+FORMAT = '<BBhHHI'
+SIZE = 12  # struct.calcsize(FORMAT)
+COMMANDS = 'fblr'
+MAX_DISTANCE = 327.67
+BUCKET_STEP = 0.5 # the car's speed profile is continuous, so changes this small matter
+
+class Encoder:
+    '''
+    example usage:
+        encoder = Encoder()              # Encoder(text=True) for the old text messages
+        client.publish(topic, encoder.encode('f', tag.z_translation, tag.id))
+    '''
+    def __init__(self, text=False):
+        self.text = text
+        self.seq = 0
+        self.buf = bytearray(SIZE)
+
+    def encode(self, cmd, distance, tag_id=0):
+        if self.text:
+            return cmd + ", " + str(distance)
+        distance = max(-MAX_DISTANCE, min(MAX_DISTANCE, distance))
+        struct.pack_into(FORMAT, self.buf, 0, MARKER, ord(cmd) if cmd else 0,
+                         round(distance * 100), tag_id & 0xFFFF, self.seq, ticks_ms())
+        self.seq = (self.seq + 1) & 0xFFFF or 1
+        return self.buf
+
+def decode(msg):
+    '''
+    returns (cmd, distance, tag_id, seq, sent_ms), cmd is '' for no command.
+    Text messages give tag_id 0 and seq and sent_ms None. Returns None for anything else.
+    '''
+    if len(msg) == SIZE and msg[0] == MARKER:
+        _, cmd, distance, tag_id, seq, sent_ms = struct.unpack(FORMAT, msg)
+        return chr(cmd) if cmd else '', distance / 100, tag_id, seq, sent_ms
+    try:
+        cmd, _, distance = bytes(msg).decode().partition(',')
+        return cmd.strip(), float(distance), 0, None, None
+    except (UnicodeError, ValueError):
+        return None
+
+def bucket(distance, step=BUCKET_STEP):
+    '''distance rounded to step, the camera only resends an unchanged command when this changes'''
+    return int(abs(distance) / step)
+
+def newer(seq, last):
+    '''True if seq comes after last, allowing for wrap around and a restarted sender'''
+    if seq == 0 or last is None:
+        return True
+    return 0 < ((seq - last) & 0xFFFF) < 0x8000
@@ -0,0 +1,109 @@
+# tagtrack.py - AprilTag search that follows the last tag instead of scanning every frame
+# Copy the lib folder onto the OpenMV camera.
+#
+# After a detection the next search only covers a region of interest around the tag,
+# moved by how far the tag moved since the last frame and grown by margin of its
+# size. A miss in the ROI falls back to a full-frame search in the same frame, and
+# every full_every frames the whole frame is searched anyway so new tags are found.
+# The pose is always computed against the full frame (fx, fy, cx, cy), so tags
+# found in the ROI give the same translations as before.
+import time
+
+MIN_ROI = 32  # pixels, small tags still get a useful search area
+
+class TagTracker:
+    '''
+    example usage:
+        tracker = TagTracker(img.width(), img.height())
+        tags = tracker.find(img)     # instead of img.find_apriltags()
+        tracker.log()                # prints fps and ROI/full frame search times once a second
+    '''
+    def __init__(self, width, height, margin=0.5, full_every=15, fx=None, fy=None, cx=None, cy=None,
+                 report_ms=1000):
+        self.width = width
+        self.height = height
+        self.margin = margin
+        self.full_every = full_every
+        # find_apriltags' defaults for the OV7725 with the 2.8 mm lens
+        self.fx = fx if fx is not None else (2.8 / 3.984) * width
+        self.fy = fy if fy is not None else (2.8 / 2.952) * height
+        self.cx = cx if cx is not None else width * 0.5
+        self.cy = cy if cy is not None else height * 0.5
+        self.report_ms = report_ms
+
+        self.roi = None
+        self.last_center = None
+        self.velocity = (0, 0)  # pixels per frame
+        self.since_full = 0
+
+        # stats since the last log()
+        self.frames = 0
+        self.roi_searches = 0
+        self.roi_us = 0
+        self.full_searches = 0
+        self.full_us = 0
+        self.report_at = time.ticks_ms()
+
+    def search(self, img, roi):
+        start = time.ticks_us()
+        if roi:
+            tags = img.find_apriltags(roi=roi, fx=self.fx, fy=self.fy, cx=self.cx, cy=self.cy)
+            self.roi_searches += 1
+            self.roi_us += time.ticks_diff(time.ticks_us(), start)
+        else:
+            tags = img.find_apriltags(fx=self.fx, fy=self.fy, cx=self.cx, cy=self.cy)
+            self.full_searches += 1
+            self.full_us += time.ticks_diff(time.ticks_us(), start)
+            self.since_full = 0
+        return tags
+
+    def find(self, img):
+        self.frames += 1
+        self.since_full += 1
+        tags = []
+        if self.roi and self.since_full < self.full_every:
+            tags = self.search(img, self.roi)
+        if not tags:
+            tags = self.search(img, None)
+        self.track(tags)
+        return tags
+
+    def track(self, tags):
+        if not tags:
+            self.roi = None
+            self.last_center = None
+            self.velocity = (0, 0)
+            return
+        # box around every tag found
+        x0 = min(t.x for t in tags)
+        y0 = min(t.y for t in tags)
+        x1 = max(t.x + t.w for t in tags)
+        y1 = max(t.y + t.h for t in tags)
+        center = ((x0 + x1) // 2, (y0 + y1) // 2)
+        if self.last_center:
+            self.velocity = (center[0] - self.last_center[0], center[1] - self.last_center[1])
+        self.last_center = center
+        vx, vy = self.velocity
+        w = max(MIN_ROI, int((x1 - x0) * (1 + 2 * self.margin)) + 2 * abs(vx))
+        h = max(MIN_ROI, int((y1 - y0) * (1 + 2 * self.margin)) + 2 * abs(vy))
+        x = max(0, center[0] + vx - w // 2)
+        y = max(0, center[1] + vy - h // 2)
+        w = min(w, self.width - x)
+        h = min(h, self.height - y)
+        self.roi = (x, y, w, h) if w > 0 and h > 0 else None
+
+    def report(self):
+        roi_ms = self.roi_us / self.roi_searches / 1000 if self.roi_searches else 0
+        full_ms = self.full_us / self.full_searches / 1000 if self.full_searches else 0
+        return 'roi %d searches %.1f ms, full frame %d searches %.1f ms' % (
+            self.roi_searches, roi_ms, self.full_searches, full_ms)
+
+    def log(self, fps=None):
+        elapsed = time.ticks_diff(time.ticks_ms(), self.report_at)
+        if elapsed < self.report_ms:
+            return
+        if fps is None:
+            fps = self.frames * 1000 / elapsed
+        print('fps %.1f, %s' % (fps, self.report()))
+        self.frames = self.roi_searches = self.roi_us = self.full_searches = self.full_us = 0
+        self.report_at = time.ticks_ms()
@@ -0,0 +1,90 @@
+# wifi.py - Wi-Fi bring-up that never blocks the event loop
+# Copy the lib folder to /lib on the board.
+#
+# connect() polls the link every poll_ms with asyncio.sleep instead of spinning with
+# time.sleep(1), so it returns within poll_ms of getting an IP (or straight away if
+# the link is still up from before a soft reboot) and gives up after timeout_ms.
+# run() keeps retrying with exponential backoff and then watches the link, so the
+# rest of the board keeps running while the network is down. `up` is the cached
+# state, `ready` is an asyncio.Event other tasks can wait on.
+import asyncio
+import network
+try:
+    from time import ticks_ms, ticks_diff
+except ImportError:  # CPython
+    import time
+    def ticks_ms():
+        return int(time.monotonic() * 1000)
+    def ticks_diff(a, b):
+        return a - b
+
+class WiFi:
+    '''
+    example usage:
+        wifi = WiFi(mysecrets['SSID'], mysecrets['key'])
+        asyncio.create_task(wifi.run())   # connects, retries, reconnects if the link drops
+        await wifi.ready.wait()           # only where something really needs the network
+        if wifi.up: ...
+    '''
+    def __init__(self, ssid, key, timeout_ms=15000, poll_ms=50, backoff_ms=1000,
+                 max_backoff_ms=30000, watch_ms=1000):
+        self.ssid = ssid
+        self.key = key
+        self.timeout_ms = timeout_ms
+        self.poll_ms = poll_ms
+        self.backoff_ms = backoff_ms
+        self.max_backoff_ms = max_backoff_ms
+        self.watch_ms = watch_ms
+        self.wlan = network.WLAN(network.STA_IF)
+        self.ready = asyncio.Event()
+        self.up = False
+        self.ip = None
+        self.connect_ms = 0  # how long the last connect took
+        self.drops = 0
+
+    def set_up(self, up):
+        self.up = up
+        if up:
+            self.ip = self.wlan.ifconfig()[0]
+            self.ready.set()
+        else:
+            self.ip = None
+            self.ready.clear()
+
+    async def connect(self):
+        '''one attempt, returns True once there is an IP or False after timeout_ms'''
+        if self.wlan.isconnected():
+            self.set_up(True)
+            return True
+        start = ticks_ms()
+        self.wlan.active(True)
+        self.wlan.connect(self.ssid, self.key)
+        while ticks_diff(ticks_ms(), start) < self.timeout_ms:
+            if self.wlan.isconnected():
+                self.connect_ms = ticks_diff(ticks_ms(), start)
+                self.set_up(True)
+                print('Wi-Fi connected in %d ms: %s' % (self.connect_ms, self.ip))
+                return True
+            if self.wlan.status() < 0:  # wrong password, no AP found, connect failed
+                break
+            await asyncio.sleep(self.poll_ms / 1000)
+        print('Wi-Fi connect failed, status', self.wlan.status())
+        self.wlan.disconnect()
+        return False
+
+    async def run(self):
+        backoff = self.backoff_ms
+        while True:
+            if not self.wlan.isconnected():
+                if self.up:
+                    print('Wi-Fi link lost')
+                    self.drops += 1
+                    self.set_up(False)
+                if not await self.connect():
+                    await asyncio.sleep(backoff / 1000)
+                    backoff = min(backoff * 2, self.max_backoff_ms)
+                    continue
+                backoff = self.backoff_ms
+            elif not self.up:
+                self.set_up(True)
+            await asyncio.sleep(self.watch_ms / 1000)
@@ -0,0 +1,43 @@
+# sim/BLE_CEEO.py - BLE peripheral (MIDI/UART) that records what would be sent
+from sim.clock import clock
+
+class Yell:
+    instances = []
+
+    def __init__(self, name='Pico', interval_us=100000, verbose=True, type='uart'):
+        Yell.instances.append(self)
+        self.name = name
+        self.type = type
+        self.is_connected = False
+        self.sent = []  # (time ms, bytes) for every send()
+        self.writes = 0
+
+    def connect_up(self, timeout=0):
+        self.is_connected = True
+        return True
+
+    def disconnect(self):
+        self.is_connected = False
+
+    def send(self, data):
+        self.writes += 1
+        self.sent.append((clock.ms(), bytes(data)))
+
+class Listen:
+    def __init__(self, name='Pico', verbose=True, type='uart'):
+        self.name = name
+        self.inbox = []
+        self.is_connected = False
+
+    def connect_up(self, timeout=0):
+        self.is_connected = True
+        return True
+
+    def disconnect(self):
+        self.is_connected = False
+
+    def is_any(self):
+        return bool(self.inbox)
+
+    def read(self):
+        return self.inbox.pop(0) if self.inbox else None
@@ -0,0 +1,72 @@
+# sim/Tufts_ble.py - Sniff and Yell on top of sim.air
+#
+# Sniff keeps the real module's single-slot behaviour: irq() stores the latest
+# matching name in .last and its RSSI, older ones are overwritten.
+from sim.air import air
+
+_IRQ_SCAN_RESULT = 5
+_IRQ_SCAN_DONE = 6
+_ADV_TYPE_NAME = 0x09
+
+def encode_name(name):
+    data = name.encode()
+    return bytes((len(data) + 1, _ADV_TYPE_NAME)) + data
+
+def decode_name(adv_data):
+    i = 0
+    while i + 1 < len(adv_data):
+        length = adv_data[i]
+        if length and adv_data[i + 1] == _ADV_TYPE_NAME:
+            return bytes(adv_data[i + 2:i + 1 + length]).decode()
+        i += 1 + length
+    return ''
+
+class Sniff:
+    def __init__(self, discriminator='*', verbose=True):
+        self.discriminator = discriminator
+        self.verbose = verbose
+        self.scanning = False
+        self.names = []
+        self.last = ''
+        self.rssi = 0
+
+    def irq(self, event, data):
+        if event == _IRQ_SCAN_RESULT:
+            addr_type, addr, adv_type, rssi, adv_data = data
+            name = decode_name(adv_data)
+            if name and self.discriminator in name:
+                self.last = name
+                self.rssi = rssi
+        elif event == _IRQ_SCAN_DONE:
+            self.scanning = False
+
+    def receive(self, payload, rssi):
+        self.irq(_IRQ_SCAN_RESULT, (0, b'\x00' * 6, 0, rssi, encode_name(payload)))
+
+    def scan(self, duration=2000):
+        self.scanning = True
+        if self not in air.scanners:
+            air.scanners.append(self)
+
+    def stop_scan(self):
+        self.scanning = False
+        if self in air.scanners:
+            air.scanners.remove(self)
+
+    def get_rssi(self):
+        return self.rssi
+
+class Yell:
+    def __init__(self, rssi=-50):
+        self.rssi = rssi  # what scanners in the sim will see from this board
+        self.owner = None
+
+    def advertise(self, name='Pico', interval_us=100000):
+        if self.owner is not None:
+            air.stop(self.owner)
+        self.owner = air.advertise(name, self.rssi, interval_us / 1000)
+
+    def stop_advertising(self):
+        if self.owner is not None:
+            air.stop(self.owner)
+            self.owner = None
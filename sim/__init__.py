@@ -0,0 +1,62 @@
+# sim - run the ME35 projects on a computer
+#
+#   import sim
+#   sim.install()          # fake board modules, virtual time, lib/ on the path
+#   import accel           # now imports like it would on the board
+#
+# or run a whole project faster than real time:
+#   python -m sim.run "Cool Drum Set/boom_tss.py" --seconds 30
+#
+# Stand-ins: machine (Pin, PWM, ADC, I2C, UART, Timer), network, neopixel, mqtt (in-process
+# broker), BLE_CEEO, Tufts_ble (shared radio space), secrets, framebuf, ssd1306, and a
+# `time` with MicroPython's ticks_* functions. All time is virtual (sim.clock).
+# sim/board_files has stand-ins for project modules that only exist on the boards;
+# it goes at the end of sys.path so a real copy in the project folder wins.
+import asyncio
+import os
+import sys
+
+from sim.clock import clock, StopSimulation, Deadlock
+from sim.broker import broker
+from sim.air import air
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+LIB = os.path.join(ROOT, 'lib')
+BOARD_FILES = os.path.join(ROOT, 'sim', 'board_files')
+
+FAKES = ('machine', 'network', 'neopixel', 'mqtt', 'BLE_CEEO', 'Tufts_ble',
+         'secrets', 'framebuf', 'ssd1306')
+
+def install(virtual_time=True):
+    import importlib
+    for name in FAKES:
+        sys.modules[name] = importlib.import_module('sim.' + name)
+    if virtual_time:
+        from sim import aio, vtime
+        sys.modules['time'] = sys.modules['utime'] = vtime
+        aio.install()
+    if LIB not in sys.path:
+        sys.path.insert(0, LIB)
+    if BOARD_FILES not in sys.path:
+        sys.path.append(BOARD_FILES)
+
+def reset():
+    from sim import machine, network, BLE_CEEO, mqtt
+    BLE_CEEO.Yell.instances.clear()
+    mqtt.Socket.open = 0
+    machine.sim_reset()
+    if 'espnow_bluetooth_relay' in sys.modules:
+        sys.modules['espnow_bluetooth_relay'].sim_reset()
+    network.sim_reset()
+    clock.reset()
+    broker.reset()
+    air.reset()
+
+def run(coro, seconds=None):
+    '''runs a coroutine on the virtual clock, stopping after `seconds` of simulated time'''
+    if seconds is not None:
+        clock.stop_after(seconds)
+    try:
+        return asyncio.run(coro)
+    except StopSimulation:
+        return None
@@ -0,0 +1,44 @@
+# sim/aio.py - asyncio event loop that runs on the virtual clock
+#
+# When every task is waiting, the loop jumps the clock straight to the next timer
+# (or the next scheduled sim event) instead of sleeping.
+import asyncio
+import math
+import selectors
+
+from sim.clock import clock, Deadlock
+
+class VirtualSelector(selectors.DefaultSelector):
+    def select(self, timeout=None):
+        ready = super().select(0)
+        if ready or timeout == 0:
+            return ready
+        next_event = clock.next_due()
+        if timeout is None:
+            if next_event is None:
+                raise Deadlock('every task is waiting and nothing is scheduled')
+            clock.advance_to(next_event)
+            return []
+        target = clock.now_us + math.ceil(timeout * 1e6)  # round up or a sub-microsecond wait never ends
+        if next_event is not None and next_event < target:
+            target = next_event  # a sim event may wake a task before the loop's own timer
+        clock.advance_to(target)
+        return []
+
+class VirtualLoop(asyncio.SelectorEventLoop):
+    def __init__(self):
+        super().__init__(VirtualSelector())
+        self._clock_resolution = 1e-6  # the sim clock counts whole microseconds
+
+    def time(self):
+        return clock.now_us / 1e6
+
+class VirtualPolicy(asyncio.DefaultEventLoopPolicy):
+    def new_event_loop(self):
+        return VirtualLoop()
+
+def install():
+    asyncio.set_event_loop_policy(VirtualPolicy())
+    # MicroPython extras the projects may use
+    if not hasattr(asyncio, 'sleep_ms'):
+        asyncio.sleep_ms = lambda ms: asyncio.sleep(ms / 1000)
@@ -0,0 +1,43 @@
+# sim/air.py - the BLE radio space shared by every fake Yell and Sniff
+#
+# Advertisers repeat their payload every interval_ms; each scanning Sniff receives
+# it with the advertiser's RSSI (a number, or a function of the time in ms).
+from sim.clock import clock
+
+class Air:
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.scanners = []
+        self.advertisers = {}  # id -> [payload, rssi, interval_ms, generation]
+        self.sent = 0
+        self.next_id = 0
+
+    def advertise(self, payload, rssi=-50, interval_ms=100, owner=None):
+        if owner is None:
+            self.next_id += 1
+            owner = ('adv', self.next_id)
+        entry = self.advertisers.get(owner)
+        generation = entry[3] + 1 if entry else 0
+        self.advertisers[owner] = [payload, rssi, interval_ms, generation]
+        self.transmit(owner, generation)
+        return owner
+
+    def stop(self, owner):
+        entry = self.advertisers.pop(owner, None)
+        if entry:
+            entry[3] = -1
+
+    def transmit(self, owner, generation):
+        entry = self.advertisers.get(owner)
+        if entry is None or entry[3] != generation:
+            return
+        payload, rssi, interval_ms, _ = entry
+        level = rssi(clock.ms()) if callable(rssi) else rssi
+        self.sent += 1
+        for scanner in list(self.scanners):
+            scanner.receive(payload, level)
+        clock.call_later(interval_ms / 1000, lambda: self.transmit(owner, generation))
+
+air = Air()
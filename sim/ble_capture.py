@@ -0,0 +1,74 @@
+# sim/ble_capture.py - how many zombie advertisements the human actually sees
+#
+#   python -m sim.ble_capture
+#   python -m sim.ble_capture --zombies 1 5 20 --seconds 60 --poll 100 --capacity 64
+#
+# Every zombie yells '!n' about every 100 ms (each a little off, like real
+# advertising intervals) and the human's game loop looks at the scanner every
+# --poll ms. Compares Tufts_ble.Sniff's single .last slot with scanner.RingSniff.
+# Prints the share of packets that reached the game loop and the share of
+# (zombie, second) pairs with at least one packet, which is what range tracking needs.
+# The simulated radio never loses packets itself, so this only measures what the
+# software drops.
+import argparse
+import os
+import random
+import sys
+
+import sim
+sim.install()
+
+from sim import air, clock, StopSimulation
+from Tufts_ble import Sniff
+
+sys.path.insert(0, os.path.join(sim.ROOT, 'Zombie Tag'))
+from scanner import RingSniff
+
+def trial(zombies, seconds, poll_ms, capacity, ring, seed=1):
+    sim.reset()
+    random.seed(seed)
+    scanner = RingSniff('!', capacity=capacity) if ring else Sniff('!', verbose=False)
+    scanner.scan(0)
+    seen = set()  # (zombie, second)
+    handled = [0]
+
+    def record(name, rssi, ms):
+        handled[0] += 1
+        if ms < seconds * 1000:
+            seen.add((name, ms // 1000))
+
+    def poll():
+        if ring:
+            scanner.drain(record)
+        elif scanner.last:
+            record(scanner.last, scanner.get_rssi(), clock.ms())
+            scanner.last = ''
+        clock.call_later(poll_ms / 1000, poll)
+
+    for z in range(zombies):
+        interval_ms = random.uniform(100, 110)
+        clock.call_later(random.uniform(0, 0.1), lambda z=z, i=interval_ms: air.advertise('!%d' % (z + 1), -50, i))
+    clock.call_later(poll_ms / 1000, poll)
+    clock.stop_after(seconds)
+    try:
+        clock.advance(seconds + 1)
+    except StopSimulation:
+        pass
+    return handled[0] / air.sent if air.sent else 0, len(seen) / (zombies * seconds)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Zombie advertisement detection rate, single slot against ring buffer')
+    parser.add_argument('--zombies', type=int, nargs='+', default=[1, 2, 5, 10, 20, 40])
+    parser.add_argument('--seconds', type=int, default=30)
+    parser.add_argument('--poll', type=int, default=100, help='game loop period in ms')
+    parser.add_argument('--capacity', type=int, default=64, help='RingSniff capacity')
+    args = parser.parse_args(argv)
+    print('%7s  %-24s %-24s' % ('', 'Sniff.last', 'RingSniff(%d)' % args.capacity))
+    print('%7s  %11s %12s %11s %12s' % ('zombies', 'packets', 'zombie-secs', 'packets', 'zombie-secs'))
+    for n in args.zombies:
+        single = trial(n, args.seconds, args.poll, args.capacity, ring=False)
+        ring = trial(n, args.seconds, args.poll, args.capacity, ring=True)
+        print('%7d  %10.1f%% %11.1f%% %10.1f%% %11.1f%%' % (n, 100 * single[0], 100 * single[1], 100 * ring[0], 100 * ring[1]))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,27 @@
+# sim/board_files/espnow_bluetooth_relay.py - stand-in for the relay module that is
+# only on the Woodchip Kitchen board, not in this repo
+#
+# check_bluetooth() hands out the orders a scenario queued with order(), oldest
+# first, and None when there is nothing new, e.g.
+#   import espnow_bluetooth_relay
+#   espnow_bluetooth_relay.order('k1', at_s=2.0)   # a smoothie two seconds in
+from sim.clock import clock
+
+orders = []
+checks = 0
+
+def order(message, at_s=None):
+    if at_s is not None:
+        clock.call_later(at_s - clock.seconds(), lambda: order(message))
+        return
+    orders.append(message)
+
+def check_bluetooth():
+    global checks
+    checks += 1
+    return orders.pop(0) if orders else None
+
+def sim_reset():
+    global checks
+    orders.clear()
+    checks = 0
@@ -0,0 +1,51 @@
+# sim/broker.py - in-process MQTT broker for the simulation
+#
+# Like a real broker, a client connecting with an id that is already in use kicks
+# the older connection off. Every publish is logged with its virtual send time.
+from sim.clock import clock
+
+def topic_matches(pattern, topic):
+    p = pattern.split('/')
+    t = topic.split('/')
+    for i, part in enumerate(p):
+        if part == '#':
+            return True
+        if i >= len(t) or (part != '+' and part != t[i]):
+            return False
+    return len(p) == len(t)
+
+class Broker:
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.sessions = {}  # client id -> client
+        self.log = []  # (time ms, client id, topic, msg)
+        self.kicks = 0
+        self.latency_ms = 0  # delivery delay, like the round trip to broker.hivemq.com
+        self.refuse = False  # answer CONNACK with an error instead of accepting
+
+    def connect(self, client):
+        old = self.sessions.get(client.client_id)
+        if old is not None and old is not client:
+            old.kicked = True
+            self.kicks += 1
+        self.sessions[client.client_id] = client
+
+    def disconnect(self, client):
+        if self.sessions.get(client.client_id) is client:
+            del self.sessions[client.client_id]
+
+    def publish(self, topic, msg, sender='sim'):
+        topic = topic.decode() if isinstance(topic, bytes) else topic
+        msg = bytes(msg) if isinstance(msg, (bytes, bytearray, memoryview)) else str(msg).encode()
+        self.log.append((clock.ms(), sender, topic, msg))
+        due_us = clock.now_us + self.latency_ms * 1000
+        for client in list(self.sessions.values()):
+            if any(topic_matches(pattern, topic) for pattern in client.subscriptions):
+                client.inbox.append((due_us, topic.encode(), msg))
+
+    def count(self, topic=None):
+        return sum(1 for _, _, t, _ in self.log if topic is None or t == topic)
+
+broker = Broker()
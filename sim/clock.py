@@ -0,0 +1,63 @@
+# sim/clock.py - virtual time shared by every fake module
+#
+# Nothing in the simulation waits for real time: time.sleep() and the asyncio loop
+# move the clock forward and fire whatever was scheduled on the way (timers, network
+# events, scripted pin changes), so a 30 second song plays in a fraction of a second.
+import heapq
+
+class StopSimulation(BaseException):
+    # BaseException so the projects' `except Exception` blocks cannot swallow it
+    pass
+
+class Deadlock(StopSimulation):
+    pass
+
+class Clock:
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.now_us = 0
+        self.limit_us = None
+        self.events = []  # heap of (due_us, seq, callback)
+        self.seq = 0
+
+    def ms(self):
+        return self.now_us // 1000
+
+    def seconds(self):
+        return self.now_us / 1e6
+
+    def stop_after(self, seconds):
+        self.limit_us = self.now_us + int(seconds * 1e6)
+
+    def call_at(self, due_us, callback):
+        self.seq += 1
+        heapq.heappush(self.events, (int(due_us), self.seq, callback))
+
+    def call_later(self, seconds, callback):
+        self.call_at(self.now_us + seconds * 1e6, callback)
+
+    def next_due(self):
+        return self.events[0][0] if self.events else None
+
+    def advance_to(self, target_us):
+        # fires scheduled callbacks in order, each one sees the clock at its own due time
+        target_us = int(target_us)
+        while self.events and self.events[0][0] <= target_us:
+            due, _, callback = heapq.heappop(self.events)
+            self.check_limit(due)
+            self.now_us = max(self.now_us, due)
+            callback()
+        self.check_limit(target_us)
+        self.now_us = max(self.now_us, target_us)
+
+    def advance(self, seconds):
+        self.advance_to(self.now_us + seconds * 1e6)
+
+    def check_limit(self, t_us):
+        if self.limit_us is not None and t_us > self.limit_us:
+            self.now_us = self.limit_us
+            raise StopSimulation('simulated %.3f s' % (self.limit_us / 1e6))
+
+clock = Clock()
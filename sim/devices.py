@@ -0,0 +1,63 @@
+# sim/devices.py - fake peripherals that plug into sim.machine
+
+class FakeAccel:
+    '''
+    register file for the 0x62 accelerometer, enough for lib/accel.py
+    the axes rest at `rest` (1 g of gravity on z by default); tap() sets the status
+    bits and the axes the hit reads as, and raises INT1 when the tap interrupt is mapped.
+    Resetting the latched interrupt puts the axes back at rest.
+
+    example usage:
+        dev = FakeAccel(int_pin=Pin('GPIO6'))
+        I2C.attach(0, 0x62, dev)
+        dev.tap(double=True, axes=(0, 0, 2047))
+    '''
+    def __init__(self, int_pin=None, rest=(0, 0, 1024)):
+        self.regs = bytearray(0x40)
+        self.int_pin = int_pin
+        self.rest = rest
+        self.reads = 0
+        self.writes = 0
+        self.set_axes(*rest)
+
+    def read(self, reg, n):
+        self.reads += 1
+        return bytes(self.regs[reg:reg + n])
+
+    def write(self, reg, data):
+        self.writes += 1
+        for i, value in enumerate(data):
+            self.regs[reg + i] = value
+        if reg == 0x21 and data[0] & 0x80:  # reset latched interrupts
+            self.regs[0x21] &= 0x7F
+            self.regs[0x09] = 0
+            self.set_axes(*self.rest)
+            if self.int_pin is not None:
+                self.int_pin.drive(0)
+
+    def set_axes(self, x, y, z):
+        # values in 12 bit counts, stored left justified like the real chip
+        for i, value in enumerate((x, y, z)):
+            raw = (value << 4) & 0xFFFF
+            self.regs[0x02 + 2 * i] = raw & 0xFF
+            self.regs[0x03 + 2 * i] = raw >> 8
+
+    def tap(self, double=False, axes=(0, 0, 2047)):
+        self.set_axes(*axes)
+        self.regs[0x09] |= 0x10 if double else 0x20
+        mapped = self.regs[0x19] & self.regs[0x09]
+        if self.int_pin is not None and mapped:
+            self.int_pin.drive(1)
+
+def standard_board():
+    '''
+    the wiring the projects expect: an accelerometer at 0x62 on I2C 0 (INT1 on GPIO6)
+    and I2C 1 (INT1 on GPIO7), returns them so a scenario can tap them
+    '''
+    from sim.machine import Pin, I2C
+    accels = []
+    for bus, int_pin in ((0, 'GPIO6'), (1, 'GPIO7')):
+        accel = FakeAccel(Pin(int_pin))
+        I2C.attach(bus, 0x62, accel)
+        accels.append(accel)
+    return accels
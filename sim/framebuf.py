@@ -0,0 +1,19 @@
+# sim/framebuf.py - enough of framebuf for the drum display
+MONO_VLSB = 0
+MONO_HLSB = 3
+
+class FrameBuffer:
+    def __init__(self, buffer, width, height, format, stride=None):
+        self.buffer = buffer
+        self.width = width
+        self.height = height
+        self.format = format
+
+    def fill(self, c):
+        pass
+
+    def text(self, s, x, y, c=1):
+        pass
+
+    def blit(self, fbuf, x, y, key=-1, palette=None):
+        pass
@@ -0,0 +1,141 @@
+# sim/gesture_replay.py - replays Teachable Machine prediction traces through gesture.Gestures
+#
+#   python -m sim.gesture_replay                              # a made-up noisy trace
+#   python -m sim.gesture_replay --noise 0.35 --glitch 0.15 --save trace.csv
+#   python -m sim.gesture_replay --trace trace.csv --enter 0.8 --exit 0.6 --dwell 100
+#   python -m sim.gesture_replay --fps 10                     # the page polled every 100 ms
+#
+# A trace is a CSV file: a header `ms,truth,<class>,<class>,...` then one row per
+# inference with the time, the gesture really shown (may be empty) and each class'
+# probability. The same trace goes through the old TM_manager.run loop (read the
+# latest prediction every 500 ms, 0.85 threshold, forget the last message below it)
+# and through Gestures at the model's own rate. Prints messages sent by each, how
+# many of them were repeats (sent again while the gesture was still shown) or wrong,
+# and the delay from showing a gesture to its message.
+import argparse
+import csv
+import os
+import random
+import sys
+
+import sim
+
+sys.path.insert(0, os.path.join(sim.ROOT, 'lib'))
+from gesture import Gestures
+
+LABELS = ['start', 'stop', 'nothing']
+MESSAGES = {'start': 'start, ', 'stop': 'stop, '} # the Prius page
+
+def synthetic(seconds, fps, noise, glitch, seed):
+    # holds each gesture 1.5-5 s, the true class scores about 0.97 with gaussian noise
+    # and now and then a glitch frame where another class jumps up
+    random.seed(seed)
+    rows, t, frame_ms = [], 0, 1000 / fps
+    while t < seconds * 1000:
+        truth = random.choice(LABELS)
+        end = t + random.uniform(1500, 5000)
+        while t < end:
+            scores = [max(0.0, random.gauss(0.97 if label == truth else 0.02, noise)) for label in LABELS]
+            if random.random() < glitch:
+                scores[random.randrange(len(LABELS))] += random.uniform(0.5, 1.5)
+            total = sum(scores) or 1
+            rows.append((int(t), truth, [s / total for s in scores]))
+            t += frame_ms
+    return LABELS, rows
+
+def load(path):
+    with open(path) as f:
+        reader = csv.reader(f)
+        labels = next(reader)[2:]
+        return labels, [(int(r[0]), r[1], [float(p) for p in r[2:]]) for r in reader]
+
+def save(path, labels, rows):
+    with open(path, 'w', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(['ms', 'truth'] + labels)
+        for ms, truth, scores in rows:
+            writer.writerow([ms, truth] + ['%.4f' % p for p in scores])
+
+def legacy(labels, rows, threshold=0.85, poll_ms=500):
+    # TM_manager.run before gesture.py: looks at the latest prediction every poll_ms
+    sent, last_sent, i = [], None, 0
+    for now in range(rows[0][0], rows[-1][0] + 1, poll_ms):
+        while i + 1 < len(rows) and rows[i + 1][0] <= now:
+            i += 1
+        scores = rows[i][2]
+        best = max(range(len(labels)), key=scores.__getitem__)
+        message = MESSAGES.get(labels[best])
+        if scores[best] >= threshold:
+            if message is not None and last_sent != message:
+                sent.append((now, message))
+                last_sent = message
+        else:
+            last_sent = None
+    return sent
+
+def smoothed(labels, rows, **settings):
+    gestures = Gestures(labels, **settings)
+    sent = []
+    for ms, _, scores in rows:
+        message = MESSAGES.get(gestures.update(scores, ms))
+        if message is not None:
+            sent.append((ms, message))
+    return sent
+
+def score(rows, sent):
+    # every time a gesture with a message is shown it should be sent once, while it is shown
+    shown, k = [], 0
+    for ms, truth, _ in rows:
+        if not shown or shown[-1][1] != truth:
+            shown.append((ms, truth))
+    wanted = sum(1 for _, truth in shown if truth in MESSAGES)
+    repeats = wrong = 0
+    delays = []
+    answered = set() # shown segments that already got their message
+    for ms, message in sent:
+        while k + 1 < len(shown) and shown[k + 1][0] <= ms:
+            k += 1
+        if MESSAGES.get(shown[k][1]) != message:
+            wrong += 1
+        elif k in answered:
+            repeats += 1
+        else:
+            answered.add(k)
+            delays.append(ms - shown[k][0])
+    return wanted, repeats, wrong, delays
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Replay prediction traces through the gesture classifier')
+    parser.add_argument('--trace', help='CSV trace, otherwise a synthetic one is made')
+    parser.add_argument('--save', help='write the trace used to this CSV file')
+    parser.add_argument('--seconds', type=float, default=300)
+    parser.add_argument('--fps', type=float, default=15, help='model inferences per second')
+    parser.add_argument('--noise', type=float, default=0.25)
+    parser.add_argument('--glitch', type=float, default=0.1, help='fraction of frames with a wrong class spike')
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--alpha', type=float, default=0.8)
+    parser.add_argument('--enter', type=float, default=0.75)
+    parser.add_argument('--exit', type=float, default=0.5)
+    parser.add_argument('--dwell', type=int, default=50, help='dwell time in ms')
+    args = parser.parse_args(argv)
+
+    if args.trace:
+        labels, rows = load(args.trace)
+    else:
+        labels, rows = synthetic(args.seconds, args.fps, args.noise, args.glitch, args.seed)
+    if args.save:
+        save(args.save, labels, rows)
+
+    print('%d predictions over %.0f s' % (len(rows), rows[-1][0] / 1000 if rows else 0))
+    results = [
+        ('old 500 ms poll, 0.85 threshold', legacy(labels, rows)),
+        ('Gestures', smoothed(labels, rows, alpha=args.alpha, enter=args.enter, exit=args.exit, dwell_ms=args.dwell)),
+    ]
+    for name, sent in results:
+        wanted, repeats, wrong, delays = score(rows, sent)
+        average = sum(delays) / len(delays) if delays else 0
+        print('%-32s sent %4d (wanted %d)  repeats %4d  wrong %3d  delay avg %4.0f max %4d ms' % (
+            name, len(sent), wanted, repeats, wrong, average, max(delays) if delays else 0))
+
+if __name__ == '__main__':
+    main()
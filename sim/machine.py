@@ -0,0 +1,296 @@
+# sim/machine.py - stand-in for MicroPython's machine module on the computer
+#
+# Pins are shared by id, so Pin('GPIO6') in the project and Pin('GPIO6') in a test
+# script are the same wire. Drive inputs with Pin.drive(); edges fire the irq handler.
+# PWM channels record every duty change with its virtual time, ADC readings come
+# from ADC.values (a number or a function of the time in ms), timers run on the sim clock.
+# UARTs read what UART.feed() queued and record what the project writes.
+from sim.clock import clock
+
+class Pin:
+    IN = 0
+    OUT = 1
+    OPEN_DRAIN = 2
+    PULL_UP = 1
+    PULL_DOWN = 2
+    IRQ_FALLING = 4
+    IRQ_RISING = 8
+
+    levels = {}  # pin id -> level
+    handlers = {}  # pin id -> (trigger, handler)
+
+    def __init__(self, id, mode=-1, pull=-1, value=None):
+        self.id = id
+        self.mode = mode
+        if id not in Pin.levels:
+            Pin.levels[id] = 1 if pull == Pin.PULL_UP else 0
+        if value is not None:
+            Pin.levels[id] = 1 if value else 0
+
+    def value(self, v=None):
+        if v is None:
+            return Pin.levels[self.id]
+        self.drive(v)
+
+    def on(self):
+        self.drive(1)
+
+    def off(self):
+        self.drive(0)
+
+    def __call__(self, v=None):
+        return self.value(v)
+
+    def irq(self, handler=None, trigger=IRQ_FALLING | IRQ_RISING, hard=False):
+        Pin.handlers[self.id] = (trigger, handler)
+
+    def drive(self, v):
+        old = Pin.levels[self.id]
+        new = Pin.levels[self.id] = 1 if v else 0
+        trigger, handler = Pin.handlers.get(self.id, (0, None))
+        if handler is None or old == new:
+            return
+        if (new and trigger & Pin.IRQ_RISING) or (not new and trigger & Pin.IRQ_FALLING):
+            handler(self)
+
+    @classmethod
+    def reset(cls):
+        cls.levels.clear()
+        cls.handlers.clear()
+
+class I2C:
+    '''
+    attach fake devices with I2C.attach(bus_id, addr, device), a device has
+    read(reg, n) -> bytes and write(reg, data)
+    '''
+    devices = {}  # (bus id, addr) -> device
+    transactions = {}  # bus id -> count
+
+    def __init__(self, id=0, scl=None, sda=None, freq=400000):
+        self.id = id
+        self.freq = freq
+        I2C.transactions.setdefault(id, 0)
+
+    @classmethod
+    def attach(cls, bus_id, addr, device):
+        cls.devices[(bus_id, addr)] = device
+
+    def device(self, addr):
+        I2C.transactions[self.id] += 1
+        try:
+            return I2C.devices[(self.id, addr)]
+        except KeyError:
+            raise OSError(19)  # ENODEV, same as the board when nothing answers
+
+    def scan(self):
+        return [addr for bus, addr in I2C.devices if bus == self.id]
+
+    def readfrom_mem(self, addr, reg, n):
+        return bytes(self.device(addr).read(reg, n))
+
+    def readfrom_mem_into(self, addr, reg, buf):
+        buf[:] = self.device(addr).read(reg, len(buf))
+
+    def writeto_mem(self, addr, reg, buf):
+        self.device(addr).write(reg, bytes(buf))
+
+    @classmethod
+    def reset(cls):
+        cls.devices.clear()
+        cls.transactions.clear()
+
+class SoftI2C(I2C):
+    def __init__(self, scl=None, sda=None, freq=400000):
+        super().__init__(-1, scl, sda, freq)
+
+def pin_id(pin):
+    return pin.id if isinstance(pin, Pin) else pin
+
+class PWM:
+    channels = {}  # pin id -> most recent PWM on that pin
+
+    def __init__(self, pin, freq=None, duty_u16=None):
+        self.pin = pin_id(pin)
+        self.frequency = 0
+        self.duty = 0
+        self.history = []  # (time ms, duty_u16) for every change
+        self.writes = 0
+        PWM.channels[self.pin] = self
+        if freq is not None:
+            self.freq(freq)
+        if duty_u16 is not None:
+            self.duty_u16(duty_u16)
+
+    def freq(self, value=None):
+        if value is None:
+            return self.frequency
+        self.frequency = value
+
+    def duty_u16(self, value=None):
+        if value is None:
+            return self.duty
+        value = int(value)
+        if not 0 <= value <= 65535:
+            raise ValueError('duty must be 0-65535')
+        self.writes += 1
+        if value != self.duty:
+            self.history.append((clock.ms(), value))
+        self.duty = value
+
+    def duty_ns(self, value=None):
+        period_ns = 1e9 / self.frequency if self.frequency else 0
+        if value is None:
+            return int(self.duty * period_ns / 65535)
+        self.duty_u16(value * 65535 / period_ns if period_ns else 0)
+
+    def deinit(self):
+        self.duty_u16(0)
+
+    @classmethod
+    def reset(cls):
+        cls.channels.clear()
+
+class ADC:
+    ATTN_0DB = 0
+    ATTN_11DB = 3
+    WIDTH_12BIT = 3
+    values = {}  # pin id -> 0-65535 reading, or function(time ms) -> reading
+
+    def __init__(self, pin, atten=None):
+        self.pin = pin_id(pin)
+        self.reads = 0
+
+    def atten(self, value):
+        pass
+
+    def width(self, value):
+        pass
+
+    def read_u16(self):
+        self.reads += 1
+        value = ADC.values.get(self.pin, 0)
+        return int(value(clock.ms()) if callable(value) else value)
+
+    def read(self):
+        return self.read_u16() >> 4  # ESP32 style 12 bit reading
+
+    @classmethod
+    def reset(cls):
+        cls.values.clear()
+
+class UART:
+    '''
+    script the other end with UART.feed(id, data, at_s=None); everything the
+    project writes is kept in .written as (time ms, bytes)
+
+    example usage:
+        UART.feed(1, b'k0\\n', at_s=2.0)   # arrives on UART 1 two simulated seconds in
+        UART.ports[1].written
+    '''
+    ports = {}  # id -> most recent UART with that id
+    incoming = {}  # id -> bytearray not read yet
+
+    def __init__(self, id, baudrate=9600, **kwargs):
+        self.id = id
+        self.baudrate = baudrate
+        self.written = []
+        self.writes = 0
+        UART.ports[id] = self
+        UART.incoming.setdefault(id, bytearray())
+
+    def init(self, baudrate=9600, **kwargs):
+        self.baudrate = baudrate
+
+    @classmethod
+    def feed(cls, id, data, at_s=None):
+        if at_s is not None:
+            clock.call_later(at_s - clock.seconds(), lambda: cls.feed(id, data))
+            return
+        cls.incoming.setdefault(id, bytearray()).extend(data)
+
+    def any(self):
+        return len(UART.incoming[self.id])
+
+    def read(self, n=None):
+        buf = UART.incoming[self.id]
+        if not buf:
+            return None  # same as the board when nothing arrived before the timeout
+        n = len(buf) if n is None else min(n, len(buf))
+        data = bytes(buf[:n])
+        del buf[:n]
+        return data
+
+    def readline(self):
+        buf = UART.incoming[self.id]
+        end = buf.find(b'\n')
+        return self.read(end + 1 if end >= 0 else None)
+
+    def write(self, data):
+        data = data.encode() if isinstance(data, str) else bytes(data)
+        self.writes += 1
+        self.written.append((clock.ms(), data))
+        return len(data)
+
+    def deinit(self):
+        pass
+
+    @classmethod
+    def reset(cls):
+        cls.ports.clear()
+        cls.incoming.clear()
+
+class Timer:
+    ONE_SHOT = 0
+    PERIODIC = 1
+    created = 0
+
+    def __init__(self, id=-1, **kwargs):
+        Timer.created += 1
+        self.generation = 0
+        if kwargs:
+            self.init(**kwargs)
+
+    def init(self, mode=PERIODIC, period=-1, freq=-1, callback=None):
+        self.generation += 1
+        period_s = 1 / freq if freq > 0 else period / 1000
+        generation = self.generation
+
+        def fire():
+            if generation != self.generation:
+                return  # deinit or init was called again
+            if mode == Timer.PERIODIC:
+                clock.call_later(period_s, fire)
+            if callback:
+                callback(self)
+        clock.call_later(period_s, fire)
+
+    def deinit(self):
+        self.generation += 1
+
+    @classmethod
+    def reset(cls):
+        cls.created = 0
+
+def unique_id():
+    return b'\xe6\x61\x41\x04\x03\x4a\x2b\x2c'
+
+def freq(value=None):
+    return 125000000
+
+def idle():
+    pass
+
+def disable_irq():
+    return 0
+
+def enable_irq(state=0):
+    pass
+
+def sim_reset():
+    # clears the fake hardware between runs (not machine.reset(), which reboots a board)
+    Pin.reset()
+    I2C.reset()
+    PWM.reset()
+    ADC.reset()
+    UART.reset()
+    Timer.reset()
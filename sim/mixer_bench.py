@@ -0,0 +1,130 @@
+# sim/mixer_bench.py - tankdrive.Motors lookup table mixer against the original float mixer
+#
+#   python -m sim.mixer_bench [--calls 200000]
+#
+# Both get the same throttle/angle stream: runs of repeated commands (a car holding
+# its course between camera frames) mixed with fresh random ones. Prints calls per
+# second on this computer and PWM writes per call; the ratio is what carries over
+# to the board, the absolute numbers do not.
+import argparse
+import os
+import random
+import sys
+import time as real_time
+
+import sim
+sim.install()
+
+from machine import Pin, PWM
+
+sys.path.insert(0, os.path.join(sim.ROOT, 'Mini Toyota Prius', 'Proportional Controller'))
+import tankdrive
+
+class LegacyMotors:
+    # tankdrive.Motors before the lookup table mixer, kept for comparison
+    def __init__(self, lf, lb, rf, rb):
+        self.pwm_LF = PWM(lf)
+        self.pwm_LF.freq(20000)
+        self.pwm_LF.duty_u16(0)
+        self.pwm_LB = PWM(lb)
+        self.pwm_LB.freq(20000)
+        self.pwm_LB.duty_u16(0)
+        self.pwm_RF = PWM(rf)
+        self.pwm_RF.freq(20000)
+        self.pwm_RF.duty_u16(0)
+        self.pwm_RB = PWM(rb)
+        self.pwm_RB.freq(20000)
+        self.pwm_RB.duty_u16(0)
+
+    def drive(self, left, right):
+        assert isinstance(left, float) or isinstance(left, int)
+        assert isinstance(right, float) or isinstance(right, int)
+        if left < -1:
+            left = -1
+        if left > 1:
+            left = 1
+        if right < -1:
+            right = -1
+        if right > 1:
+            right = 1
+        if left == 0:
+            self.pwm_LF.duty_u16(0)
+            self.pwm_LB.duty_u16(0)
+        elif left > 0:
+            self.pwm_LF.duty_u16(int(65535/2 * left))
+            self.pwm_LB.duty_u16(0)
+        elif left < 0:
+            self.pwm_LF.duty_u16(0)
+            self.pwm_LB.duty_u16(int(-65535/2 * left))
+        if right == 0:
+            self.pwm_RF.duty_u16(0)
+            self.pwm_RB.duty_u16(0)
+        elif right > 0:
+            self.pwm_RF.duty_u16(int(65535/2 * right))
+            self.pwm_RB.duty_u16(0)
+        elif right < 0:
+            self.pwm_RF.duty_u16(0)
+            self.pwm_RB.duty_u16(int(-65535/2 * right))
+
+    def interpret_throttle_angle(self, throttle, angle):
+        angle = angle % 360
+        if angle == 0:
+            return throttle, throttle
+        if 0< angle < 180:
+            return throttle*(1-angle/45), throttle
+        if 180 < angle:
+            return throttle, throttle*((angle-315)/45)
+        raise AssertionError
+
+def commands(n, hold=8, seed=1):
+    random.seed(seed)
+    out = []
+    while len(out) < n:
+        throttle = round(random.uniform(-1, 1), 2)
+        angle = random.choice((0, random.randint(-45, 45)))
+        if angle % 360 == 180:
+            angle = 0
+        out.extend([(throttle, angle)] * random.randint(1, hold))
+    return out[:n]
+
+def pins(base):
+    return [Pin('%s%d' % (base, i), Pin.OUT) for i in range(4)]
+
+def writes():
+    return sum(pwm.writes for pwm in PWM.channels.values())
+
+def bench(name, call, stream):
+    before = writes()
+    start = real_time.perf_counter()
+    for throttle, angle in stream:
+        call(throttle, angle)
+    elapsed = real_time.perf_counter() - start
+    return name, len(stream) / elapsed, (writes() - before) / len(stream)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark the tankdrive mixer')
+    parser.add_argument('--calls', type=int, default=200000)
+    args = parser.parse_args(argv)
+    stream = commands(args.calls)
+
+    legacy = LegacyMotors(*pins('A'))
+    motors = tankdrive.Motors(*pins('B'))
+    # same duties for the same inputs (the table rounds the angle to a whole degree)
+    for throttle, angle in stream[:2000]:
+        legacy.drive(*legacy.interpret_throttle_angle(throttle, angle))
+        motors.throttle_angle(throttle, angle)
+        for a, b in zip(('A0', 'A1', 'A2', 'A3'), ('B0', 'B1', 'B2', 'B3')):
+            assert abs(PWM.channels[a].duty - PWM.channels[b].duty) <= 40, (throttle, angle, a)
+
+    results = [
+        bench('original drive(interpret_throttle_angle())',
+              lambda t, a: legacy.drive(*legacy.interpret_throttle_angle(t, a)), stream),
+        bench('lookup table throttle_angle()', motors.throttle_angle, stream),
+    ]
+    for name, rate, per_call in results:
+        print('%-44s %9.0f calls/s  %.2f pwm writes/call' % (name, rate, per_call))
+    print('speedup %.2fx, %.0f%% fewer pwm writes' % (
+        results[1][1] / results[0][1], 100 * (1 - results[1][2] / results[0][2])))
+
+if __name__ == '__main__':
+    main()
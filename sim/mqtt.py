@@ -0,0 +1,92 @@
+# sim/mqtt.py - MQTTClient with the same interface as the boards' mqtt.py, talking to sim.broker
+import errno
+
+from sim.broker import broker
+from sim.clock import clock
+
+class MQTTException(Exception):
+    pass
+
+class Socket:
+    # counts open sockets, so a test can see a client that never closes its old ones
+    open = 0
+
+    def __init__(self):
+        Socket.open += 1
+        self.closed = False
+
+    def close(self):
+        if not self.closed:
+            self.closed = True
+            Socket.open -= 1
+
+class MQTTClient:
+    def __init__(self, client_id, server, port=0, user=None, password=None, keepalive=0,
+                 ssl=False, ssl_params={}):
+        self.client_id = client_id.decode() if isinstance(client_id, bytes) else client_id
+        self.server = server
+        self.port = port
+        self.keepalive = keepalive
+        self.cb = None
+        self.subscriptions = []
+        self.inbox = []  # (due time us, topic, msg), filled by the broker
+        self.connected = False
+        self.kicked = False
+        self.received = 0
+        self.sock = None  # made by connect(), like umqtt.simple
+
+    def set_callback(self, f):
+        self.cb = f
+
+    def check_alive(self):
+        if self.kicked or not self.connected:
+            self.connected = False
+            raise OSError(errno.ECONNRESET, 'connection reset')
+
+    def connect(self, clean_session=True):
+        self.sock = Socket()  # umqtt opens the socket before it knows the broker is there
+        if self.server is None:
+            raise OSError(errno.EHOSTUNREACH, 'no server')
+        if broker.refuse:
+            raise MQTTException(5)  # CONNACK: not authorised
+        self.kicked = False
+        self.connected = True
+        if clean_session:
+            self.subscriptions = []
+            self.inbox = []
+        broker.connect(self)
+        return 0
+
+    def disconnect(self):
+        self.connected = False
+        broker.disconnect(self)
+        if self.sock is not None:
+            self.sock.close()
+
+    def ping(self):
+        self.check_alive()
+
+    def publish(self, topic, msg, retain=False, qos=0):
+        self.check_alive()
+        broker.publish(topic, msg, self.client_id)
+
+    def subscribe(self, topic, qos=0):
+        self.check_alive()
+        topic = topic.decode() if isinstance(topic, bytes) else topic
+        if self.cb is None:
+            raise MQTTException('subscribe before set_callback')
+        self.subscriptions.append(topic)
+
+    def check_msg(self):
+        # delivers at most one message that has arrived, like umqtt.simple
+        self.check_alive()
+        if self.inbox and self.inbox[0][0] <= clock.now_us:
+            _, topic, msg = self.inbox.pop(0)
+            self.received += 1
+            self.cb(topic, msg)
+            return 1
+        return None
+
+    def wait_msg(self):
+        while self.check_msg() is None:
+            clock.advance_to(self.inbox[0][0] if self.inbox else clock.now_us + 1000)
@@ -0,0 +1,67 @@
+# sim/mqtt_demo.py - exercises lib/mqtt_service.py against the in-process broker
+#   python -m sim.mqtt_demo
+import asyncio
+
+import sim
+sim.install()
+
+from sim import broker, clock
+from sim.mqtt import Socket
+import mqtt_service
+
+async def main():
+    got = []  # (time ms, service, msg)
+    def handler(name):
+        return lambda topic, msg: got.append((clock.ms(), name, msg))
+
+    # the two night lights used to share the id ME35_chris and kicked each other off
+    lamp = mqtt_service.MQTTService('NightLight')
+    tap = mqtt_service.MQTTService('TapNightLight', queue_size=4)
+    lamp.on('ME35-24/sim/sub', handler('lamp'))
+    tap.on('ME35-24/sim/sub', handler('tap'))
+    tasks = [asyncio.create_task(lamp.run()), asyncio.create_task(tap.run())]
+    await asyncio.sleep(0.1)
+    assert lamp.connected and tap.connected and broker.kicks == 0, 'clients kicked each other'
+
+    # handled within one poll instead of up to 100 ms later
+    sent = clock.ms()
+    broker.publish('ME35-24/sim/sub', 'Go')
+    await asyncio.sleep(0.05)
+    worst = max(t - sent for t, _, _ in got)
+    assert len(got) == 2 and worst <= lamp.poll_ms, (got, worst)
+
+    # the broker drops the lamp, then refuses connections for a while
+    lamp.broker = None
+    lamp.client.kicked = True
+    await asyncio.sleep(3)
+    assert not lamp.connected and lamp.reconnects == 1
+    lamp.broker = 'broker.hivemq.com'
+    await asyncio.sleep(5)  # backoff is 0.5, 1, 2, 4 s
+    assert lamp.connected, 'did not reconnect'
+    broker.publish('ME35-24/sim/sub', 'Stop')
+    await asyncio.sleep(0.05)
+    assert got[-1][2] == b'Stop' and tap.reconnects == 0
+    assert Socket.open == 2, 'sockets of failed attempts left open: %d' % (Socket.open - 2)
+
+    # a refused CONNACK is retried like any other failure instead of ending the service
+    broker.refuse = True
+    lamp.client.kicked = True
+    await asyncio.sleep(2)
+    assert not lamp.connected and not tasks[0].done(), 'MQTTException ended the service'
+    broker.refuse = False
+    await asyncio.sleep(5)
+    assert lamp.connected and lamp.reconnects == 2 and Socket.open == 2
+
+    # a burst bigger than the queue keeps the newest messages
+    for i in range(10):
+        broker.publish('ME35-24/sim/sub', str(i))
+    await asyncio.sleep(0.05)
+    burst = [msg for _, name, msg in got if name == 'tap'][-4:]
+    assert tap.dropped == 6 and burst == [b'6', b'7', b'8', b'9'], (tap.dropped, burst)
+
+    for task in tasks:
+        task.cancel()
+    print('worst latency %d ms, reconnects %d, dropped %d' % (worst, lamp.reconnects, tap.dropped))
+
+if __name__ == '__main__':
+    asyncio.run(main())
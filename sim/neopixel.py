@@ -0,0 +1,24 @@
+# sim/neopixel.py - NeoPixel strip that remembers what was written
+from sim.clock import clock
+
+class NeoPixel:
+    def __init__(self, pin, n, bpp=3, timing=1):
+        self.pin = pin
+        self.n = n
+        self.pixels = [(0,) * bpp] * n
+        self.history = []  # (time ms, tuple of pixels) for every write()
+
+    def __setitem__(self, i, color):
+        self.pixels[i] = tuple(color)
+
+    def __getitem__(self, i):
+        return self.pixels[i]
+
+    def __len__(self):
+        return self.n
+
+    def fill(self, color):
+        self.pixels = [tuple(color)] * self.n
+
+    def write(self):
+        self.history.append((clock.ms(), tuple(self.pixels)))
@@ -0,0 +1,84 @@
+# sim/network.py - Wi-Fi that connects after CONNECT_MS of virtual time
+#
+# Scripts can make the link flaky: network.fail_connects = 2 makes the next two
+# connect() calls never finish, WLAN.drop_all() drops every connected interface.
+from sim.clock import clock
+
+STA_IF = 0
+AP_IF = 1
+STAT_IDLE = 0
+STAT_CONNECTING = 1
+STAT_WRONG_PASSWORD = -3
+STAT_NO_AP_FOUND = -2
+STAT_CONNECT_FAIL = -1
+STAT_GOT_IP = 3
+
+CONNECT_MS = 1500
+fail_connects = 0
+
+class WLAN:
+    interfaces = {}
+
+    def __new__(cls, interface_id=STA_IF):
+        # like the board, every WLAN(STA_IF) is the same interface
+        if interface_id not in cls.interfaces:
+            wlan = super().__new__(cls)
+            wlan.interface_id = interface_id
+            wlan.is_active = False
+            wlan.state = STAT_IDLE
+            wlan.attempt = 0
+            wlan.connects = 0
+            cls.interfaces[interface_id] = wlan
+        return cls.interfaces[interface_id]
+
+    def active(self, value=None):
+        if value is None:
+            return self.is_active
+        self.is_active = bool(value)
+
+    def connect(self, ssid=None, key=None, **kwargs):
+        global fail_connects
+        self.attempt += 1
+        self.connects += 1
+        self.state = STAT_CONNECTING
+        if fail_connects > 0:
+            fail_connects -= 1
+            return
+        attempt = self.attempt
+        def done():
+            if self.attempt == attempt and self.state == STAT_CONNECTING:
+                self.state = STAT_GOT_IP
+        clock.call_later(CONNECT_MS / 1000, done)
+
+    def disconnect(self):
+        self.attempt += 1
+        self.state = STAT_IDLE
+
+    def status(self, param=None):
+        if param == 'rssi':
+            return -55
+        return self.state
+
+    def isconnected(self):
+        return self.state == STAT_GOT_IP
+
+    def ifconfig(self, config=None):
+        if self.state == STAT_GOT_IP:
+            return ('10.0.0.%d' % (42 + self.interface_id), '255.255.255.0', '10.0.0.1', '10.0.0.1')
+        return ('0.0.0.0', '0.0.0.0', '0.0.0.0', '0.0.0.0')
+
+    def config(self, *args, **kwargs):
+        if args == ('mac',):
+            return b'\x28\xcd\xc1\x00\x00\x01'
+        return None
+
+    @classmethod
+    def drop_all(cls):
+        for wlan in cls.interfaces.values():
+            wlan.attempt += 1
+            wlan.state = STAT_CONNECT_FAIL
+
+def sim_reset():
+    global fail_connects
+    WLAN.interfaces.clear()
+    fail_connects = 0
@@ -0,0 +1,123 @@
+# sim/pid_step.py - step response of the tag follower (p_control.py) on a simulated car
+#
+#   python -m sim.pid_step
+#   python -m sim.pid_step --config "Mini Toyota Prius/Proportional Controller/p_control.json" --noise 0.3 --drop 0.2
+#
+# The car starts start_dist away from a tag that is lateral units off to the side.
+# Every camera frame (fps) the follower sees the tag pose the car would measure,
+# with gaussian noise, randomly dropped frames and occasional wild outliers (a
+# misread tag); the motors' PWM duties move the car (differential drive). Prints rise time, overshoot and settling time for the
+# distance and the lateral offset, --trace prints every control step.
+import argparse
+import math
+import os
+import random
+import sys
+
+import sim
+sim.install()
+
+from machine import Pin, PWM
+from sim import clock
+
+CONTROLLER = os.path.join(sim.ROOT, 'Mini Toyota Prius', 'Proportional Controller')
+sys.path.insert(0, CONTROLLER)
+import follower
+import tankdrive
+
+FULL_DUTY = 65535 / 2  # tankdrive.Motors drives at most half duty
+V_MAX = 8.0  # translation units per second at full throttle
+TURN_RATE = 1.5  # rad/s for a full speed difference between the sides
+STEP_S = 0.005
+
+class Tag:
+    def __init__(self, x, z, rotation):
+        self.x_translation = x
+        self.z_translation = -z
+        self.z_rotation = rotation % (2 * math.pi)
+
+def side(forward, backward):
+    return (PWM.channels[forward].duty - PWM.channels[backward].duty) / FULL_DUTY
+
+def settle_time(samples, target, band):
+    # time after which the value stays within band of the target
+    for i in range(len(samples) - 1, -1, -1):
+        if abs(samples[i][1] - target) > band:
+            return samples[i + 1][0] if i + 1 < len(samples) else None
+    return samples[0][0]
+
+def run(config, seconds=8.0, start_dist=20.0, lateral=2.0, fps=25, noise=0.1, drop=0.0,
+        outliers=0.0, seed=1, trace=False):
+    sim.reset()
+    random.seed(seed)
+    motors = tankdrive.Motors(Pin('P4', Pin.OUT), Pin('P5', Pin.OUT), Pin('P8', Pin.OUT), Pin('P7', Pin.OUT))
+    follow = follower.Follower(motors, config)
+    dist, y, heading = start_dist, 0.0, 0.0
+    frame_s = 1.0 / fps
+    next_frame = 0.0
+    steps = follow.steps
+    dists, offsets = [], []
+    t = 0.0
+    while t < seconds:
+        # camera
+        if t >= next_frame:
+            next_frame += frame_s
+            dx, dz = lateral - y, dist
+            x_cam = dx * math.cos(heading) - dz * math.sin(heading)
+            z_cam = dz * math.cos(heading) + dx * math.sin(heading)
+            seen = random.random() >= drop
+            wild = 5.0 * random.choice((-1, 1)) if random.random() < outliers else 0.0
+            follow.see(Tag(x_cam + random.gauss(0, noise) + wild, z_cam + random.gauss(0, noise),
+                           math.pi - heading) if seen else None)
+            offsets.append((t, x_cam))
+        follow.run_due()
+        if trace and follow.steps != steps:
+            steps = follow.steps
+            print('%6.3f dist %6.2f offset %6.2f throttle %5.2f angle %6.1f' % (
+                t, dist, offsets[-1][1], follow.throttle, follow.angle))
+        # car
+        left, right = side('P4', 'P5'), side('P8', 'P7')
+        speed = V_MAX * (left + right) / 2
+        heading += TURN_RATE * (right - left) * STEP_S
+        y += speed * math.sin(heading) * STEP_S
+        dist -= speed * math.cos(heading) * STEP_S
+        dists.append((t, dist))
+        clock.advance(STEP_S)
+        t += STEP_S
+
+    target = config['target_dist']
+    step = start_dist - target
+    rise = next((t for t, d in dists if start_dist - d >= 0.9 * step), None)
+    overshoot = max(0.0, target - min(d for _, d in dists)) / abs(step) * 100
+    return {
+        'rise_s': rise,
+        'overshoot_pct': overshoot,
+        'settle_s': settle_time(dists, target, 0.05 * abs(step)),
+        'final_dist': dists[-1][1],
+        'offset_settle_s': settle_time(offsets, config['target_angle'], 0.5),
+        'final_offset': offsets[-1][1],
+        'control_steps': follow.steps,
+        'rejected': follow.pose.rejected,
+    }
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Step response of the AprilTag follower')
+    parser.add_argument('--config', default=os.path.join(CONTROLLER, 'p_control.json'))
+    parser.add_argument('--seconds', type=float, default=8)
+    parser.add_argument('--start', type=float, default=20, help='starting distance from the tag')
+    parser.add_argument('--lateral', type=float, default=2, help='sideways offset of the tag')
+    parser.add_argument('--fps', type=float, default=25, help='camera frame rate')
+    parser.add_argument('--noise', type=float, default=0.1, help='pose noise (standard deviation)')
+    parser.add_argument('--drop', type=float, default=0.0, help='fraction of frames without the tag')
+    parser.add_argument('--outliers', type=float, default=0.0, help='fraction of frames with a 5 unit misread')
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--trace', action='store_true', help='print every control step')
+    args = parser.parse_args(argv)
+    config = follower.load_config(args.config)
+    result = run(config, args.seconds, args.start, args.lateral, args.fps, args.noise, args.drop,
+                 args.outliers, args.seed, args.trace)
+    for key, value in result.items():
+        print('%-16s %s' % (key, '-' if value is None else ('%.3f' % value if isinstance(value, float) else value)))
+
+if __name__ == '__main__':
+    main()
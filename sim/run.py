@@ -0,0 +1,96 @@
+# sim/run.py - runs a project's main file on the virtual clock and reports what it did
+#
+#   python -m sim.run "Cool Drum Set/boom_tss.py" --seconds 30
+#   python -m sim.run "Tap Night Light/night.py" --seconds 10 --scenario taps.py
+#
+# A scenario is a python file with setup(sim, board) that scripts the outside world
+# before the project starts (board is the list of fake accelerometers), e.g.
+#   def setup(sim, board):
+#       from machine import Pin, ADC
+#       ADC.values[28] = 40000
+#       sim.clock.call_later(2.0, lambda: Pin('GPIO17').drive(0))
+#       sim.clock.call_later(3.0, lambda: board[1].tap(double=True))
+#       sim.clock.call_later(1.0, lambda: sim.broker.publish('ME35-24/sim/sub', '3000'))
+# A file that only defines classes (Zombie Tag/human.py) needs the scenario to start
+# it too: start(project) is called after the file ran, with its globals, e.g.
+#   def start(project):
+#       project['Human'](13)
+# Ready-made ones are in sim/scenarios:
+#   python -m sim.run "Zombie Tag/human.py" --seconds 30 --scenario sim/scenarios/zombie_tag.py
+#   python -m sim.run "Woodchip Kitchen/main.py" --seconds 30 --scenario sim/scenarios/woodchip_kitchen.py
+import argparse
+import contextlib
+import io
+import os
+import runpy
+import sys
+import time as real_time
+
+import sim
+
+def report(wall_s):
+    from sim import machine, BLE_CEEO
+    lines = ['simulated %.3f s in %.3f s wall (%.0fx)' % (
+        sim.clock.seconds(), wall_s, sim.clock.seconds() / wall_s if wall_s else 0)]
+    for pin, pwm in sorted(machine.PWM.channels.items(), key=lambda item: str(item[0])):
+        lines.append('pwm %-8s writes %6d  changes %6d  duty now %5d' % (
+            pin, pwm.writes, len(pwm.history), pwm.duty))
+    for i2c_bus, count in sorted(machine.I2C.transactions.items()):
+        lines.append('i2c bus %d transactions %d' % (i2c_bus, count))
+    for uart_id, uart in sorted(machine.UART.ports.items()):
+        lines.append('uart %d writes %d' % (uart_id, uart.writes))
+    for yell in BLE_CEEO.Yell.instances:
+        lines.append('ble %s packets %d' % (yell.name, yell.writes))
+    topics = {}
+    for _, sender, topic, _ in sim.broker.log:
+        topics[topic] = topics.get(topic, 0) + 1
+    for topic, count in sorted(topics.items()):
+        lines.append('mqtt %s messages %d' % (topic, count))
+    if sim.broker.kicks:
+        lines.append('mqtt duplicate client id kicks %d' % sim.broker.kicks)
+    if sim.air.sent:
+        lines.append('ble advertisements %d' % sim.air.sent)
+    return '\n'.join(lines)
+
+def run_project(path, seconds, scenario=None, quiet=False):
+    sim.install()
+    sim.reset()
+    path = os.path.abspath(path)
+    project_dir = os.path.dirname(path)
+    sys.path.insert(0, project_dir)
+    os.chdir(project_dir)  # the projects open their data files by relative path
+    from sim.devices import standard_board
+    board = standard_board()
+    hooks = runpy.run_path(scenario) if scenario else {}
+    if 'setup' in hooks:
+        hooks['setup'](sim, board)
+    sim.clock.stop_after(seconds)
+    out = io.StringIO() if quiet else sys.stdout
+    start = real_time.perf_counter()
+    result = 'finished'
+    try:
+        with contextlib.redirect_stdout(out):
+            project = runpy.run_path(path, run_name='__main__')
+            if 'start' in hooks:
+                hooks['start'](project)
+    except sim.Deadlock as e:
+        result = 'deadlock: %s' % e
+    except sim.StopSimulation:
+        result = 'stopped'
+    return result, real_time.perf_counter() - start
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Run an ME35 project on the simulated board')
+    parser.add_argument('project', help='main file of the project, e.g. "Tap Night Light/night.py"')
+    parser.add_argument('--seconds', type=float, default=10, help='simulated seconds to run')
+    parser.add_argument('--scenario', help='python file with setup(sim, board) to script inputs and start(project) to start it')
+    parser.add_argument('-q', '--quiet', action='store_true', help="hide the project's prints")
+    args = parser.parse_args(argv)
+    if args.scenario:
+        args.scenario = os.path.abspath(args.scenario)
+    result, wall_s = run_project(args.project, args.seconds, args.scenario, args.quiet)
+    print(result)
+    print(report(wall_s))
+
+if __name__ == '__main__':
+    main()
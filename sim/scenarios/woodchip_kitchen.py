@@ -0,0 +1,30 @@
+# sim/scenarios/woodchip_kitchen.py - orders over the relay and a player at the buttons
+#
+#   python -m sim.run "Woodchip Kitchen/main.py" --seconds 60 --scenario sim/scenarios/woodchip_kitchen.py
+#
+# The game switch goes on at 1 s in global mode, a burger and a ramen are ordered
+# over the relay, and the player presses whichever buttons are lit, 200 ms apart
+# (a lit pair is pressed one after the other, well inside TIME_WINDOW_MS).
+BUTTONS = {1: ('GPIO0', 'GPIO4'), 2: ('GPIO1', 'GPIO5'), 3: ('GPIO2', 'GPIO6'), 4: ('GPIO3', 'GPIO7')}
+PRESS_S = 0.2
+
+def setup(sim, board):
+    from machine import Pin
+    import espnow_bluetooth_relay as relay
+    on_switch = Pin('GPIO8', Pin.IN, Pin.PULL_UP)
+    Pin('GPIO9', Pin.IN, Pin.PULL_UP).drive(0)  # global mode, orders come from the relay
+    buttons = {b: Pin(button, Pin.IN, Pin.PULL_UP) for b, (button, led) in BUTTONS.items()}
+    sim.clock.call_later(1.0, lambda: on_switch.drive(0))
+    relay.order('k0', at_s=2.0)
+    relay.order('k2', at_s=20.0)
+    last = [None]
+
+    def player():
+        lit = [b for b, (button, led) in BUTTONS.items() if Pin.levels.get(led)]
+        if lit:
+            b = next((b for b in lit if b != last[0]), lit[0])
+            buttons[b].drive(0)
+            buttons[b].drive(1)  # the game reacts on release
+            last[0] = b
+        sim.clock.call_later(PRESS_S, player)
+    sim.clock.call_later(PRESS_S, player)
@@ -0,0 +1,24 @@
+# sim/scenarios/zombie_tag.py - a human (Zombie Tag/human.py) against zombies on sim.air
+#
+#   python -m sim.run "Zombie Tag/human.py" --seconds 30 --scenario sim/scenarios/zombie_tag.py
+#
+# Zombie 3 comes close three times for 4 s (a hit each time, the third one turns
+# the human into zombie 3), zombie 5 only passes by for 2 s, zombie 1 stays far away.
+# Every zombie advertises about every 100 ms like zombie.py does.
+NEAR, FAR = -50, -80
+
+def visits(*windows):
+    # RSSI as a function of the time in ms: NEAR inside any (start s, end s) window
+    def rssi(ms):
+        return NEAR if any(start * 1000 <= ms < end * 1000 for start, end in windows) else FAR
+    return rssi
+
+def setup(sim, board):
+    from machine import Pin
+    Pin('GPIO20', Pin.IN).drive(1)  # the send button is pulled up, pressed pulls it low
+    sim.air.advertise('!1', FAR, 100)
+    sim.air.advertise('!3', visits((2, 6), (8, 12), (14, 18)), 103)
+    sim.air.advertise('!5', visits((9, 11)), 107)
+
+def start(project):
+    project['Human'](13)
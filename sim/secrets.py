@@ -0,0 +1,4 @@
+# sim/secrets.py - placeholder credentials, the real secrets.py never leaves the boards
+mysecrets = {'SSID': 'sim', 'key': ''}
+chsecrets = {'Sub_Topic': 'ME35-24/sim/sub', 'Pub_Topic': 'ME35-24/sim/pub'}
+nlsecrets = {'Sub_Topic': 'ME35-24/sim/nightlight'}
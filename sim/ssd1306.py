@@ -0,0 +1,21 @@
+# sim/ssd1306.py - OLED that keeps the last frame's text instead of drawing it
+from sim.clock import clock
+
+class SSD1306_I2C:
+    def __init__(self, width, height, i2c, addr=0x3C, external_vcc=False):
+        self.width = width
+        self.height = height
+        self.lines = []
+        self.shown = []  # (time ms, lines) for every show()
+
+    def fill(self, c):
+        self.lines = []
+
+    def text(self, s, x, y, c=1):
+        self.lines.append(s)
+
+    def blit(self, fbuf, x, y, key=-1, palette=None):
+        self.lines.append('<bitmap>')
+
+    def show(self):
+        self.shown.append((clock.ms(), tuple(self.lines)))
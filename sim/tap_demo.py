@@ -0,0 +1,45 @@
+# sim/tap_demo.py - exercises lib/accel.py against the fake I2C and pins
+#   python -m sim.tap_demo
+import asyncio
+
+import sim
+sim.install()
+
+from machine import Pin, I2C
+from sim.devices import FakeAccel
+import accel
+
+async def main():
+    short_dev = FakeAccel(Pin('GPIO6'))
+    tall_dev = FakeAccel(Pin('GPIO7'))
+    I2C.attach(0, 0x62, short_dev)
+    I2C.attach(1, 0x62, tall_dev)
+
+    taps = accel.TapQueue()
+    short = accel.TapAccel(I2C(0), Pin('GPIO6', Pin.IN), taps, source=0)
+    tall = accel.TapAccel(I2C(1), Pin('GPIO7', Pin.IN), taps, source=1)
+    tasks = [asyncio.create_task(short.run()), asyncio.create_task(tall.run())]
+    await asyncio.sleep(0)
+
+    idle_reads = short.reads + tall.reads
+    await asyncio.sleep(0.1)  # nothing tapped, nothing should be read
+    assert short.reads + tall.reads == idle_reads, 'status read without an interrupt'
+
+    # both boards rest with 1 g on z, velocity is the change from that
+    short_dev.tap(axes=(1024, 0, 1024))  # a 1 g sideways hit, half strength
+    tall_dev.tap(double=True, axes=(0, 0, -2048))  # a 3 g swing, clipped to full velocity
+    got = [await taps.get(), await taps.get()]
+    assert got == [(0, accel.SINGLE_TAP, 63), (1, accel.DOUBLE_TAP, 127)], got
+    assert Pin('GPIO6').value() == 0, 'INT1 not released after the read'
+    assert short_dev.reads == 10, 'expected one config read, 8 calibration reads and one burst read'
+
+    short_dev.tap(axes=(0, 0, 1280))  # a soft tap straight down, gravity alone must not saturate it
+    got.append(await taps.get())
+    assert got[-1] == (0, accel.SINGLE_TAP, 15), got[-1]
+
+    for task in tasks:
+        task.cancel()
+    print('taps', got, 'status reads', short.reads + tall.reads - idle_reads)
+
+if __name__ == '__main__':
+    asyncio.run(main())
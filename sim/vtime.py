@@ -0,0 +1,61 @@
+# sim/vtime.py - the `time` module the projects see in the simulation (MicroPython flavoured)
+import time as _real_time
+from time import gmtime, localtime, mktime, strftime  # calendar helpers, passed through
+from sim.clock import clock as sim_clock
+
+TICKS_PERIOD = 1 << 30
+
+def ticks_ms():
+    return sim_clock.ms() % TICKS_PERIOD
+
+def ticks_us():
+    return sim_clock.now_us % TICKS_PERIOD
+
+def ticks_cpu():
+    return ticks_us()
+
+def ticks_add(ticks, delta):
+    return (ticks + delta) % TICKS_PERIOD
+
+def ticks_diff(ticks1, ticks2):
+    diff = (ticks1 - ticks2) % TICKS_PERIOD
+    return diff - TICKS_PERIOD if diff >= TICKS_PERIOD // 2 else diff
+
+def time():
+    return sim_clock.seconds()
+
+def time_ns():
+    return sim_clock.now_us * 1000
+
+monotonic = time
+
+def sleep(seconds):
+    sim_clock.advance(seconds)
+
+def sleep_ms(ms):
+    sim_clock.advance(ms / 1000)
+
+def sleep_us(us):
+    sim_clock.advance(us / 1e6)
+
+class Clock:
+    # OpenMV's time.clock() for frame rate measurements
+    def __init__(self):
+        self.last = None
+        self.last_fps = 0.0
+
+    def tick(self):
+        now = sim_clock.now_us
+        if self.last is not None and now > self.last:
+            self.last_fps = 1e6 / (now - self.last)
+        self.last = now
+
+    def fps(self):
+        return self.last_fps
+
+def clock():
+    return Clock()
+
+def __getattr__(name):
+    # anything MicroPython does not have (perf_counter, struct_time, ...) comes from the real module
+    return getattr(_real_time, name)
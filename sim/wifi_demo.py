@@ -0,0 +1,46 @@
+# sim/wifi_demo.py - exercises lib/wifi.py with a flaky access point
+#   python -m sim.wifi_demo
+import asyncio
+
+import sim
+sim.install()
+
+import network
+from sim import clock
+import mqtt_service
+import wifi
+
+async def main():
+    ticks = []
+    async def blink():  # stands in for the LEDs and sensors that must keep running
+        while True:
+            ticks.append(clock.ms())
+            await asyncio.sleep(0.01)
+
+    network.fail_connects = 1  # the first attempt never gets an IP
+    link = wifi.WiFi('sim', '', timeout_ms=3000)
+    mq = mqtt_service.MQTTService('WiFiDemo', wifi=link)
+    tasks = [asyncio.create_task(t) for t in (blink(), link.run(), mq.run())]
+
+    await link.ready.wait()
+    first_up = clock.ms()  # 3 s timeout + 1 s backoff + CONNECT_MS
+    assert first_up <= 3000 + 1000 + network.CONNECT_MS + link.poll_ms, first_up
+    assert link.connect_ms <= network.CONNECT_MS + link.poll_ms, link.connect_ms
+    await mq.ready.wait()
+
+    network.WLAN.drop_all()
+    await asyncio.sleep(link.watch_ms / 1000 + 0.01)
+    assert not link.up and not mq.connected and link.drops == 1
+    assert not mq.publish('ME35-24/sim/pub', 'hello')
+    await mq.ready.wait()
+    back_up = clock.ms()
+
+    gaps = [b - a for a, b in zip(ticks, ticks[1:])]
+    assert max(gaps) <= 11, 'event loop blocked for %d ms' % max(gaps)
+    for task in tasks:
+        task.cancel()
+    print('up at %d ms, back up at %d ms after a drop, longest loop gap %d ms'
+          % (first_up, back_up, max(gaps)))
+
+if __name__ == '__main__':
+    asyncio.run(main())